@@ -0,0 +1,230 @@
+# --- TOUREN-ARCHIV FÜR FLOTTEN-AUSWERTUNGEN ---
+# Sammelt Kennzahlen und Stopps aller Touren in einer SQLite-Datei (indiziert nach Datum,
+# Tournummer und Kunde), damit Auswertungen über Monate/Jahre in Millisekunden laufen.
+# Eine Tour ist (TourNr, Datum): die DL-Dateien werden täglich überschrieben, das Archiv behält
+# die früheren Tage. Unveränderte Quelldateien (mtime/Größe) werden beim Import übersprungen.
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+import numpy as np
+
+from batch_export import tour_nr_from_filename
+from tour_model import local_date
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tours (
+    tour_id INTEGER PRIMARY KEY,
+    tour_nr TEXT NOT NULL,
+    tour_date TEXT NOT NULL,          -- lokales Datum YYYY-MM-DD
+    start_utc INTEGER,                -- Unix-Sekunden
+    end_utc INTEGER,
+    dist_km REAL NOT NULL,
+    avg_speed REAL NOT NULL,
+    n_points INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    UNIQUE (tour_nr, tour_date)
+);
+CREATE INDEX IF NOT EXISTS idx_tours_date ON tours (tour_date);
+CREATE INDEX IF NOT EXISTS idx_tours_nr ON tours (tour_nr, tour_date);
+
+CREATE TABLE IF NOT EXISTS stops (
+    tour_id INTEGER NOT NULL REFERENCES tours (tour_id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    type TEXT NOT NULL,               -- CLIENT / PAUSE
+    customer_id TEXT NOT NULL,        -- leer bei Pausen
+    name TEXT NOT NULL,
+    arrival_utc INTEGER NOT NULL,
+    departure_utc INTEGER NOT NULL,
+    duration_min INTEGER NOT NULL,
+    lat REAL,
+    lon REAL,
+    PRIMARY KEY (tour_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_stops_customer ON stops (customer_id, arrival_utc);
+-- deckender Index für Zeitraum-Auswertungen (Standzeit je Kunde ohne Zugriff auf die Tabelle)
+CREATE INDEX IF NOT EXISTS idx_stops_dwell ON stops (type, arrival_utc, customer_id, duration_min, name);
+
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+
+def _epoch(dt):
+    return int(dt.timestamp()) if dt else None
+
+
+class TourArchive:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with self._connect() as con:
+            con.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # Eine Transaktion pro Aufruf (Commit/Rollback wie "with sqlite3.connect()"), danach schließen
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as con:
+            con.execute("PRAGMA foreign_keys = ON")
+            con.row_factory = sqlite3.Row
+            with con:
+                yield con
+
+    # --- IMPORT ---
+
+    def is_current(self, path):
+        st_res = os.stat(path)
+        with self._connect() as con:
+            row = con.execute("SELECT mtime_ns, size FROM sources WHERE path=?", (os.path.abspath(path),)).fetchone()
+        return row is not None and (row["mtime_ns"], row["size"]) == (st_res.st_mtime_ns, st_res.st_size)
+
+    def ingest_tour(self, path, tour_nr, data):
+        # data: sprachneutrales Ergebnis von tour_model.analyze_tour
+        if not data["start_time"]:
+            return False  # ohne Zeitstempel keine Zuordnung zu einem Tag
+        st_res = os.stat(path)
+        source = os.path.abspath(path)
+        with self._connect() as con:
+            con.execute("DELETE FROM tours WHERE tour_nr=? AND tour_date=?", (tour_nr, local_date(data["start_time"])))
+            cur = con.execute(
+                "INSERT INTO tours (tour_nr, tour_date, start_utc, end_utc, dist_km, avg_speed, n_points, source) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (tour_nr, local_date(data["start_time"]), _epoch(data["start_time"]), _epoch(data["end_time"]),
+                 data["dist_km"], data["avg_speed"], len(data["track"]), source))
+            tour_id = cur.lastrowid
+            con.executemany(
+                "INSERT INTO stops VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(tour_id, seq, s.type, s.id, s.name, _epoch(s.arrival), _epoch(s.departure), s.duration_min, s.lat, s.lon)
+                 for seq, s in enumerate(data["customer_stops"])])
+            con.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)", (source, st_res.st_mtime_ns, st_res.st_size))
+        return True
+
+    def ingest_files(self, paths, load_tour, force=False):
+        # load_tour(path) -> analyze_tour-Ergebnis; liefert (importiert, übersprungen, fehler)
+        imported = skipped = errors = 0
+        for path in paths:
+            try:
+                if not force and self.is_current(path):
+                    skipped += 1
+                    continue
+                if self.ingest_tour(path, tour_nr_from_filename(os.path.basename(path)), load_tour(path)):
+                    imported += 1
+                else:
+                    skipped += 1
+            except Exception as e:
+                print(f"Error ingesting {os.path.basename(path)}: {e}")
+                errors += 1
+        return imported, skipped, errors
+
+    # --- ABFRAGEN ---
+
+    def _query(self, sql, params=()):
+        with self._connect() as con:
+            return [dict(row) for row in con.execute(sql, params)]
+
+    def dwell_per_customer(self, days=90, now=None):
+        # Ø Standzeit je Kunde über die letzten `days` Tage (nur CLIENT-Stopps)
+        since = int((now or time.time()) - days * 86400)
+        return self._query("""
+            SELECT customer_id, MAX(name) AS name, COUNT(*) AS visits,
+                   AVG(duration_min) AS avg_min, MIN(duration_min) AS min_min, MAX(duration_min) AS max_min
+            FROM stops
+            WHERE type = 'CLIENT' AND arrival_utc >= ? AND customer_id != ''
+            GROUP BY customer_id
+            ORDER BY avg_min DESC""", (since,))
+
+    def customer_visits(self, customer_id, limit=100):
+        return self._query("""
+            SELECT t.tour_nr, t.tour_date, s.arrival_utc, s.departure_utc, s.duration_min, s.lat, s.lon
+            FROM stops s JOIN tours t ON t.tour_id = s.tour_id
+            WHERE s.customer_id = ?
+            ORDER BY s.arrival_utc DESC LIMIT ?""", (customer_id, limit))
+
+    def tours(self, date_from=None, date_to=None, tour_nr=None):
+        # Kennzahlen je Tour; Datumsgrenzen als 'YYYY-MM-DD' (inklusive)
+        where, params = [], []
+        if date_from:
+            where.append("t.tour_date >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("t.tour_date <= ?")
+            params.append(date_to)
+        if tour_nr:
+            where.append("t.tour_nr = ?")
+            params.append(tour_nr)
+        sql = """
+            SELECT t.tour_nr, t.tour_date, t.start_utc, t.end_utc, t.dist_km, t.avg_speed,
+                   (SELECT COUNT(*) FROM stops s WHERE s.tour_id = t.tour_id AND s.type = 'CLIENT') AS customers
+            FROM tours t"""
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._query(sql + " ORDER BY t.tour_date, t.tour_nr", params)
+
+    def daily_summary(self, date_from=None, date_to=None):
+        # Flotte pro Tag: Anzahl Touren, km gesamt, Ø Geschwindigkeit
+        return self._query("""
+            SELECT tour_date, COUNT(*) AS tours, SUM(dist_km) AS dist_km, AVG(avg_speed) AS avg_speed
+            FROM tours
+            WHERE tour_date >= COALESCE(?, tour_date) AND tour_date <= COALESCE(?, tour_date)
+            GROUP BY tour_date ORDER BY tour_date""", (date_from, date_to))
+
+    def client_stops(self, date_from=None):
+        # Alle CLIENT-Stopps mit Position (für die Standortprüfung über das ganze Archiv)
+        return self._query("""
+            SELECT t.tour_nr, t.tour_date, s.customer_id, s.arrival_utc, s.lat, s.lon
+            FROM stops s JOIN tours t ON t.tour_id = s.tour_id
+            WHERE s.type = 'CLIENT' AND s.customer_id != '' AND s.lat IS NOT NULL AND s.lon IS NOT NULL
+              AND t.tour_date >= COALESCE(?, t.tour_date)
+            ORDER BY t.tour_date, t.tour_nr, s.arrival_utc""", (date_from,))
+
+    def client_arrivals(self, date_from=None, date_to=None):
+        # CLIENT-Stopps als Spalten (für die vektorisierte Lieferfenster-Prüfung über das ganze Archiv):
+        # (tour_nr, tour_date, customer_id, arrival_utc) als Listen gleicher Länge
+        with self._connect() as con:
+            rows = con.execute("""
+                SELECT t.tour_nr, t.tour_date, s.customer_id, s.arrival_utc
+                FROM stops s JOIN tours t ON t.tour_id = s.tour_id
+                WHERE s.type = 'CLIENT' AND s.customer_id != ''
+                  AND t.tour_date >= COALESCE(?, t.tour_date) AND t.tour_date <= COALESCE(?, t.tour_date)
+                ORDER BY t.tour_date, t.tour_nr, s.arrival_utc""", (date_from, date_to)).fetchall()
+        if not rows:
+            return [], [], [], []
+        return tuple(list(column) for column in zip(*rows))
+
+    def customer_positions(self):
+        # Mittlere Position je Kunde aus allen archivierten CLIENT-Stopps (für die Stopp-Zuordnung)
+        with self._connect() as con:
+            rows = con.execute("""
+                SELECT customer_id, AVG(lat), AVG(lon) FROM stops
+                WHERE type = 'CLIENT' AND customer_id != '' AND lat IS NOT NULL AND lon IS NOT NULL
+                GROUP BY customer_id""").fetchall()
+        ids = [row[0] for row in rows]
+        return ids, np.array([row[1] for row in rows], dtype=np.float64), np.array([row[2] for row in rows], dtype=np.float64)
+
+
+# Prozessweit gecachte Kundenpositionen; neu gelesen, wenn sich die Archivdatei ändert
+_positions = {}
+_positions_lock = threading.Lock()
+
+
+def get_customer_positions(db_path):
+    try:
+        st_res = os.stat(db_path)
+    except OSError:
+        return None  # noch kein Archiv angelegt
+    version = (st_res.st_mtime_ns, st_res.st_size)
+    key = os.path.abspath(db_path)
+    with _positions_lock:
+        cached = _positions.get(key)
+        if cached is None or cached[0] != version:
+            try:
+                cached = (version, TourArchive(db_path).customer_positions())
+            except sqlite3.Error as e:
+                print(f"Fehler beim Lesen von {db_path}: {e}")
+                cached = (version, None)
+            _positions[key] = cached
+        return cached[1]
@@ -1,138 +1,39 @@
 import streamlit as st
 import streamlit.components.v1 as components
-import gpxpy
-import folium
 import base64
 import os
-import glob
-import re
-from datetime import datetime, timedelta
-import pandas as pd
-import math
+from datetime import datetime, timedelta, timezone
+import json
 import time
+from settings import GPX_FOLDER_PATH, CSV_FOLDER_PATH, EXPORT_FOLDER_PATH, PARSE_CACHE_PATH, PARSE_CACHE_MAX_MB, ANALYTICS_DB_PATH
+from settings import METRICS_PORT, SHOW_TIMING_PANEL, TIMING_LOG_PATH, TRACK_ARCHIVE_FOLDER
+from customer_db import load_customer_db
+from delivery_windows import check_delivery_windows
+from file_index import get_file_index
+from geo_index import get_customer_geo_index, get_customer_verify_index, verify_locations
+from gpx_stream import parse_gpx
+from paging import get_page
+from parse_cache import ParseCache
+from timing import begin_run, configure as configure_timing, end_run, stage, start_metrics_server, timed
+from tour_cache import get_tour_cache
+from track_archive import open_for_gpx
+from translations import TRANSLATIONS
+from upload_jobs import JOB_DONE, JOB_RUNNING, get_upload_queue
+from export_writer import csv_bytes, write_csv
+from batch_export import STATUS_ERROR, STATUS_EXPORTED, run_batch, tour_nr_from_filename
+from map_cache import render_tour_map_html
+from track import to_epoch_us
+from tour_model import TIME_OFFSET, analyze_tour, export_filename, export_rows, export_stops, format_clock, issue_lines, local_date, location_lines, stop_rows, window_labels
 
 # --- KONFIGURATION ---
 APP_VERSION = "2.07"        # Logic-Update: Neues GPX-Format (Wegpunkte für Events/Kunden), Namen direkt aus GPX
 HEADER_HEIGHT_PIXELS = 340  
 ROWS_PER_PAGE = 10 
-
-# --- PFADE KONFIGURATION ---
-# 1. Pfad zu den GPX Touren-Dateien (Lesen)
-GPX_FOLDER_PATH = "."       
-
-# 2. Pfad zur CSV Kunden-Datenbank (Lesen)
-CSV_FOLDER_PATH = "."       
-
-# 3. Pfad für den EXPORT der CSV-Dateien (Schreiben)
-EXPORT_FOLDER_PATH = "."
-
-# --- SPRACH-WÖRTERBUCH ---
-TRANSLATIONS = {
-    "Deutsch": {
-        "page_title": "LKW Touren Viewer Pro",
-        "tours_found": "📂 Aktuell gefundene Touren: <b>{count}</b> (Auto-Update: 60s)",
-        "no_files": "Keine GPX Dateien im Ordner gefunden.",
-        "upload_text": "GPX Datei hier ablegen (max. 200 MB)",
-        "manual_btn_help": "Handbuch",
-        "manual_title": "Benutzerhandbuch",
-        "stats_start": "⏱️ Start",
-        "stats_end": "🏁 Ende",
-        "stats_dist": "📏 Distanz",
-        "stats_speed": "Ø Geschw.",
-        "btn_save_map": "🌍 Karte für 2. Monitor speichern",
-        "btn_sidebar": "Sidebar ein/aus",
-        "btn_export": "Download Tour",
-        "btn_save_direct": "💾 Export der Tour",
-        "btn_batch_export": "💾 Alle Touren exportieren", 
-        "save_success": "✅ Datei erfolgreich exportiert, Dateiname: ",
-        "batch_success": "✅ Batch-Export abgeschlossen! Anzahl Dateien: ",
-        "save_error": "❌ Fehler beim Speichern: ",
-        "batch_error": "❌ Bitte EXPORT_FOLDER_PATH konfigurieren für Batch-Export!",
-        "header_customers": "📋 Kundenliste & Events",
-        "col_tour_nr": "Tournummer",
-        "col_filename": "Dateiname",
-        "col_date": "Datum",
-        "col_cust_nr": "Kunden Nr. / Typ",
-        "col_name": "Name / Event",
-        "col_arr": "Ankunft",
-        "col_dep": "Abfahrt",
-        "col_dur": "Dauer",
-        "nav_back": "⬅️",
-        "nav_next": "➡️",
-        "page_info": "S. {current}/{total}",
-        "time_suffix": " Uhr",
-        "date_format": "%d.%m.%Y",
-        "file_date_format": "%d.%m.%Y %H:%M",
-        "manual_md": """
-## 📘 Benutzerhandbuch
-
-### 1. Obere Leiste
-* **DE / EN:** Sprache wechseln.
-
-### 2. Dateiauswahl
-* **Liste:** Zeigt alle GPX-Dateien im Ordner. Klicken zum Laden.
-
-### 3. Upload
-* **Feld:** Ziehen Sie neue GPX-Dateien hierher.
-
-### 4. Karte & Liste
-* **Karte:** Zeigt Route und Stopps.
-* **Tabelle:** Zeigt Kundenbesuche und Pausen basierend auf den neuen Wegpunkten im GPX.
-"""
-    },
-    "English": {
-        "page_title": "Truck Tour Viewer Pro",
-        "tours_found": "📂 Found tours currently: <b>{count}</b> (Auto-Update: 60s)",
-        "no_files": "No GPX files found in folder.",
-        "upload_text": "Drop GPX file here (max. 200 MB)",
-        "manual_btn_help": "Manual",
-        "manual_title": "User Manual",
-        "stats_start": "⏱️ Start",
-        "stats_end": "🏁 End",
-        "stats_dist": "📏 Distance",
-        "stats_speed": "Ø Speed",
-        "btn_save_map": "🌍 Save Map for 2nd Monitor",
-        "btn_sidebar": "Sidebar on/off",
-        "btn_export": "Download Tour",
-        "btn_save_direct": "💾 Export Tour",
-        "btn_batch_export": "💾 Export All Tours",
-        "save_success": "✅ File successfully exported, Filename: ",
-        "batch_success": "✅ Batch export finished! Files created: ",
-        "save_error": "❌ Error saving file: ",
-        "batch_error": "❌ Please configure EXPORT_FOLDER_PATH for batch export!",
-        "header_customers": "📋 Customer List & Events",
-        "col_tour_nr": "Tour No.",
-        "col_filename": "Filename",
-        "col_date": "Date",
-        "col_cust_nr": "Customer No. / Type",
-        "col_name": "Name / Event",
-        "col_arr": "Arrival",
-        "col_dep": "Departure",
-        "col_dur": "Duration",
-        "nav_back": "⬅️",
-        "nav_next": "➡️",
-        "page_info": "P. {current}/{total}",
-        "time_suffix": "",
-        "date_format": "%Y-%m-%d",
-        "file_date_format": "%Y-%m-%d %H:%M",
-        "manual_md": """
-## 📘 User Manual
-
-### 1. Top Bar
-* **DE / EN:** Switch language.
-
-### 2. File Selection
-* **List:** Shows GPX files. Click to load.
-
-### 3. Upload
-* **Box:** Drag & drop GPX files here.
-
-### 4. Map & List
-* **Map:** Shows route and stops.
-* **Table:** Shows customer visits and pauses based on GPX waypoints.
-"""
-    }
-}
+FILES_PER_PAGE = 100             # Dateiliste seitenweise (nur die sichtbare Seite geht an den Browser)
+MAP_SIMPLIFY_TOLERANCE_M = 3.0  # Douglas-Peucker Toleranz für die Tour-Linie (0 = alle Punkte)
+MAP_LOD_LEVELS = None           # Optional je Zoomstufe, z.B. {0: 50.0, 13: 10.0, 15: 2.0} (min. Zoom -> Toleranz in m)
+MAP_HTML_CACHE_MB = 64          # Speicher für gerenderte Karten (alle Sessions zusammen)
+TOUR_CACHE_MB = 512             # Speicher für geladene Touren (alle Sessions zusammen)
 
 def get_text(key):
     lang = st.session_state.get('language', 'Deutsch')
@@ -143,318 +44,16 @@ def get_base64_of_bin_file(bin_file):
         data = f.read()
     return base64.b64encode(data).decode()
 
-def load_customer_db():
-    filename = os.path.join(CSV_FOLDER_PATH, "KND.STM")
-    if not os.path.exists(filename):
-        return None
-    try:
-        df = pd.read_csv(filename, sep=None, engine='python', dtype=str, encoding='latin1')
-        df.columns = df.columns.str.strip()
-        if 'NUMBER' in df.columns and 'NAME' in df.columns:
-            return dict(zip(df['NUMBER'].str.strip(), df['NAME'].str.strip()))
-        return None
-    except:
-        return None
-
-def process_gpx_data(file, customer_db=None):
-    # --- NEUE LOGIK FÜR GPX FORMAT MIT WEGPUNKTEN ---
-    try:
-        file.seek(0)
-    except:
-        pass 
-        
-    gpx = gpxpy.parse(file)
-    points = []
-    
-    # 1. Trackpunkte für die rote Linie auf der Karte extrahieren
-    for track in gpx.tracks:
-        for segment in track.segments:
-            for point in segment.points:
-                points.append((point.latitude, point.longitude))
-    
-    if not points:
-        for route in gpx.routes:
-            for point in route.points:
-                points.append((point.latitude, point.longitude))
-
-    # 2. Bewegungsdaten berechnen
-    moving_data = gpx.get_moving_data()
-    dist_km = moving_data.moving_distance / 1000.0
-    moving_time_seconds = moving_data.moving_time
-    avg_speed = dist_km / (moving_time_seconds / 3600.0) if moving_time_seconds > 0 else 0.0
-
-    start_time_str = "-"
-    end_time_str = "-"
-    date_str = ""
-    customer_stops = []
-    
-    lang = st.session_state.get('language', 'Deutsch')
-    time_suffix = TRANSLATIONS[lang]["time_suffix"]
-    date_fmt = TRANSLATIONS[lang]["date_format"]
-    
-    try:
-        # Globale Zeitgrenzen der Tour
-        bounds = gpx.get_time_bounds()
-        if bounds.start_time and bounds.end_time:
-            t_start = bounds.start_time + timedelta(hours=2) # Zeitzonenkorrektur
-            t_end = bounds.end_time + timedelta(hours=2)
-            start_time_str = t_start.strftime("%H:%M") + time_suffix
-            end_time_str = t_end.strftime("%H:%M") + time_suffix
-            date_str = t_start.strftime(date_fmt)
-
-        # --- 3. EVENT PARSING AUS WEGPUNKTEN ---
-        # Wir suchen nach Paaren von _BEGIN und _END
-        # Format Beispiel: CLIENT_BEGIN:0200140(Laschenskyhof GmbH)
-        
-        open_events = {} # Speichert begonnene Events: Key -> {start_time, lat, lon}
-        
-        # Regex zum Zerlegen des Namens-Strings
-        # Matcht: TYPE_STATE:ID(NAME) oder TYPE_STATE(NAME)
-        # Bsp: CLIENT_BEGIN:123(Name) -> Type=CLIENT, State=BEGIN, ID=123, Name=Name
-        # Bsp: PAUSE_BEGIN(Pause) -> Type=PAUSE, State=BEGIN, ID=None, Name=Pause
-        pattern = re.compile(r"^(?P<type>[A-Z]+)_(?P<state>BEGIN|END)(?::(?P<id>[\w]+))?(?:\((?P<name>.*)\))?")
-
-        # Waypoints chronologisch sortieren (sollten sie sein, aber sicher ist sicher)
-        sorted_waypoints = sorted(gpx.waypoints, key=lambda x: x.time if x.time else datetime.min)
-
-        for wpt in sorted_waypoints:
-            if not wpt.name or not wpt.time:
-                continue
-            
-            match = pattern.match(wpt.name.strip())
-            if match:
-                data = match.groupdict()
-                evt_type = data['type']   # z.B. CLIENT oder PAUSE
-                evt_state = data['state'] # BEGIN oder END
-                evt_id = data['id'] if data['id'] else "" # z.B. 0200140 oder leer
-                evt_name = data['name'] if data['name'] else "" # z.B. Laschenskyhof GmbH
-                
-                # Eindeutiger Schlüssel für das Event-Paar (ID oder Name nutzen)
-                # Bei Pausen gibt es keine ID, da ist der Name "Pause" der Schlüssel
-                event_key = evt_id if evt_id else evt_name
-                
-                if evt_state == "BEGIN":
-                    open_events[event_key] = {
-                        "start_time": wpt.time,
-                        "lat": wpt.latitude,
-                        "lon": wpt.longitude,
-                        "type": evt_type,
-                        "id": evt_id,
-                        "name": evt_name
-                    }
-                    
-                elif evt_state == "END":
-                    if event_key in open_events:
-                        start_data = open_events.pop(event_key)
-                        
-                        start_ts = start_data["start_time"]
-                        end_ts = wpt.time
-                        
-                        duration = int((end_ts - start_ts).total_seconds() / 60)
-                        
-                        # Formatierung für Tabelle
-                        arrival_time = (start_ts + timedelta(hours=2)).strftime("%H:%M:%S")
-                        departure_time = (end_ts + timedelta(hours=2)).strftime("%H:%M:%S")
-                        
-                        # Spaltennamen holen
-                        col_nr = TRANSLATIONS[lang]["col_cust_nr"]
-                        col_name_header = TRANSLATIONS[lang]["col_name"]
-                        col_arr = TRANSLATIONS[lang]["col_arr"]
-                        col_dep = TRANSLATIONS[lang]["col_dep"]
-                        col_dur = TRANSLATIONS[lang]["col_dur"]
-                        
-                        # Anzeige-Name: Priorität GPX > DB > ID
-                        display_name = start_data["name"]
-                        if not display_name and customer_db and start_data["id"] in customer_db:
-                            display_name = customer_db[start_data["id"]]
-                        
-                        # Bei Pause als ID "PAUSE" anzeigen, sonst die Nummer
-                        display_id = start_data["id"] if start_data["id"] else start_data["type"]
-
-                        stop_entry = {
-                            col_nr: display_id,
-                            col_name_header: display_name,
-                            col_arr: arrival_time,
-                            col_dep: departure_time,
-                            col_dur: duration,
-                            "Lat": start_data["lat"],
-                            "Lon": start_data["lon"]
-                        }
-                        customer_stops.append(stop_entry)
-
-    except Exception as e:
-        print(f"Fehler bei GPX Analyse: {e}")
-        pass
-
-    return {
-        "points": points,
-        "dist_km": dist_km,
-        "avg_speed": avg_speed,
-        "start_time": start_time_str,
-        "end_time": end_time_str,
-        "date_str": date_str,
-        "customer_stops": customer_stops
-    }
-
-def get_local_gpx_files_info():
-    file_list = []
-    lang = st.session_state.get('language', 'Deutsch')
-    col_tour = TRANSLATIONS[lang]["col_tour_nr"]
-    col_fname = TRANSLATIONS[lang]["col_filename"]
-    col_fdate = TRANSLATIONS[lang]["col_date"]
-    
-    scan_path = GPX_FOLDER_PATH
-    
-    if os.path.exists(scan_path):
-        for f in os.listdir(scan_path):
-            full_path = os.path.join(scan_path, f)
-            if os.path.isfile(full_path) and f.upper().startswith('DL') and f.upper().endswith('.GPX'):
-                mod_time = os.path.getmtime(full_path)
-                dt_obj = datetime.fromtimestamp(mod_time)
-                fmt = TRANSLATIONS[lang]["file_date_format"]
-                date_str = dt_obj.strftime(fmt)
-                tour_nr = f.upper().replace("DL", "").replace(".GPX", "")
-                
-                file_list.append({
-                    col_tour: tour_nr,
-                    col_fname: f, 
-                    col_fdate: date_str, 
-                    "timestamp": mod_time,
-                    "real_filename": f 
-                })
-        file_list.sort(key=lambda x: x["timestamp"], reverse=True)
-    return file_list
-
-@st.fragment(run_every=60)
-def file_selector_fragment():
-    files_info = get_local_gpx_files_info()
-    lang = st.session_state.get('language', 'Deutsch')
-    col_tour = TRANSLATIONS[lang]["col_tour_nr"]
-    col_fname = TRANSLATIONS[lang]["col_filename"]
-    col_fdate = TRANSLATIONS[lang]["col_date"]
-    
-    if files_info:
-        count = len(files_info)
-        info_text = TRANSLATIONS[lang]["tours_found"].format(count=count)
-        st.markdown(f"<div style='color:white; font-size:0.9em; margin-bottom:3px;'>{info_text}</div>", unsafe_allow_html=True)
-        
-        df_files = pd.DataFrame(files_info)[[col_tour, col_fname, col_fdate]]
-        
-        # --- TABELLE STYLE: Hintergrund Schwarz (#1c1c1c) ---
-        styled_df_files = df_files.style.set_properties(**{
-            'background-color': '#1c1c1c',  # Schwarz (dunkelgrau)
-            'color': 'white', 
-            'border-color': 'rgba(255,255,255,0.2)', 
-            'cursor': 'pointer'
-        })
-        
-        selection = st.dataframe(
-            styled_df_files, 
-            width="stretch", 
-            hide_index=True, 
-            column_order=[col_tour, col_fname, col_fdate], 
-            selection_mode="single-row", 
-            on_select="rerun", 
-            key="file_selection_table", 
-            height=180
-        )
-        
-        if len(selection.selection.rows) > 0:
-            index = selection.selection.rows[0]
-            selected_file = df_files.iloc[index][col_fname]
-            if st.session_state.get('selected_local_file') != selected_file:
-                st.session_state.selected_local_file = selected_file
-                st.session_state.last_selection_ts = time.time()
-                st.rerun()
-    else:
-        st.markdown(f"<div style='color:white; font-size:0.9em;'>{TRANSLATIONS[lang]['no_files']}</div>", unsafe_allow_html=True)
-
-@st.dialog("Manual")
-def show_help_dialog():
-    lang = st.session_state.get('language', 'Deutsch')
-    st.markdown(TRANSLATIONS[lang]["manual_md"])
-    if st.button("Close"):
-        st.rerun()
-
-def run_batch_export(customer_db):
-    files = get_local_gpx_files_info()
-    if not files: return
-    
-    if not EXPORT_FOLDER_PATH or not os.path.exists(EXPORT_FOLDER_PATH):
-        st.session_state.save_msg = get_text("batch_error")
-        return
-
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    export_count = 0
-    
-    for i, f_info in enumerate(files):
-        fname = f_info["real_filename"]
-        tour_nr = f_info[get_text("col_tour_nr")] 
-        full_path = os.path.join(GPX_FOLDER_PATH, fname)
-        
-        status_text.text(f"Processing: {fname}...")
-        
-        try:
-            with open(full_path, 'rb') as f:
-                data = process_gpx_data(f, customer_db)
-                
-            if data and data["customer_stops"]:
-                df_export = pd.DataFrame(data["customer_stops"])
-                df_export.insert(0, "TourNr", tour_nr)
-                df_export.insert(1, "Datum", data['date_str'])
-                df_export = df_export.drop(columns=['Lat', 'Lon'], errors='ignore')
-                
-                csv_filename = f"Standzeiten_{data['date_str']}_{tour_nr}.csv"
-                save_path = os.path.join(EXPORT_FOLDER_PATH, csv_filename)
-                
-                df_export.to_csv(save_path, index=False, sep=';', encoding='utf-16')
-                export_count += 1
-        except Exception as e:
-            print(f"Error extracting {fname}: {e}")
-            
-        progress_bar.progress((i + 1) / len(files))
-        
-    status_text.empty()
-    progress_bar.empty()
-    st.session_state.save_msg = f"{get_text('batch_success')} {export_count}"
-    st.rerun()
-
-def main():
-    st.set_page_config(page_title="LKW Touren Viewer Pro", page_icon="🚚", layout="wide")
-    
-    # --- INIT STATE ---
-    if 'language' not in st.session_state: st.session_state.language = 'Deutsch'
-    if 'show_right_sidebar' not in st.session_state: st.session_state.show_right_sidebar = True
-    if 'page_number' not in st.session_state: st.session_state.page_number = 0
-    if 'selected_customer_id' not in st.session_state: st.session_state.selected_customer_id = None
-    if 'selected_local_file' not in st.session_state: st.session_state.selected_local_file = None
-    if 'last_upload_ts' not in st.session_state: st.session_state.last_upload_ts = 0.0
-    if 'last_selection_ts' not in st.session_state: st.session_state.last_selection_ts = 0.0
-    if 'tour_data' not in st.session_state: st.session_state.tour_data = None
-    if 'loaded_file_name' not in st.session_state: st.session_state.loaded_file_name = None
-    if 'last_lang' not in st.session_state: st.session_state.last_lang = st.session_state.language
-    if 'save_msg' not in st.session_state: st.session_state.save_msg = None 
-
-    # --- RESET BEI SPRACHWECHSEL ---
-    if st.session_state.language != st.session_state.last_lang:
-        st.session_state.loaded_file_name = None 
-        st.session_state.last_lang = st.session_state.language
-        st.rerun()
-
-    customer_db = load_customer_db()
-    
-    # NEU: Auch wenn keine DB da ist, können wir Namen anzeigen, da sie im GPX stehen
-    has_customer_names = True 
-
-    logo_filename = "movisl.jpg"
-    logo_base64 = ""
-    if os.path.exists(logo_filename):
-        logo_base64 = get_base64_of_bin_file(logo_filename)
+@st.cache_resource(show_spinner=False)
+def get_logo_base64(logo_filename):
+    # Logo einmal pro Prozess kodieren statt bei jedem Rerun
+    return get_base64_of_bin_file(logo_filename) if os.path.exists(logo_filename) else ""
 
-    # --- CSS DESIGN ---
+@st.cache_resource(show_spinner=False)
+def get_app_css(upload_text):
+    # Großer CSS-Block, einmal pro Sprache und Prozess zusammengesetzt
     # WICHTIG: :root { color-scheme: dark; } erzwingt den Dunkelmodus im Browser-Rendering
-    st.markdown(f"""
+    return f"""
         <style>
             :root {{
                 color-scheme: dark;
@@ -519,7 +118,7 @@ def main():
             }}
             
             [data-testid='stFileUploader'] section > div > div::after {{
-                content: "{get_text('upload_text')}";
+                content: "{upload_text}";
                 white-space: pre; 
                 color: #999999; /* Grau */
                 text-align: center; display: block; font-weight: bold; font-size: 14px;
@@ -554,7 +153,287 @@ def main():
                 color: white !important;
             }}
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+def build_tour_map_lazy(*args):
+    # map_render (folium, branca, jinja2) erst beim Cache-Miss laden: kürzerer Kaltstart
+    from map_render import build_tour_map
+    return build_tour_map(*args)
+
+def build_replay_map_lazy(*args):
+    from map_render import build_replay_map
+    return build_replay_map(*args)
+
+@timed("load_gpx")
+def load_gpx(file):
+    # Aktuelles Track-Archiv (*.lkwtrk) zuerst: nur Speicherabbildung, kein XML
+    parsed = open_for_gpx(file, TRACK_ARCHIVE_FOLDER)
+    if parsed is not None:
+        return parsed
+    # GPX-Dateien (auch gespeicherte Uploads) über den persistenten Parse-Cache
+    try:
+        return ParseCache(PARSE_CACHE_PATH, PARSE_CACHE_MAX_MB * 1024 * 1024).get_or_parse(file)
+    except Exception as e:
+        print(f"Parse-Cache nicht verfügbar: {e}")
+        with open(file, 'rb') as f:
+            return parse_gpx(f)
+
+def tour_identity(file):
+    # Eindeutige Kennung der geladenen Tour-Version (Schlüssel für den Karten-Cache)
+    st_res = os.stat(file)
+    return (os.path.abspath(file), st_res.st_mtime_ns, st_res.st_size)
+
+@timed("process_gpx_data")
+def process_gpx_data(file):
+    # --- NEUE LOGIK FÜR GPX FORMAT MIT WEGPUNKTEN ---
+    # Liefert ein sprachneutrales Ergebnis (Track, Statistik, Stopp-Records mit UTC-Zeiten).
+    # Übersetzung, Kundennamen aus KND.STM und Formatierung kommen erst bei Anzeige/Export dazu.
+    # Ohne CLIENT/PAUSE-Wegpunkte werden Stopps aus den Trackpunkten erkannt und, soweit möglich,
+    # bekannten Kundenstandorten (Geocode-Tabelle / Touren-Archiv) zugeordnet.
+    return analyze_tour(load_gpx(file), detect=True, geo_index=get_customer_geo_index(CSV_FOLDER_PATH, ANALYTICS_DB_PATH))
+
+def get_tour_data(file, key=None):
+    # Aus dem prozessweiten Tour-Cache: jede Datei-Version wird einmal geladen, egal wie viele
+    # Sessions sie öffnen. Die Geo-Index-Version gehört zum Schlüssel (automatisch erkannte Stopps).
+    key = key or tour_identity(file)
+    geo_index = get_customer_geo_index(CSV_FOLDER_PATH, ANALYTICS_DB_PATH)
+    cache_key = (key, geo_index.version if geo_index is not None else None)
+    return get_tour_cache(TOUR_CACHE_MB * 1024 * 1024).get_or_load(cache_key, lambda: process_gpx_data(file), group=key[0])
+
+@timed("get_local_gpx_files_info")
+def get_local_gpx_files_info():
+    # Dateiliste aus dem prozessweiten Datei-Index (kein eigener Ordner-Scan pro Session)
+    lang = st.session_state.get('language', 'Deutsch')
+    index = get_file_index(GPX_FOLDER_PATH)
+    index.refresh()
+    return build_files_info(index.files(), lang)
+
+def build_files_info(files, lang):
+    col_tour = TRANSLATIONS[lang]["col_tour_nr"]
+    col_fname = TRANSLATIONS[lang]["col_filename"]
+    col_fdate = TRANSLATIONS[lang]["col_date"]
+    fmt = TRANSLATIONS[lang]["file_date_format"]
+    return [{
+        col_tour: f.upper().replace("DL", "").replace(".GPX", ""),
+        col_fname: f,
+        col_fdate: datetime.fromtimestamp(mod_time).strftime(fmt),
+        "timestamp": mod_time,
+        "real_filename": f
+    } for f, mod_time in files]
+
+def dark_table(rows, **css):
+    # --- TABELLE STYLE: Hintergrund Schwarz (#1c1c1c) ---
+    # Nur für die angezeigte Seite: DataFrame + Styler über wenige Zeilen
+    import pandas as pd
+    return pd.DataFrame(rows).style.set_properties(**{
+        'background-color': '#1c1c1c',  # Schwarz (dunkelgrau)
+        'color': 'white',
+        **css
+    })
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_file_table(folder, version, lang, page_number):
+    # Eine Seite der Dateiliste pro (Index-Version, Sprache, Seite), von allen Sessions geteilt.
+    # Nur die Dateien der Seite werden formatiert, nicht der ganze Ordner. Geteilt werden nur die
+    # Zeilen: den Styler verändert Streamlit beim Anzeigen, er entsteht daher pro Rerun neu.
+    _, files = get_file_index(folder).snapshot()
+    if not files:
+        return None
+    return get_page(files, page_number, FILES_PER_PAGE, lambda chunk: build_files_info(chunk, lang))
+
+def shift_file_page(step):
+    # Blättern in der Dateiliste; der Klick startet nur das Fragment neu
+    st.session_state.file_page += step
+
+@st.fragment(run_every=60)
+def file_selector_fragment():
+    lang = st.session_state.get('language', 'Deutsch')
+    col_tour = TRANSLATIONS[lang]["col_tour_nr"]
+    col_fname = TRANSLATIONS[lang]["col_filename"]
+    col_fdate = TRANSLATIONS[lang]["col_date"]
+
+    # Gedrosselter Diff-Scan; neue Tabelle nur wenn sich Dateien geändert haben
+    with stage("file_index_refresh"):
+        version = get_file_index(GPX_FOLDER_PATH).refresh()
+    with stage("build_file_table"):
+        page = build_file_table(GPX_FOLDER_PATH, version, lang, st.session_state.file_page)
+    
+    if page is not None:
+        st.session_state.file_page = page.number
+        info_text = TRANSLATIONS[lang]["tours_found"].format(count=page.total)
+        st.markdown(f"<div style='color:white; font-size:0.9em; margin-bottom:3px;'>{info_text}</div>", unsafe_allow_html=True)
+        
+        styled_df_files = dark_table(page.rows, **{'border-color': 'rgba(255,255,255,0.2)', 'cursor': 'pointer'})
+        selection = st.dataframe(
+            styled_df_files, 
+            width="stretch", 
+            hide_index=True, 
+            column_order=[col_tour, col_fname, col_fdate], 
+            selection_mode="single-row", 
+            on_select="rerun", 
+            key=f"file_selection_table_{page.number}", 
+            height=180
+        )
+        if page.count > 1:
+            f1, f2, f3 = st.columns([1, 2, 1])
+            with f1:
+                if page.number > 0: st.button(TRANSLATIONS[lang]["nav_back"], key="file_page_back", on_click=shift_file_page, args=(-1,))
+            with f2:
+                page_txt = TRANSLATIONS[lang]["page_info"].format(current=page.number + 1, total=page.count)
+                st.markdown(f"<div style='text-align:center; font-size:0.9em;'>{page_txt}</div>", unsafe_allow_html=True)
+            with f3:
+                if page.number < page.count - 1: st.button(TRANSLATIONS[lang]["nav_next"], key="file_page_next", on_click=shift_file_page, args=(1,))
+        
+        if len(selection.selection.rows) > 0:
+            index = selection.selection.rows[0]
+            selected_file = page.rows[index][col_fname]
+            if st.session_state.get('selected_local_file') != selected_file:
+                st.session_state.selected_local_file = selected_file
+                st.session_state.last_selection_ts = time.time()
+                st.rerun()
+    else:
+        st.markdown(f"<div style='color:white; font-size:0.9em;'>{TRANSLATIONS[lang]['no_files']}</div>", unsafe_allow_html=True)
+
+@st.cache_resource(max_entries=4096, show_spinner=False)
+def tour_day(file, key):
+    # Lokales Tour-Datum einer Datei-Version: nur die Zeitspalte (Archiv / Parse-Cache), keine Analyse
+    parsed = load_gpx(file)
+    if not parsed["has_track"] or not len(parsed["track"]):
+        return None
+    start_time, _ = parsed["track"].time_bounds()
+    return local_date(start_time) if start_time else None
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_fleet_days(folder, version):
+    # Touren des GPX-Ordners nach Tag: {Tag: [(tour_nr, key), ...]}, einmal pro Index-Version für alle Sessions.
+    # Analysiert wird erst beim Anzeigen eines Tages und nur dessen Touren.
+    days = {}
+    for fname, _ in get_file_index(folder).snapshot()[1]:
+        path = os.path.join(folder, fname)
+        try:
+            key = tour_identity(path)
+            day = tour_day(path, key)
+        except Exception as e:
+            print(f"Error extracting {fname}: {e}")
+            continue
+        if day:
+            days.setdefault(day, []).append((tour_nr_from_filename(fname), key))
+    return days
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_fleet_collection(day_tours, geo_version):
+    # Vereinfachte GeoJSON-Ebene eines Tages für alle Sessions. Gehalten werden nur die Features;
+    # die vollen Touren kommen aus dem speicherbegrenzten Tour-Cache und werden danach losgelassen.
+    from map_render import fleet_feature_collection
+    keys = [key for _, key in day_tours]
+    return fleet_feature_collection([(nr, get_tour_data(key[0], key)) for nr, key in day_tours], keys)
+
+def show_fleet_view():
+    # Alle Touren eines Tages als eine GeoJSON-Ebene (statt PolyLine/Marker pro Tour)
+    from map_render import build_fleet_map
+    lang = st.session_state.language
+    version = get_file_index(GPX_FOLDER_PATH).refresh()
+    days = load_fleet_days(GPX_FOLDER_PATH, version)
+    dates = sorted(days, reverse=True)
+    if not dates:
+        st.markdown(f"<div style='color:white;'>{get_text('no_files')}</div>", unsafe_allow_html=True)
+        return
+    date_fmt = TRANSLATIONS[lang]["date_format"]
+    f1, f2, f3 = st.columns([1, 3, 1])
+    with f1:
+        day = st.selectbox(get_text("fleet_day"), dates, format_func=lambda d: datetime.strptime(d, "%Y-%m-%d").strftime(date_fmt))
+    day_tours = tuple(sorted(days[day], key=lambda t: t[0]))
+    keys = [key for _, key in day_tours]
+    geo_index = get_customer_geo_index(CSV_FOLDER_PATH, ANALYTICS_DB_PATH)
+    collection = build_fleet_collection(day_tours, geo_index.version if geo_index is not None else None)
+    n_points = sum(len(f["geometry"]["coordinates"]) for f in collection["features"] if f["geometry"]["type"] == "LineString")
+    with f2:
+        st.markdown("<div style='height: 28px'></div>", unsafe_allow_html=True)
+        st.markdown(get_text("fleet_info").format(tours=len(day_tours), points=n_points, tolerance=collection["properties"]["tolerance_m"]))
+    with f3:
+        st.markdown("<div style='height: 28px'></div>", unsafe_allow_html=True)
+        st.download_button(get_text("btn_geojson"), json.dumps(collection, separators=(",", ":")),
+                           f"Touren_{day}.geojson", "application/geo+json")
+    fleet_html = render_tour_map_html(("fleet", tuple(keys), collection["properties"]["tolerance_m"]),
+                                      MAP_HTML_CACHE_MB * 1024 * 1024, lambda: build_fleet_map(collection))
+    with stage("components_html"):
+        components.html(fleet_html, height=800)
+
+def upload_queue():
+    return get_upload_queue(GPX_FOLDER_PATH, PARSE_CACHE_PATH, PARSE_CACHE_MAX_MB * 1024 * 1024)
+
+@st.fragment(run_every=1)
+def upload_status_fragment(job_id):
+    # Pollt nur den Job-Status; ist der Job fertig, lädt ein App-Rerun die gespeicherte Datei
+    job = upload_queue().get(job_id)
+    if job is None or not job.pending:
+        st.rerun()
+    st.info(get_text("upload_running" if job.status == JOB_RUNNING else "upload_queued").format(name=job.filename))
+
+@st.dialog("Manual")
+def show_help_dialog():
+    lang = st.session_state.get('language', 'Deutsch')
+    st.markdown(TRANSLATIONS[lang]["manual_md"])
+    if st.button("Close"):
+        st.rerun()
+
+def run_batch_export(customer_db, force=False):
+    files = get_local_gpx_files_info()
+    if not files: return
+    
+    if not EXPORT_FOLDER_PATH or not os.path.exists(EXPORT_FOLDER_PATH):
+        st.session_state.save_msg = get_text("batch_error")
+        return
+
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    export_count = 0
+    lang = st.session_state.get('language', 'Deutsch')
+    paths = [os.path.join(GPX_FOLDER_PATH, f_info["real_filename"]) for f_info in files]
+    
+    # Parsen + Export laufen parallel im Prozess-Pool, aktuelle CSVs werden übersprungen (außer mit force)
+    with stage("batch_export"):
+        for done, total, (fname, status, detail) in run_batch(paths, EXPORT_FOLDER_PATH, lang, customer_db, PARSE_CACHE_PATH,
+                                                              force=force, archive_dir=TRACK_ARCHIVE_FOLDER):
+            if status == STATUS_EXPORTED:
+                export_count += 1
+            elif status == STATUS_ERROR:
+                print(f"Error extracting {fname}: {detail}")
+            status_text.text(f"Processing: {fname}...")
+            progress_bar.progress(done / total)
+        
+    status_text.empty()
+    progress_bar.empty()
+    st.session_state.save_msg = f"{get_text('batch_success')} {export_count}"
+    st.rerun()
+
+def main():
+    st.set_page_config(page_title="LKW Touren Viewer Pro", page_icon="🚚", layout="wide")
+    
+    # --- INIT STATE ---
+    if 'language' not in st.session_state: st.session_state.language = 'Deutsch'
+    if 'show_right_sidebar' not in st.session_state: st.session_state.show_right_sidebar = True
+    if 'page_number' not in st.session_state: st.session_state.page_number = 0
+    if 'file_page' not in st.session_state: st.session_state.file_page = 0
+    if 'selected_customer_id' not in st.session_state: st.session_state.selected_customer_id = None
+    if 'selected_local_file' not in st.session_state: st.session_state.selected_local_file = None
+    if 'last_upload_ts' not in st.session_state: st.session_state.last_upload_ts = 0.0
+    if 'upload_jobs' not in st.session_state: st.session_state.upload_jobs = {} # Upload-ID -> Job-ID
+    if 'upload_job' not in st.session_state: st.session_state.upload_job = None # zuletzt hochgeladene Datei
+    if 'last_selection_ts' not in st.session_state: st.session_state.last_selection_ts = 0.0
+    if 'loaded_file_name' not in st.session_state: st.session_state.loaded_file_name = None
+    if 'tour_key' not in st.session_state: st.session_state.tour_key = None
+    if 'save_msg' not in st.session_state: st.session_state.save_msg = None 
+
+    customer_db = load_customer_db()
+    
+    # NEU: Auch wenn keine DB da ist, können wir Namen anzeigen, da sie im GPX stehen
+    has_customer_names = True 
+
+    logo_base64 = get_logo_base64("movisl.jpg")
+
+    # --- CSS DESIGN ---
+    st.markdown(get_app_css(get_text('upload_text')), unsafe_allow_html=True)
 
     # --- HEADER & CONTROLS ---
     version_html = f'<div class="version">v{APP_VERSION}</div>'
@@ -590,36 +469,62 @@ def main():
             st.markdown("<div style='height: 28px'></div>", unsafe_allow_html=True) 
             def on_upload_change(): st.session_state.last_upload_ts = time.time()
             uploaded_file = st.file_uploader("Upload", type=['gpx'], label_visibility="collapsed", on_change=on_upload_change)
+
+            # Upload im Hintergrund speichern und einlesen (einmal pro hochgeladener Datei)
+            if uploaded_file is not None:
+                upload_key = getattr(uploaded_file, "file_id", None) or uploaded_file.name
+                if upload_key not in st.session_state.upload_jobs:
+                    job_id = upload_queue().submit(uploaded_file.name, uploaded_file.getvalue())
+                    st.session_state.upload_jobs[upload_key] = job_id
+                    st.session_state.upload_job = job_id
+            job = upload_queue().get(st.session_state.upload_job) if st.session_state.upload_job else None
+            if job is not None and job.pending:
+                upload_status_fragment(job.id)
+            elif job is not None:
+                st.session_state.upload_job = None
+                if job.status == JOB_DONE:
+                    # Nur anzeigen, wenn seit dem Upload keine andere Tour ausgewählt wurde
+                    if st.session_state.last_upload_ts > st.session_state.last_selection_ts:
+                        st.session_state.selected_local_file = os.path.basename(job.path)
+                        st.session_state.last_selection_ts = time.time()
+                else:
+                    st.error(get_text("upload_error").format(name=job.filename, error=job.detail))
             
             # --- BATCH EXPORT BUTTON ---
             st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
             if EXPORT_FOLDER_PATH and os.path.exists(EXPORT_FOLDER_PATH):
                 if st.button(get_text("btn_batch_export"), use_container_width=True):
-                    run_batch_export(customer_db)
+                    run_batch_export(customer_db, st.session_state.get("batch_force", False))
+                st.checkbox(get_text("batch_force"), key="batch_force")
+            st.toggle(get_text("fleet_toggle"), key="fleet_view")
 
-        file_to_process = None
+        file_to_process = None # Pfad zur lokalen Datei (Uploads liegen nach der Verarbeitung im GPX-Ordner)
         file_name_display = ""
-        is_upload_newer = st.session_state.last_upload_ts > st.session_state.last_selection_ts
         
-        if uploaded_file is not None and is_upload_newer:
-            file_to_process, file_name_display = uploaded_file, uploaded_file.name
-        elif st.session_state.selected_local_file:
+        if st.session_state.selected_local_file:
             full_path = os.path.join(GPX_FOLDER_PATH, st.session_state.selected_local_file)
-            try:
-                if os.path.exists(full_path):
-                    file_to_process, file_name_display = open(full_path, 'rb'), st.session_state.selected_local_file
-            except: pass
+            if os.path.exists(full_path):
+                file_to_process, file_name_display = full_path, st.session_state.selected_local_file
         
+        # Die Session merkt sich nur die Tour-Kennung; die Daten liegen im gemeinsamen Tour-Cache
+        # (geänderte Datei -> neue Kennung -> wird neu geladen)
+        tour_data = None
         if file_to_process:
-            if st.session_state.loaded_file_name != file_name_display:
-                st.session_state.tour_data = process_gpx_data(file_to_process, customer_db)
-                st.session_state.loaded_file_name = file_name_display
+            st.session_state.tour_key = tour_identity(file_to_process)
+            st.session_state.loaded_file_name = file_name_display
+            tour_data = get_tour_data(file_to_process, st.session_state.tour_key)
         
     # --- HAUPTBEREICH ---
-    if st.session_state.tour_data and st.session_state.tour_data["points"]:
-        data = st.session_state.tour_data
-        points = data["points"]
+    if st.session_state.get("fleet_view"):
+        show_fleet_view()
+        return
+
+    if tour_data and len(tour_data["track"]):
+        data = tour_data
+        track = data["track"]
         customer_stops = data["customer_stops"]
+        # Übersetzte Tabellenzeilen werden pro Rerun aus den sprachneutralen Stopps gebaut
+        lang = st.session_state.language
 
         tour_nr = ""
         if st.session_state.loaded_file_name:
@@ -631,51 +536,36 @@ def main():
         
         with stat_row_left:
             s1, s2, s3 = st.columns(3, gap="small")
-            with s1: st.markdown(f"<div style='{box_style}'><div style='font-size:0.9em; opacity:0.8'>{get_text('stats_start')}</div><div style='font-size:1.1em; font-weight:bold'>{data['start_time']}</div></div>", unsafe_allow_html=True)
-            with s2: st.markdown(f"<div style='{box_style}'><div style='font-size:0.9em; opacity:0.8'>{get_text('stats_end')}</div><div style='font-size:1.1em; font-weight:bold'>{data['end_time']}</div></div>", unsafe_allow_html=True)
+            with s1: st.markdown(f"<div style='{box_style}'><div style='font-size:0.9em; opacity:0.8'>{get_text('stats_start')}</div><div style='font-size:1.1em; font-weight:bold'>{format_clock(data['start_time'], lang)}</div></div>", unsafe_allow_html=True)
+            with s2: st.markdown(f"<div style='{box_style}'><div style='font-size:0.9em; opacity:0.8'>{get_text('stats_end')}</div><div style='font-size:1.1em; font-weight:bold'>{format_clock(data['end_time'], lang)}</div></div>", unsafe_allow_html=True)
             with s3: st.markdown(f"<div style='{box_style}'><div style='font-size:0.9em; opacity:0.8'>{get_text('stats_dist')}</div><div style='font-size:1.1em; font-weight:bold'>{data['dist_km']:.2f} km</div></div>", unsafe_allow_html=True)
             
         with stat_row_right:
             st.markdown(f"<div style='{box_style}'><div style='font-size:0.9em; opacity:0.8'>{get_text('stats_speed')}</div><div style='font-size:1.1em; font-weight:bold'>{data['avg_speed']:.1f} km/h</div></div>", unsafe_allow_html=True)
         
         st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
+
+        if st.session_state.tour_key:
+            time_window_fragment(track, customer_stops, st.session_state.tour_key)
         
         # --- KARTE ---
-        mid_p = points[len(points)//2]
+        mid_p = track.point_at(len(track)//2)
         zoom_val = 12
         if st.session_state.selected_customer_id:
             for stop in customer_stops:
-                if stop[get_text("col_cust_nr")] == st.session_state.selected_customer_id:
-                    mid_p = [stop['Lat'], stop['Lon']]
+                if stop.display_id == st.session_state.selected_customer_id:
+                    mid_p = [stop.lat, stop.lon]
                     zoom_val = 16 
                     break
         
         bcol_left, bcol_right = st.columns([1, 1])
         with bcol_left:
-            m = folium.Map(location=mid_p, zoom_start=zoom_val, double_click_zoom=False)
-            folium.PolyLine(points, color="red", weight=5, opacity=0.8).add_to(m)
-            c_nr, c_name = get_text("col_cust_nr"), get_text("col_name")
-            c_dur, c_arr, c_dep = get_text("col_dur"), get_text("col_arr"), get_text("col_dep")
-            for stop in customer_stops:
-                is_sel = (stop[c_nr] == st.session_state.selected_customer_id)
-                
-                # Icon Logik: Pause = Kaffee-Tasse, Kunde = User/Stern
-                icon_type = "user"
-                if "PAUSE" in str(stop[c_nr]).upper():
-                    icon_type = "coffee"
-                elif is_sel:
-                    icon_type = "star"
-                    
-                icon_color = "red" if is_sel else "blue"
-                if "PAUSE" in str(stop[c_nr]).upper():
-                    icon_color = "orange"
-
-                name_disp = stop.get(c_name, '')
-                popup_text = f"<b>{c_nr}: {stop[c_nr]}</b>{f'<br>({name_disp})' if name_disp else ''}<br>{c_dur}: {stop[c_dur]} min<br>{c_arr}: {stop[c_arr]}<br>{c_dep}: {stop[c_dep]}"
-                tooltip_text = f"{c_nr}: {stop[c_nr]}{f' ({name_disp})' if name_disp else ''}"
-                
-                folium.Marker([stop['Lat'], stop['Lon']], popup=folium.Popup(popup_text, max_width=300, auto_pan=False), tooltip=tooltip_text, icon=folium.Icon(color=icon_color, icon=icon_type, prefix="fa")).add_to(m)
-            map_html = m.get_root().render()
+            labels = (get_text("col_cust_nr"), get_text("col_name"), get_text("col_dur"), get_text("col_arr"), get_text("col_dep"))
+            map_key = (st.session_state.tour_key, st.session_state.selected_customer_id, lang,
+                       MAP_SIMPLIFY_TOLERANCE_M, repr(MAP_LOD_LEVELS), getattr(customer_db, "version", None))
+            map_html = render_tour_map_html(map_key, MAP_HTML_CACHE_MB * 1024 * 1024, lambda: build_tour_map_lazy(
+                track, customer_stops, stop_rows(customer_stops, lang, customer_db), labels, mid_p, zoom_val, st.session_state.selected_customer_id,
+                MAP_SIMPLIFY_TOLERANCE_M, MAP_LOD_LEVELS))
             st.download_button(get_text("btn_save_map"), map_html, "LKW_Tour.html", "text/html")
         
         with bcol_right:
@@ -686,13 +576,12 @@ def main():
                     st.rerun()
             with sub_c2:
                 # --- EXPORT BUTTONS ---
-                if customer_stops:
-                    df_export = pd.DataFrame(customer_stops)
-                    df_export.insert(0, "TourNr", tour_nr)
-                    df_export.insert(1, "Datum", data['date_str'])
-                    df_export = df_export.drop(columns=['Lat', 'Lon'], errors='ignore')
-                    csv_data = df_export.to_csv(index=False, sep=';', encoding='utf-16').encode('utf-16')
-                    filename_csv = f"Standzeiten_{data['date_str']}_{tour_nr}.csv"
+                # Wie Batch-Export und CLI: nur die im GPX protokollierten Stopps, keine AUTO-Stopps
+                if export_stops(data):
+                    with stage("export_csv"):
+                        export_table = export_rows(data, tour_nr, lang, customer_db)
+                        csv_data = csv_bytes(export_table)
+                    filename_csv = export_filename(data, tour_nr, lang)
                     
                     if EXPORT_FOLDER_PATH and os.path.exists(EXPORT_FOLDER_PATH):
                         bx1, bx2 = st.columns(2)
@@ -701,9 +590,7 @@ def main():
                         with bx2:
                             if st.button(get_text("btn_save_direct")):
                                 try:
-                                    full_save_path = os.path.join(EXPORT_FOLDER_PATH, filename_csv)
-                                    with open(full_save_path, "wb") as f:
-                                        f.write(csv_data)
+                                    write_csv(os.path.join(EXPORT_FOLDER_PATH, filename_csv), export_table)
                                     st.session_state.save_msg = f"{get_text('save_success')}{filename_csv}"
                                 except Exception as e:
                                     st.session_state.save_msg = f"{get_text('save_error')} {str(e)}"
@@ -719,7 +606,8 @@ def main():
             c_map, c_list = st.columns([1, 1])
             with c_map: 
                 st.markdown("<div style='margin-top: -15px;'></div>", unsafe_allow_html=True)
-                components.html(map_html, height=800)
+                with stage("components_html"):
+                    components.html(map_html, height=800)
             
             with c_list:
                 st.markdown(f'<div style="position: sticky; top: {HEADER_HEIGHT_PIXELS + 20}px; z-index: 100;">', unsafe_allow_html=True)
@@ -727,21 +615,20 @@ def main():
                 if tour_nr:
                     header_text += f" Tour {tour_nr}"
                 st.markdown(f"<div style='text-align: center; color: white; margin-bottom: 5px; font-weight: bold; font-size: 1.1em;'>{header_text}</div>", unsafe_allow_html=True)
-                total_stops = len(customer_stops)
-                num_pages = math.ceil(total_stops / ROWS_PER_PAGE)
-                start_idx = st.session_state.page_number * ROWS_PER_PAGE
-                current_batch = customer_stops[start_idx : start_idx + ROWS_PER_PAGE]
-                df_stops = pd.DataFrame(current_batch)
+                # Nur die angezeigte Seite wird übersetzt und zur Tabelle gemacht
+                stop_page = get_page(customer_stops, st.session_state.page_number, ROWS_PER_PAGE,
+                                     lambda stops: stop_table_rows(stops, lang, customer_db))
+                st.session_state.page_number = stop_page.number
+                num_pages = stop_page.count
+                current_batch = stop_page.rows
                 
                 # --- KUNDENLISTE STYLE: Hintergrund Schwarz (#1c1c1c) ---
                 cols = [get_text("col_cust_nr"), get_text("col_arr"), get_text("col_dep"), get_text("col_dur")]
                 if has_customer_names: cols.insert(1, get_text("col_name"))
+                if has_delivery_windows(customer_db): cols.append(get_text("col_window"))
                 
                 sel = st.dataframe(
-                    df_stops.style.set_properties(**{
-                        'background-color': '#1c1c1c', # Schwarz (dunkelgrau) 
-                        'color': 'white'
-                    }), 
+                    dark_table(current_batch), 
                     width="stretch", 
                     hide_index=True, 
                     column_order=cols, 
@@ -763,8 +650,96 @@ def main():
                     st.markdown(f"<div style='text-align:center;'>{page_txt}</div>", unsafe_allow_html=True)
                 with n3:
                     if st.session_state.page_number < num_pages-1 and st.button(get_text("nav_next")): st.session_state.page_number += 1; st.rerun()
+
+                # Unvollständige / überlappende Events (BEGIN ohne END usw.) nicht verschweigen
+                event_issues = data.get("event_issues")
+                if event_issues:
+                    with st.expander(get_text("event_issues").format(count=len(event_issues))):
+                        st.markdown("\n".join(f"- {line}" for line in issue_lines(event_issues, lang)))
+
+                # Standortprüfung: fand der CLIENT-Stopp wirklich beim angegebenen Kunden statt?
+                geo_index = get_customer_verify_index(CSV_FOLDER_PATH)
+                client_stops = [s for s in customer_stops if s.type == "CLIENT" and s.id]
+                if geo_index is not None and client_stops:
+                    checks = verify_locations([s.id for s in client_stops], [s.lat for s in client_stops],
+                                              [s.lon for s in client_stops], geo_index)
+                    geo_lines = location_lines(client_stops, checks, lang)
+                    if geo_lines:
+                        with st.expander(get_text("geo_issues").format(count=len(geo_lines))):
+                            st.markdown("\n".join(f"- {line}" for line in geo_lines))
                 st.markdown('</div>', unsafe_allow_html=True)
         else: 
-            components.html(map_html, height=800)
+            with stage("components_html"):
+                components.html(map_html, height=800)
+
+@st.fragment
+def time_window_fragment(track, stops, tour_key):
+    # "Wo war der LKW zwischen 10:00 und 10:30?" - Schieben des Zeitfensters läuft nur dieses Fragment
+    # neu (Binärsuche auf der Zeitachse), die Tour-Karte wird dafür nicht neu gebaut
+    start, end = track.time_bounds()
+    if start is None or end <= start:
+        return
+    with st.expander(get_text("window_title")):
+        local_min = (start + TIME_OFFSET).replace(tzinfo=None, second=0, microsecond=0)
+        local_max = (end + TIME_OFFSET).replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        sel_from, sel_to = st.slider(get_text("window_range"), min_value=local_min, max_value=local_max,
+                                     value=(local_min, min(local_min + timedelta(minutes=30), local_max)),
+                                     step=timedelta(minutes=1), format="HH:mm", key=f"time_window_{hash(tour_key)}")
+        w_start = (sel_from - TIME_OFFSET).replace(tzinfo=timezone.utc)
+        w_end = (sel_to - TIME_OFFSET).replace(tzinfo=timezone.utc)
+        with stage("time_window"):
+            part = track.window(w_start, w_end)
+            dist_km, avg_speed = part.stats()
+            position = track.position_at(w_end)
+        st.markdown(get_text("window_info").format(start=sel_from.strftime("%H:%M"), end=sel_to.strftime("%H:%M"),
+                                                   dist=dist_km, speed=avg_speed, points=len(part)))
+        if position:
+            st.markdown(get_text("window_position").format(time=sel_to.strftime("%H:%M"), lat=position[0], lon=position[1]))
+        else:
+            st.markdown(get_text("window_no_position").format(time=sel_to.strftime("%H:%M")))
+
+        if st.toggle(get_text("window_replay"), key=f"time_window_replay_{hash(tour_key)}") and w_end > w_start:
+            t0, t1 = to_epoch_us(w_start), to_epoch_us(w_end)
+            window_stops = [s for s in stops if s.arrival and t0 <= to_epoch_us(s.arrival) < t1]
+            replay_html = render_tour_map_html((tour_key, "replay", t0, t1), MAP_HTML_CACHE_MB * 1024 * 1024,
+                                               lambda: build_replay_map_lazy(track, w_start, w_end, window_stops))
+            with stage("components_html"):
+                components.html(replay_html, height=500)
+
+def has_delivery_windows(customer_db):
+    return customer_db is not None and bool(customer_db.window_columns()[0])
+
+def stop_table_rows(stops, lang, customer_db):
+    # Zeilen einer Tabellenseite; mit Lieferfenstern in KND.STM zusätzlich die Prüfung der CLIENT-Stopps
+    rows = stop_rows(stops, lang, customer_db)
+    if has_delivery_windows(customer_db):
+        status, deviation = check_delivery_windows([s.id if s.type == "CLIENT" else "" for s in stops],
+                                                   [to_epoch_us(s.arrival) // 1_000_000 for s in stops], customer_db)
+        for row, label in zip(rows, window_labels(status, deviation, lang)):
+            row[get_text("col_window")] = label
+    return rows
+
+def show_timing_panel(stages):
+    # Laufzeiten dieses Reruns (settings.SHOW_TIMING_PANEL oder ?debug=1 in der URL)
+    if not stages or not (SHOW_TIMING_PANEL or st.query_params.get("debug") == "1"):
+        return
+    import pandas as pd
+    total_ms = sum(seconds for _, seconds, depth in stages if depth == 0) * 1000
+    with st.expander(get_text("timing_panel").format(ms=total_ms)):
+        rows = [{get_text("col_stage"): "\u2003" * depth + name, "ms": round(seconds * 1000, 1)} for name, seconds, depth in stages]
+        st.dataframe(pd.DataFrame(rows), hide_index=True, width="stretch")
+
+def run_app():
+    # Jeder Rerun ist ein Timing-Durchlauf (JSON-Log / Prometheus-Endpunkt laut settings.py)
+    configure_timing(TIMING_LOG_PATH)
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    begin_run("rerun")
+    try:
+        with stage("rerun"):
+            main()
+    finally:
+        stages = end_run()
+    show_timing_panel(stages)
 
-if __name__ == "__main__": main()
+if __name__ == "__main__": run_app()
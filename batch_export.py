@@ -0,0 +1,159 @@
+# --- PARALLELER BATCH-EXPORT ---
+# Parst und exportiert alle Touren parallel in einem Prozess-Pool (ohne Streamlit).
+# Touren, deren Standzeiten-CSV in der Export-Sprache neuer ist als GPX-Datei und KND.STM, werden übersprungen.
+# Mit collect=... gehen die Exportzeilen zusätzlich an den aufrufenden Prozess (Sammeldateien).
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from export_writer import write_csv
+from gpx_stream import parse_gpx
+from parse_cache import ParseCache
+from track_archive import open_for_gpx
+from tour_model import analyze_tour, export_filename, export_rows, export_stops, local_date
+from translations import TRANSLATIONS
+
+EXPORT_PREFIX = "Standzeiten_"
+
+# Ergebnis-Status pro Tour
+STATUS_EXPORTED = "exported"
+STATUS_EMPTY = "empty"       # Tour ohne Kundenstopps -> keine CSV
+STATUS_SKIPPED = "skipped"   # CSV ist aktuell
+STATUS_ERROR = "error"
+
+# Pro Worker-Prozess einmal gesetzt (Kundendaten nicht pro Aufgabe pickeln)
+_worker = {}
+
+
+def tour_nr_from_filename(filename):
+    # DL6001.gpx -> 6001
+    return os.path.splitext(filename)[0].upper().replace("DL", "")
+
+
+def find_tour_files(gpx_folder):
+    # Alle DL*.gpx Dateien im Ordner, neueste zuerst
+    found = []
+    try:
+        entries = list(os.scandir(gpx_folder))
+    except OSError:
+        return found
+    for entry in entries:
+        name = entry.name.upper()
+        if name.startswith('DL') and name.endswith('.GPX') and entry.is_file():
+            found.append((entry.stat().st_mtime, entry.path))
+    found.sort(reverse=True)
+    return [path for _, path in found]
+
+
+def latest_exports(export_dir, lang):
+    # TourNr -> mtime_ns der neuesten Standzeiten_<Datum>_<TourNr>.csv im Export-Ordner.
+    # Nur Dateien, deren Datum im Format der Sprache steht (wie export_filename): ein Export in
+    # einer anderen Sprache hat andere Spaltenköpfe und zählt nicht.
+    date_format = TRANSLATIONS[lang]["date_format"]
+    latest = {}
+    try:
+        entries = list(os.scandir(export_dir))
+    except OSError:
+        return latest
+    for entry in entries:
+        name = entry.name
+        if not (name.startswith(EXPORT_PREFIX) and name.lower().endswith(".csv")):
+            continue
+        parts = name[len(EXPORT_PREFIX):-4].split("_", 1)
+        if len(parts) != 2:
+            continue
+        try:
+            datetime.strptime(parts[0], date_format)
+        except ValueError:
+            continue
+        mtime_ns = entry.stat().st_mtime_ns
+        if mtime_ns > latest.get(parts[1], 0):
+            latest[parts[1]] = mtime_ns
+    return latest
+
+
+def plan_batch(gpx_paths, export_dir, lang, customer_db=None, force=False):
+    # Teilt die Dateien in (zu exportieren, übersprungen) auf. Die Namen in der CSV kommen aus
+    # KND.STM -> eine neuere KND.STM macht alle bestehenden Exporte ungültig.
+    latest = {} if force else latest_exports(export_dir, lang)
+    version = getattr(customer_db, "version", None)
+    customer_mtime_ns = version[0] if version else 0
+    todo, skipped = [], []
+    for path in gpx_paths:
+        tour_nr = tour_nr_from_filename(os.path.basename(path))
+        try:
+            is_current = latest.get(tour_nr, 0) >= max(os.stat(path).st_mtime_ns, customer_mtime_ns)
+        except OSError:
+            is_current = False
+        (skipped if is_current else todo).append(path)
+    return todo, skipped
+
+
+def _init_worker(export_dir, lang, customer_db, cache_path, collect=False, archive_dir=None):
+    _worker.update(export_dir=export_dir, lang=lang, customer_db=customer_db, cache_path=cache_path, collect=collect,
+                   archive_dir=archive_dir)
+
+
+def export_tour(path):
+    # Eine Tour laden (Track-Archiv, sonst Parse-Cache) und als UTF-16 CSV schreiben.
+    # Liefert (datei, status, detail, (tour_datum, zeilen) oder None); die Zeilen nur mit collect.
+    fname = os.path.basename(path)
+    tour_nr = tour_nr_from_filename(fname)
+    lang = _worker["lang"]
+    try:
+        gpx = open_for_gpx(path, _worker["archive_dir"])
+        if gpx is None and _worker["cache_path"]:
+            gpx = ParseCache(_worker["cache_path"]).get_or_parse(path)
+        elif gpx is None:
+            with open(path, 'rb') as f:
+                gpx = parse_gpx(f)
+        data = analyze_tour(gpx)
+        if not export_stops(data):
+            return fname, STATUS_EMPTY, None, None
+
+        rows = export_rows(data, tour_nr, lang, _worker["customer_db"])
+        csv_filename = export_filename(data, tour_nr, lang)
+        write_csv(os.path.join(_worker["export_dir"], csv_filename), rows)
+        collected = (local_date(data["start_time"]), rows) if _worker["collect"] else None
+        return fname, STATUS_EXPORTED, csv_filename, collected
+    except Exception as e:
+        return fname, STATUS_ERROR, str(e), None
+
+
+def _finish(result, collect):
+    fname, status, detail, collected = result
+    if collect and collected:
+        collect(*collected)
+    return fname, status, detail
+
+
+def run_batch(gpx_paths, export_dir, lang, customer_db=None, cache_path=None, workers=None, force=False, collect=None,
+              archive_dir=None):
+    # Generator: liefert nach jeder fertigen Tour (erledigt, gesamt, (datei, status, detail))
+    # collect(tour_datum, zeilen): optional, im aufrufenden Prozess für jede exportierte Tour
+    todo, skipped = plan_batch(gpx_paths, export_dir, lang, customer_db, force)
+    total = len(gpx_paths)
+    done = 0
+    for path in skipped:
+        done += 1
+        yield done, total, (os.path.basename(path), STATUS_SKIPPED, None)
+
+    init_args = (export_dir, lang, customer_db, cache_path, collect is not None, archive_dir)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(todo) <= 1:
+        # Pool-Start lohnt sich nicht -> direkt im aufrufenden Prozess
+        _init_worker(*init_args)
+        for path in todo:
+            done += 1
+            yield done, total, _finish(export_tour(path), collect)
+        return
+
+    # "spawn": kein fork() aus dem multithreaded Streamlit-Server heraus
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker, initargs=init_args)
+    with pool:
+        futures = [pool.submit(export_tour, path) for path in todo]
+        for future in as_completed(futures):
+            done += 1
+            yield done, total, _finish(future.result(), collect)
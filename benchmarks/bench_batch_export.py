@@ -0,0 +1,49 @@
+# --- BENCHMARK: Batch-Export seriell vs. Prozess-Pool ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_batch_export.py [anzahl_touren]
+# Legt ein temporäres Verzeichnis mit Kopien der DL*.gpx Dateien an (Standard: 2000 Touren)
+# und misst Touren/Sekunde für den seriellen Lauf, den parallelen Lauf und den Wiederholungslauf
+# (alle CSVs aktuell -> alles wird übersprungen).
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_export import STATUS_EXPORTED, STATUS_SKIPPED, run_batch
+
+
+def make_tour_dir(target, count):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sources = sorted(glob.glob(os.path.join(root, "DL*.gpx")))
+    paths = []
+    for i in range(count):
+        path = os.path.join(target, f"DL{10000 + i}.gpx")
+        shutil.copyfile(sources[i % len(sources)], path)
+        paths.append(path)
+    return paths
+
+
+def timed_run(label, paths, export_dir, workers, force):
+    t0 = time.perf_counter()
+    counts = {}
+    for _, _, (_, status, _) in run_batch(paths, export_dir, "Deutsch", workers=workers, force=force):
+        counts[status] = counts.get(status, 0) + 1
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<28}{elapsed:>8.2f} s{len(paths) / elapsed:>10.0f} Touren/s   "
+          f"exportiert={counts.get(STATUS_EXPORTED, 0)} übersprungen={counts.get(STATUS_SKIPPED, 0)}")
+
+
+def main(count):
+    with tempfile.TemporaryDirectory() as gpx_dir, tempfile.TemporaryDirectory() as export_dir:
+        paths = make_tour_dir(gpx_dir, count)
+        print(f"{count} Touren, {os.cpu_count()} CPUs")
+        timed_run("seriell (1 Prozess)", paths, export_dir, workers=1, force=True)
+        timed_run(f"parallel ({os.cpu_count()} Prozesse)", paths, export_dir, workers=None, force=True)
+        timed_run("inkrementell (unverändert)", paths, export_dir, workers=None, force=False)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
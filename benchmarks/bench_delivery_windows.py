@@ -0,0 +1,97 @@
+# --- BENCHMARK: Lieferfenster-Prüfung über ein Jahr Touren ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_delivery_windows.py [anzahl_kunden] [anzahl_stopps]
+# Synthetische KND.STM-Spalten (ein oder zwei Fenster, teils über Mitternacht, teils ohne Fenster) und
+# CLIENT-Stopps über 365 Tage. Vergleicht die vektorisierte Prüfung (delivery_windows) mit einer
+# Schleife je Stopp über CustomerIndex.delivery_windows und prüft, dass beide dasselbe ergeben.
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from customer_db import CUSTOMER_COLUMNS, CustomerIndex
+from delivery_windows import (MINUTES_PER_DAY, WINDOW_EARLY, WINDOW_LATE, WINDOW_NONE, WINDOW_OK, arrival_minutes,
+                              check_delivery_windows, summarize)
+
+
+def make_customers(count, rng):
+    columns = {col: [""] * count for col in CUSTOMER_COLUMNS}
+    columns["NUMBER"] = [f"{k:07d}" for k in range(count)]
+    columns["NAME"] = [f"Kunde {k}" for k in range(count)]
+    for k in range(count):
+        kind = rng.integers(0, 4)
+        if kind == 0:
+            continue  # kein Fenster
+        b1 = int(rng.integers(5, 14)) * 60
+        columns["DLVRTIMEB1"][k], columns["DLVRTIMEE1"][k] = f"{b1 // 60:02d}00", f"{b1 // 60 + 2:02d}00"
+        if kind == 2:
+            columns["DLVRTIMEB2"][k], columns["DLVRTIMEE2"][k] = "1400", "1630"
+        elif kind == 3:
+            columns["DLVRTIMEB2"][k], columns["DLVRTIMEE2"][k] = "2200", "0400"  # über Mitternacht
+    return columns
+
+
+def reference(customer_ids, arrivals, index):
+    # Eine Python-Schleife je Stopp (so wie man es ohne Vektorisierung schreiben würde)
+    status, deviation = [], []
+    for cid, minute in zip(customer_ids, arrival_minutes(arrivals).tolist()):
+        windows = index.delivery_windows(cid)
+        if not windows:
+            status.append(WINDOW_NONE)
+            deviation.append(0)
+            continue
+        best = None
+        for b, e in windows:
+            e = min(e, MINUTES_PER_DAY - 1)
+            if (minute - b) % MINUTES_PER_DAY <= (e - b) % MINUTES_PER_DAY:
+                best = (WINDOW_OK, 0)
+                break
+            early, late = (b - minute) % MINUTES_PER_DAY, (minute - e) % MINUTES_PER_DAY
+            candidate = (WINDOW_EARLY, early) if early <= late else (WINDOW_LATE, late)
+            # Gleicher Abstand zu zwei Fenstern: "zu früh" gewinnt (wie in delivery_windows)
+            if best is None or candidate[1] < best[1] or (candidate[1] == best[1] and candidate[0] == WINDOW_EARLY):
+                best = candidate
+        status.append(best[0])
+        deviation.append(best[1])
+    return status, deviation
+
+
+def main(n_customers, n_stops):
+    rng = np.random.default_rng(0)
+    index = CustomerIndex(make_customers(n_customers, rng))
+    customer_ids = [f"{k:07d}" for k in rng.integers(0, n_customers, n_stops)]
+    day0 = 1767225600  # 2026-01-01 UTC
+    arrivals = day0 + rng.integers(0, 365, n_stops) * 86400 + rng.integers(4 * 3600, 18 * 3600, n_stops)
+    tour_keys = [f"{d}" for d in rng.integers(0, 365 * 40, n_stops)]  # 40 Touren am Tag
+
+    t0 = time.perf_counter()
+    index.window_columns()
+    t_table = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    status, deviation = check_delivery_windows(customer_ids, arrivals, index)
+    t_vector = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    per_tour = summarize(tour_keys, status, deviation)
+    per_customer = summarize(customer_ids, status, deviation)
+    t_summary = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    expected_status, expected_dev = reference(customer_ids, arrivals, index)
+    t_loop = time.perf_counter() - t0
+
+    assert list(status) == expected_status and deviation.tolist() == expected_dev, "Vektorisiert != Schleife"
+    counts = {s: int((status == s).sum()) for s in (WINDOW_OK, WINDOW_EARLY, WINDOW_LATE, WINDOW_NONE)}
+    print(f"{n_customers} Kunden, {n_stops} Stopps: {counts}")
+    print(f"  Fenster-Tabelle aufbauen   {t_table * 1000:9.1f} ms")
+    print(f"  vektorisierte Prüfung      {t_vector * 1000:9.1f} ms")
+    print(f"  Zusammenfassung            {t_summary * 1000:9.1f} ms  ({len(per_tour)} Touren, {len(per_customer)} Kunden)")
+    print(f"  Schleife je Stopp          {t_loop * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 5_000, args[1] if len(args) > 1 else 500_000)
@@ -0,0 +1,102 @@
+# --- BENCHMARK: Event-Paarung aus Wegpunkten ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_event_pairing.py [anzahl_events ...]
+# Erzeugt synthetische Wegpunkt-Ströme (Kunden, Pausen, normale POIs, doppelte / fehlende
+# BEGIN- und END-Events) und misst die Paarung gegen den bisherigen Algorithmus.
+# Die Korrektheits-Prüfungen auf denselben Strömen stehen in tests/test_event_pairing.py.
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_pairing import EVENT_PATTERN, ISSUE_DUPLICATE_BEGIN, ISSUE_OVERLAP, ISSUE_UNMATCHED_BEGIN, ISSUE_UNMATCHED_END
+from tour_model import extract_stops
+
+REPEAT = 5
+START = datetime(2026, 1, 14, 6, 0, tzinfo=timezone.utc)
+
+
+def make_waypoints(n_events, seed=0):
+    # Überwiegend saubere BEGIN/END-Paare, dazwischen Störungen
+    rng = random.Random(seed)
+    waypoints = []
+    t = START
+    while len(waypoints) < n_events:
+        t += timedelta(seconds=rng.randint(60, 900))
+        roll = rng.random()
+        lat, lon = 48 + rng.random(), 11 + rng.random()
+        if roll < 0.1:
+            waypoints.append({"time": t, "name": f"POI {rng.randint(1, 99)}", "lat": lat, "lon": lon})
+            continue
+        if roll < 0.2:
+            begin, end = "PAUSE_BEGIN(Pause)", "PAUSE_END(Pause)"
+        else:
+            cid = f"{rng.randint(1, 400):07d}"
+            begin, end = f"CLIENT_BEGIN:{cid}(Kunde {cid})", f"CLIENT_END:{cid}(Kunde {cid})"
+        waypoints.append({"time": t, "name": begin, "lat": lat, "lon": lon})
+        if rng.random() < 0.02:
+            waypoints.append({"time": t + timedelta(seconds=30), "name": begin, "lat": lat, "lon": lon})  # doppelt
+        t += timedelta(seconds=rng.randint(120, 3600))
+        if rng.random() < 0.97:
+            waypoints.append({"time": t, "name": end, "lat": lat, "lon": lon})
+        if rng.random() < 0.02:
+            waypoints.append({"time": t + timedelta(seconds=5), "name": end, "lat": lat, "lon": lon})  # END ohne BEGIN
+    # Gelegentlich nicht chronologisch geliefert
+    for _ in range(len(waypoints) // 200):
+        i, j = rng.randrange(len(waypoints)), rng.randrange(len(waypoints))
+        waypoints[i], waypoints[j] = waypoints[j], waypoints[i]
+    return waypoints
+
+
+def legacy_pair_events(waypoints):
+    # Bisheriger Algorithmus als Referenz (Ergebnis als Tupel)
+    stops = []
+    open_events = {}
+    for wpt in sorted(waypoints, key=lambda x: x["time"] if x["time"] else datetime.min):
+        if not wpt["name"] or not wpt["time"]:
+            continue
+        match = EVENT_PATTERN.match(wpt["name"].strip())
+        if not match:
+            continue
+        data = match.groupdict()
+        evt_id = data['id'] if data['id'] else ""
+        evt_name = data['name'] if data['name'] else ""
+        event_key = evt_id if evt_id else evt_name
+        if data['state'] == "BEGIN":
+            open_events[event_key] = (data['type'], evt_id, evt_name, wpt["time"], None, wpt["lat"], wpt["lon"])
+        elif event_key in open_events:
+            begin = open_events.pop(event_key)
+            stops.append(begin[:4] + (wpt["time"],) + begin[5:])
+    return stops
+
+
+def count_issues(waypoints):
+    stops, issues = extract_stops(waypoints)
+    return len(stops), Counter(issue.kind for issue in issues)
+
+
+def best_of(func, *args):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(sizes):
+    print(f"{'Events':>8}{'Stopps':>8}{'doppelt':>9}{'offen':>7}{'END ohne':>10}{'überlappt':>11}{'ms alt':>9}{'ms neu':>9}")
+    for n in sizes:
+        waypoints = make_waypoints(n, seed=n)
+        n_stops, kinds = count_issues(waypoints)
+        t_old = best_of(legacy_pair_events, waypoints)
+        t_new = best_of(extract_stops, waypoints)
+        print(f"{n:>8}{n_stops:>8}{kinds[ISSUE_DUPLICATE_BEGIN]:>9}{kinds[ISSUE_UNMATCHED_BEGIN]:>7}"
+              f"{kinds[ISSUE_UNMATCHED_END]:>10}{kinds[ISSUE_OVERLAP]:>11}{t_old * 1000:>9.2f}{t_new * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100, 1000, 10000, 100000])
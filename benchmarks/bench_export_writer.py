@@ -0,0 +1,85 @@
+# --- BENCHMARK: Standzeiten-Export pandas vs. Export-Writer ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_export_writer.py [anzahl_touren]
+# Misst nur das Schreiben (ohne Parsen): dieselben Exportzeilen von Standard 10000 Touren werden
+#  - wie früher je Tour über pd.DataFrame(...).to_csv(encoding='utf-16') geschrieben,
+#  - mit export_writer.write_csv je Tour (atomar),
+#  - zusätzlich in Sammeldateien je Tag (CSV und, falls pyarrow installiert, Parquet).
+# Prüft außerdem, dass alte und neue Tour-CSVs byteweise gleich sind.
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from export_writer import FORMAT_CSV, FORMAT_PARQUET, PERIOD_DAY, PeriodWriter, write_csv
+from gpx_stream import parse_gpx
+from synth_gpx import make_gpx
+from tour_model import analyze_tour, export_filename, export_rows, local_date
+
+
+def make_tours(count):
+    # Wenige echte Analysen, über 30 Tage verteilt wiederverwendet: (tour_nr, datum, zeilen, dateiname)
+    templates = [analyze_tour(parse_gpx(io.BytesIO(make_gpx(2000, n, seed=n)))) for n in (20, 40, 60)]
+    tours = []
+    for i in range(count):
+        data = dict(templates[i % len(templates)])
+        data["start_time"] = data["start_time"] + timedelta(days=i % 30)
+        tour_nr = str(10000 + i)
+        tours.append((tour_nr, local_date(data["start_time"]), export_rows(data, tour_nr, "Deutsch"),
+                      export_filename(data, tour_nr, "Deutsch")))
+    return tours
+
+
+def export_pandas(tours, target):
+    for _, _, rows, filename in tours:
+        pd.DataFrame(rows).to_csv(os.path.join(target, filename), index=False, sep=';', encoding='utf-16')
+
+
+def export_writer(tours, target):
+    for _, _, rows, filename in tours:
+        write_csv(os.path.join(target, filename), rows)
+
+
+def export_period(tours, target, fmt):
+    with PeriodWriter(target, PERIOD_DAY, fmt) as writer:
+        for _, day, rows, _ in tours:
+            writer.add(day, rows)
+        return writer.close()
+
+
+def timed(label, count, func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<34}{elapsed:>8.2f} s{count / elapsed:>10.0f} Touren/s")
+    return result
+
+
+def main(count):
+    tours = make_tours(count)
+    n_rows = sum(len(rows) for _, _, rows, _ in tours)
+    print(f"{count} Touren, {n_rows} Stopps")
+    with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir, \
+            tempfile.TemporaryDirectory() as period_dir:
+        timed("pandas DataFrame.to_csv je Tour", count, export_pandas, tours, old_dir)
+        timed("export_writer.write_csv je Tour", count, export_writer, tours, new_dir)
+        files = timed("Sammeldatei je Tag (CSV)", count, export_period, tours, period_dir, FORMAT_CSV)
+        try:
+            files += timed("Sammeldatei je Tag (Parquet)", count, export_period, tours, period_dir, FORMAT_PARQUET)
+        except ImportError:
+            print("Parquet übersprungen (pyarrow fehlt)")
+        print(f"{len(files)} Sammeldateien")
+
+        for name in sorted(os.listdir(old_dir))[:200]:
+            with open(os.path.join(old_dir, name), "rb") as a, open(os.path.join(new_dir, name), "rb") as b:
+                assert a.read() == b.read(), f"Unterschied in {name}"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,62 @@
+# --- BENCHMARK: Räumlicher Kunden-Index ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_geo_index.py [anzahl_kunden] [anzahl_stopps]
+# Vergleicht Gitter-Index und Brute Force (alle Stopps x alle Kunden) bei der Suche nach dem
+# nächsten Kunden und prüft, dass beide dieselben Kunden finden.
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geo_index import VERIFY_RADIUS_M, CustomerGeoIndex
+from track import ONE_DEGREE, haversine
+
+
+def brute_force(index, lat, lon, max_dist_m):
+    ids, best = [], []
+    for start in range(0, len(lat), 500):  # in Blöcken, sonst sprengt die Distanzmatrix den Speicher
+        dist = haversine(lat[start:start + 500, None], lon[start:start + 500, None], index.lat[None, :], index.lon[None, :])
+        k = np.argmin(dist, axis=1)
+        d = dist[np.arange(len(k)), k]
+        ids += [index.ids[c] if dc <= max_dist_m else "" for c, dc in zip(k, d)]
+        best.append(d)
+    return ids, np.concatenate(best)
+
+
+def main(n_customers, n_stops):
+    rng = np.random.default_rng(0)
+    # Kunden verteilt über ~200 x 200 km, Stopps zur Hälfte direkt beim Kunden (GPS-Versatz ~30 m)
+    cust_lat = 49.3 + rng.uniform(-0.9, 0.9, n_customers)
+    cust_lon = 7.0 + rng.uniform(-1.4, 1.4, n_customers)
+    ids = [f"{k:07d}" for k in range(n_customers)]
+    at_customer = rng.integers(0, n_customers, n_stops // 2)
+    lat = np.concatenate((cust_lat[at_customer] + rng.normal(0, 30 / ONE_DEGREE, len(at_customer)),
+                          49.3 + rng.uniform(-0.9, 0.9, n_stops - len(at_customer))))
+    lon = np.concatenate((cust_lon[at_customer] + rng.normal(0, 45 / ONE_DEGREE, len(at_customer)),
+                          7.0 + rng.uniform(-1.4, 1.4, n_stops - len(at_customer))))
+
+    t0 = time.perf_counter()
+    index = CustomerGeoIndex(ids, cust_lat, cust_lon)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    found, dist = index.nearest(lat, lon, VERIFY_RADIUS_M)
+    t_index = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    expected, _ = brute_force(index, lat, lon, VERIFY_RADIUS_M)
+    t_brute = time.perf_counter() - t0
+
+    assert found == expected, "Gitter-Index und Brute Force finden unterschiedliche Kunden"
+    matched = sum(1 for f in found if f)
+    print(f"{n_customers} Kunden, {n_stops} Stopps, Radius {VERIFY_RADIUS_M:.0f} m: {matched} zugeordnet")
+    print(f"  Index aufbauen   {t_build * 1000:9.1f} ms")
+    print(f"  Gitter-Index     {t_index * 1000:9.1f} ms  ({t_index / n_stops * 1e6:.2f} µs je Stopp)")
+    print(f"  Brute Force      {t_brute * 1000:9.1f} ms  ({t_brute / n_stops * 1e6:.2f} µs je Stopp)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 50_000, args[1] if len(args) > 1 else 20_000)
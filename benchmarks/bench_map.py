@@ -0,0 +1,51 @@
+# --- BENCHMARK: Karten-HTML mit und ohne Track-Vereinfachung ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_map.py [toleranz_m] [dateien...]
+# Misst Punktanzahl, HTML-Größe und Aufbau+Render-Zeit der folium-Karte je DL*.gpx Datei.
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gpx_stream import parse_gpx
+from map_render import build_tour_map
+from simplify import simplify_track
+from tour_model import analyze_tour, stop_rows
+
+REPEAT = 3
+LOD_LEVELS = {0: 50.0, 13: 10.0, 15: 2.0}
+
+
+def render(data, tolerance_m, lod_levels=None):
+    track, stops = data["track"], data["customer_stops"]
+    rows = stop_rows(stops, "Deutsch")
+    labels = ("Kunden Nr. / Typ", "Name / Event", "Dauer", "Ankunft", "Abfahrt")
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        m = build_tour_map(track, stops, rows, labels, track.point_at(len(track) // 2), 12, None, tolerance_m, lod_levels)
+        html = m.get_root().render()
+        best = min(best, time.perf_counter() - t0)
+    return len(html.encode("utf-8")), best
+
+
+def main(tolerance_m, paths):
+    print(f"Toleranz {tolerance_m} m, LOD-Stufen {LOD_LEVELS}")
+    print(f"{'Datei':<12}{'Punkte':>8}{'vereinf.':>10}{'HTML alle':>11}{'HTML vereinf.':>15}{'HTML LOD':>10}{'ms alle':>9}{'ms vereinf.':>13}")
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = analyze_tour(parse_gpx(f))
+        n_simple = len(simplify_track(data["track"], tolerance_m))
+        size_all, t_all = render(data, 0.0)
+        size_simple, t_simple = render(data, tolerance_m)
+        size_lod, _ = render(data, tolerance_m, LOD_LEVELS)
+        print(f"{os.path.basename(path):<12}{len(data['track']):>8}{n_simple:>10}{size_all / 1024:>9.0f}KB{size_simple / 1024:>13.0f}KB"
+              f"{size_lod / 1024:>8.0f}KB{t_all * 1000:>9.1f}{t_simple * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    tol = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    files = sys.argv[2:] or sorted(glob.glob(os.path.join(root, "DL*.gpx")))
+    main(tol, files)
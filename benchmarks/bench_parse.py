@@ -0,0 +1,62 @@
+# --- BENCHMARK: gpxpy DOM vs. Streaming-Parser ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_parse.py [dateien...]
+# Ohne Argumente werden alle DL*.gpx Dateien im Projektordner gemessen.
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gpxpy
+from gpx_stream import parse_gpx
+
+REPEAT = 5
+
+
+def parse_with_gpxpy(path):
+    # Alter Pfad aus process_gpx_data: kompletter Objektbaum + get_moving_data
+    with open(path, 'rb') as f:
+        gpx = gpxpy.parse(f)
+    points = [(p.latitude, p.longitude) for t in gpx.tracks for s in t.segments for p in s.points]
+    moving = gpx.get_moving_data()
+    gpx.get_time_bounds()
+    return len(points), moving.moving_distance
+
+
+def parse_with_stream(path):
+    with open(path, 'rb') as f:
+        track = parse_gpx(f)["track"]
+    return len(track), track.moving_data()[0]
+
+
+def measure(func, path):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        result = func(path)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def main(paths):
+    print(f"{'Datei':<14}{'Punkte':>8}{'gpxpy ms':>11}{'stream ms':>11}{'x':>6}{'gpxpy MB':>10}{'stream MB':>11}")
+    for path in paths:
+        (n_old, dist_old), t_old, mem_old = measure(parse_with_gpxpy, path)
+        (n_new, dist_new), t_new, mem_new = measure(parse_with_stream, path)
+        if n_old != n_new or abs(dist_old - dist_new) > 1e-6 * max(dist_old, 1.0):
+            print(f"WARNUNG: Ergebnisse weichen ab für {path}: {n_old}/{dist_old} vs {n_new}/{dist_new}")
+        print(f"{os.path.basename(path):<14}{n_new:>8}{t_old * 1000:>11.1f}{t_new * 1000:>11.1f}"
+              f"{t_old / t_new:>6.1f}{mem_old / 1e6:>10.2f}{mem_new / 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    files = sys.argv[1:] or sorted(glob.glob(os.path.join(root, "DL*.gpx")))
+    main(files)
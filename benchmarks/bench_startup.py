@@ -0,0 +1,64 @@
+# --- BENCHMARK: Kaltstart und Reruns von app.py ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_startup.py [wiederholungen]
+# Jede Messung läuft in einem frischen Python-Prozess (wie ein neu gestarteter Container):
+#  - Importzeit von app.py und welche schweren Module dabei schon geladen werden,
+#  - erster Lauf und Rerun der App (Streamlit AppTest) ohne Tour, danach mit ausgewählter Tour.
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("pandas", "folium", "branca", "jinja2", "gpxpy")
+
+IMPORT_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+import app
+elapsed = time.perf_counter() - t0
+print(json.dumps({"import_s": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY,)
+
+RUN_CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+result = {}
+t0 = time.perf_counter(); at.run(); result["first_run_s"] = time.perf_counter() - t0
+result["loaded_first_run"] = [m for m in %r if m in sys.modules]
+t0 = time.perf_counter(); at.run(); result["rerun_s"] = time.perf_counter() - t0
+tour = sys.argv[1] if len(sys.argv) > 1 else ""
+if tour:
+    at.session_state.selected_local_file = tour
+    t0 = time.perf_counter(); at.run(); result["tour_run_s"] = time.perf_counter() - t0
+    t0 = time.perf_counter(); at.run(); result["tour_rerun_s"] = time.perf_counter() - t0
+result["errors"] = len(at.exception)
+print(json.dumps(result))
+""" % (HEAVY,)
+
+
+def child(code, *args):
+    out = subprocess.run([sys.executable, "-c", code, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(repeat):
+    tours = sorted(f for f in os.listdir(ROOT) if f.upper().startswith("DL") and f.upper().endswith(".GPX"))
+    tour = tours[0] if tours else ""
+
+    imports = [child(IMPORT_CHILD) for _ in range(repeat)]
+    print(f"import app        {min(r['import_s'] for r in imports) * 1000:8.0f} ms   geladen: {', '.join(imports[0]['loaded']) or '-'}")
+
+    runs = [child(RUN_CHILD, tour) for _ in range(repeat)]
+    best = {key: min(r[key] for r in runs) for key in runs[0] if key.endswith("_s")}
+    print(f"erster Lauf       {best['first_run_s'] * 1000:8.0f} ms   geladen: {', '.join(runs[0]['loaded_first_run']) or '-'}")
+    print(f"Rerun             {best['rerun_s'] * 1000:8.0f} ms")
+    if tour:
+        print(f"Tour {tour:<12} {best['tour_run_s'] * 1000:8.0f} ms")
+        print(f"Rerun mit Tour    {best['tour_rerun_s'] * 1000:8.0f} ms")
+    if any(r["errors"] for r in runs):
+        print("WARNUNG: App hat Ausnahmen gemeldet")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,77 @@
+# --- BENCHMARK: Stopp-Erkennung aus Trackpunkten ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_stop_detection.py [anzahl_punkte ...]
+# Erzeugt einen synthetischen Tag (1 Punkt/s, Fahrt mit ~50 km/h, Stopps von 3-60 min mit
+# GPS-Zittern, dazwischen kurze Ampelhalte) und misst detect_stops sowie die Kundenzuordnung.
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geo_index import CustomerGeoIndex
+from stop_detection import MIN_DWELL_S, SNAP_RADIUS_M, detect_stops
+from track import ONE_DEGREE, Track
+
+REPEAT = 5
+START_US = 1_768_377_600 * 1_000_000  # 2026-01-14 08:00 UTC
+
+
+def make_day(n_points, seed=0):
+    # Liefert (Track, Anzahl echter Stopps, Stopp-Positionen)
+    rng = np.random.default_rng(seed)
+    lat, lon = np.empty(n_points), np.empty(n_points)
+    pos = np.array([49.3, 7.0])
+    heading = 0.0
+    i = 0
+    stops = []
+    while i < n_points:
+        # Fahrt 2-15 min, Richtung ändert sich langsam
+        drive = min(int(rng.integers(120, 900)), n_points - i)
+        headings = heading + np.cumsum(rng.normal(0, 0.05, drive))
+        step = 14.0 / ONE_DEGREE  # ~50 km/h bei 1 Punkt/s
+        path = pos + np.cumsum(np.column_stack((np.cos(headings), np.sin(headings))) * step, axis=0)
+        lat[i:i + drive], lon[i:i + drive] = path[:, 0], path[:, 1]
+        pos, heading, i = path[-1], headings[-1], i + drive
+        if i >= n_points:
+            break
+        # Stopp (3-60 min) oder kurzer Ampelhalt (20-90 s), jeweils mit ~3 m GPS-Zittern
+        dwell = int(rng.integers(MIN_DWELL_S + 60, 3600)) if rng.random() < 0.5 else int(rng.integers(20, 90))
+        dwell = min(dwell, n_points - i)
+        jitter = rng.normal(0, 3.0 / ONE_DEGREE, (dwell, 2))
+        lat[i:i + dwell], lon[i:i + dwell] = pos[0] + jitter[:, 0], pos[1] + jitter[:, 1]
+        if dwell > MIN_DWELL_S + 60:
+            stops.append(pos.copy())
+        i += dwell
+    times = (START_US + np.arange(n_points, dtype=np.int64) * 1_000_000).view("datetime64[us]")
+    return Track(lat, lon, None, times), len(stops), np.array(stops).reshape(-1, 2)
+
+
+def best_of(func, *args):
+    best = float("inf")
+    result = None
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(sizes):
+    print(f"{'Punkte':>9}{'Stopps echt':>13}{'erkannt':>9}{'zugeordnet':>12}{'ms Erkennung':>14}{'ms Zuordnung':>14}")
+    for n in sizes:
+        track, n_true, true_pos = make_day(n, seed=n)
+        t_detect, (arrival, departure, lat, lon) = best_of(detect_stops, track)
+        # 5000 bekannte Kunden: die echten Stopp-Orte plus zufällige Adressen in der Umgebung
+        rng = np.random.default_rng(1)
+        cust_lat = np.concatenate((true_pos[:, 0], 49.3 + rng.normal(0, 0.3, 5000 - len(true_pos))))
+        cust_lon = np.concatenate((true_pos[:, 1], 7.0 + rng.normal(0, 0.3, 5000 - len(true_pos))))
+        ids = [f"{k:07d}" for k in range(len(cust_lat))]
+        index = CustomerGeoIndex(ids, cust_lat, cust_lon)
+        t_snap, (matched, _) = best_of(index.nearest, lat, lon, SNAP_RADIUS_M)
+        print(f"{n:>9}{n_true:>13}{len(lat):>9}{sum(1 for m in matched if m):>12}{t_detect * 1000:>14.1f}{t_snap * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
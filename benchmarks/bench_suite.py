@@ -0,0 +1,190 @@
+# --- BENCHMARK-SUITE: alle Stufen von Parse bis Export ---
+# Aufruf aus dem Projektordner:
+#   python benchmarks/bench_suite.py [--sizes 1000x10 10000x100 ...] [--tours 200] [--json ERGEBNIS.json]
+#                                    [--compare BASIS.json] [--threshold 0.2] [--only parse map ...]
+# Misst jede Stufe einzeln auf synthetischen Touren (Trackpunkte x Wegpunkte) und den kompletten
+# Batch-Export über einen Ordner mit vielen Touren. Mit --json werden die Zeiten gespeichert, mit
+# --compare gegen einen früheren Lauf verglichen: Exit-Code 1, wenn eine Stufe langsamer ist als
+# BASIS * (1 + threshold). So fallen Verschlechterungen vor dem Deployment auf.
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from batch_export import STATUS_ERROR, run_batch
+from export_writer import csv_bytes
+from gpx_stream import parse_gpx
+from map_render import build_tour_map
+from synth_gpx import make_gpx, make_tour_dir
+from tour_model import analyze_tour, export_rows, extract_stops, stop_rows
+
+DEFAULT_SIZES = ["1000x10", "10000x100", "100000x1000", "1000000x5000"]
+MAP_TOLERANCE_M = 3.0   # wie MAP_SIMPLIFY_TOLERANCE_M in app.py
+MIN_TIME_S = 0.5        # jede Stufe so oft wiederholen, bis insgesamt so viel Zeit vergangen ist ...
+MAX_REPEAT = 20         # ... höchstens aber so oft; gemeldet wird der schnellste Lauf
+LABELS = ("Kunden Nr. / Typ", "Name / Event", "Dauer", "Ankunft", "Abfahrt")
+
+
+# --- STUFEN (je Tourgröße) ---
+# Jede Stufe bekommt den Kontext der Tour und liefert nichts; Vorarbeiten stehen im Kontext.
+
+def stage_parse(ctx):
+    parse_gpx(io.BytesIO(ctx["raw"]))
+
+
+def stage_stats(ctx):
+    track = ctx["gpx"]["track"]
+    track.stats()
+    track.time_bounds()
+
+
+def stage_stops(ctx):
+    extract_stops(ctx["gpx"]["waypoints"])
+
+
+def stage_analyze(ctx):
+    analyze_tour(ctx["gpx"])
+
+
+def stage_map(ctx):
+    data = ctx["data"]
+    track, stops = data["track"], data["customer_stops"]
+    m = build_tour_map(track, stops, stop_rows(stops, "Deutsch"), LABELS, track.point_at(len(track) // 2), 12,
+                       None, MAP_TOLERANCE_M)
+    m.get_root().render()
+
+
+def stage_export(ctx):
+    # Wie batch_export.export_tour, aber in den Speicher statt in eine Datei:
+    # csv_bytes liefert dieselben Bytes wie export_writer.write_csv
+    csv_bytes(export_rows(ctx["data"], "10000", "Deutsch"))
+
+
+STAGES = {
+    "parse": stage_parse,
+    "stats": stage_stats,
+    "stops": stage_stops,
+    "analyze": stage_analyze,
+    "map": stage_map,
+    "export": stage_export,
+}
+
+
+def best_time(func, *args):
+    best = float("inf")
+    spent = 0.0
+    for _ in range(MAX_REPEAT):
+        t0 = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - t0
+        best = min(best, elapsed)
+        spent += elapsed
+        if spent >= MIN_TIME_S:
+            break
+    return best
+
+
+def parse_size(text):
+    points, _, waypoints = text.lower().partition("x")
+    return int(points), int(waypoints or 10)
+
+
+def run_stages(sizes, only):
+    results = {}
+    for n_points, n_waypoints in sizes:
+        raw = make_gpx(n_points, n_waypoints)
+        gpx = parse_gpx(io.BytesIO(raw))
+        ctx = {"raw": raw, "gpx": gpx, "data": analyze_tour(gpx)}
+        for name, func in STAGES.items():
+            if only and name not in only:
+                continue
+            key = f"{name}/{n_points}x{n_waypoints}"
+            results[key] = best_time(func, ctx)
+            report(key, results[key])
+    return results
+
+
+def run_end_to_end(n_tours, n_points, n_waypoints, only):
+    # Kompletter Batch-Export (Parse + Analyse + CSV) über einen Ordner, seriell und im Prozess-Pool
+    results = {}
+    runs = [("batch_serial", 1), ("batch_pool", None)]
+    runs = [(name, workers) for name, workers in runs if not only or name in only]
+    if not runs or not n_tours:
+        return results
+    with tempfile.TemporaryDirectory() as gpx_dir, tempfile.TemporaryDirectory() as export_dir:
+        paths = make_tour_dir(gpx_dir, n_tours, n_points, n_waypoints)
+        for name, workers in runs:
+            t0 = time.perf_counter()
+            errors = sum(1 for _, _, (_, status, _) in run_batch(paths, export_dir, "Deutsch", workers=workers, force=True)
+                         if status == STATUS_ERROR)
+            key = f"{name}/{n_tours}x{n_points}x{n_waypoints}"
+            results[key] = time.perf_counter() - t0
+            report(key, results[key], f"{n_tours / results[key]:.0f} Touren/s" + (f", {errors} Fehler" if errors else ""))
+    return results
+
+
+def report(key, seconds, extra=""):
+    print(f"{key:<34}{seconds * 1000:>12.2f} ms  {extra}", flush=True)
+
+
+def compare(results, baseline, threshold):
+    # Liefert die Liste der Stufen, die langsamer als erlaubt sind
+    regressions = []
+    print(f"\n{'Stufe':<34}{'Basis ms':>12}{'jetzt ms':>12}{'Faktor':>9}")
+    for key, seconds in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        ratio = seconds / base
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = "  LANGSAMER"
+        print(f"{key:<34}{base * 1000:>12.2f}{seconds * 1000:>12.2f}{ratio:>9.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-Suite für Parse, Kennzahlen, Stopps, Karte und Export")
+    parser.add_argument("--sizes", nargs="*", default=DEFAULT_SIZES, help="Tourgrößen als PUNKTExWEGPUNKTE")
+    parser.add_argument("--tours", type=int, default=200, help="Touren für den Batch-Export (0 = überspringen)")
+    parser.add_argument("--tour-size", default="10000x100", help="Größe je Tour im Batch-Export")
+    parser.add_argument("--only", nargs="*", default=None, help=f"Nur diese Stufen: {', '.join(STAGES)}, batch_serial, batch_pool")
+    parser.add_argument("--json", default=None, help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", default=None, help="Früheres JSON-Ergebnis als Basis")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Erlaubte Verlangsamung (0.2 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    print(f"Python {platform.python_version()}, NumPy {np.__version__}, pandas {pd.__version__}, {os.cpu_count()} CPUs")
+    results = run_stages([parse_size(s) for s in args.sizes], args.only)
+    results.update(run_end_to_end(args.tours, *parse_size(args.tour_size), args.only))
+
+    if args.json:
+        meta = {"date": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                "numpy": np.__version__, "cpus": os.cpu_count(), "machine": platform.machine()}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} Stufe(n) langsamer als Basis + {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# --- BENCHMARK: Gemeinsamer Tour-Cache bei gleichzeitigen Disponenten ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_tour_cache.py [sessions] [punkte]
+# Simuliert N Sessions (Threads), die gleichzeitig dieselbe Tour öffnen:
+#  - ohne Cache parst und analysiert jede Session selbst,
+#  - mit tour_cache.TourCache parst nur eine, die anderen warten auf deren Ergebnis.
+# Danach wird die Datei geändert: die neue Version wird einmal geladen, die alte verworfen.
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gpx_stream import parse_gpx
+from synth_gpx import write_gpx
+from tour_cache import TourCache
+from tour_model import analyze_tour
+
+
+def identity(path):
+    st_res = os.stat(path)
+    return (os.path.abspath(path), st_res.st_mtime_ns, st_res.st_size)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return analyze_tour(parse_gpx(f))
+
+
+def concurrent(sessions, func):
+    barrier = threading.Barrier(sessions)
+    results = [None] * sessions
+
+    def worker(i):
+        barrier.wait()
+        results[i] = func()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(sessions)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0, results
+
+
+def main(sessions, points):
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "DL90001.gpx")
+        write_gpx(path, points, 40, seed=1)
+
+        elapsed, _ = concurrent(sessions, lambda: load(path))
+        print(f"{sessions} Sessions ohne Cache      {elapsed * 1000:8.0f} ms")
+
+        cache = TourCache(512 * 1024 * 1024)
+        open_tour = lambda: cache.get_or_load(identity(path), lambda: load(path), group=os.path.abspath(path))
+        elapsed, results = concurrent(sessions, open_tour)
+        print(f"{sessions} Sessions mit Tour-Cache  {elapsed * 1000:8.0f} ms   Ladevorgänge: {cache.loads}, "
+              f"gewartet: {cache.shared}, {cache.nbytes / 1e6:.1f} MB")
+        assert cache.loads == 1 and all(r is results[0] for r in results)
+
+        elapsed, _ = concurrent(sessions, open_tour)
+        print(f"{sessions} Sessions, Tour im Cache  {elapsed * 1000:8.0f} ms")
+
+        write_gpx(path, points + 1000, 40, seed=2)  # geänderte Datei -> neue Version
+        concurrent(sessions, open_tour)
+        print(f"nach Dateiänderung: Ladevorgänge {cache.loads}, Einträge im Cache {len(cache)}")
+        assert cache.loads == 2 and len(cache) == 1
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5, int(sys.argv[2]) if len(sys.argv) > 2 else 50_000)
@@ -0,0 +1,65 @@
+# --- BENCHMARK: GPX-Parser vs. Parse-Cache vs. Track-Archiv ---
+# Aufruf aus dem Projektordner:  python benchmarks/bench_track_archive.py [anzahl_touren] [punkte]
+# Legt Touren in einem Temp-Ordner an und misst je Tour das Laden des Parse-Ergebnisses:
+#  - gpx_stream.parse_gpx (XML),
+#  - SQLite Parse-Cache (Treffer, .npz entpacken),
+#  - Track-Archiv *.lkwtrk (memory-mapped), zusätzlich ein Zeitfenster von einer Stunde.
+# Prüft, dass Archiv und GPX dieselbe Tour-Statistik liefern.
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gpx_stream import parse_gpx
+from parse_cache import ParseCache
+from synth_gpx import make_tour_dir
+from tour_model import analyze_tour
+from track_archive import TrackArchive, archive_path_for, convert_gpx, open_for_gpx
+
+
+def parse_file(path):
+    with open(path, "rb") as f:
+        return parse_gpx(f)
+
+
+def measure(label, paths, load):
+    t0 = time.perf_counter()
+    results = [load(path) for path in paths]
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<32}{elapsed * 1000 / len(paths):>9.2f} ms/Tour")
+    return results
+
+
+def main(count, points):
+    with tempfile.TemporaryDirectory() as folder:
+        paths = make_tour_dir(folder, count, points)
+        cache = ParseCache(os.path.join(folder, "cache.sqlite"), 1024 * 1024 * 1024)
+
+        t0 = time.perf_counter()
+        for path in paths:
+            convert_gpx(path, parse=cache.get_or_parse)  # füllt nebenbei den Parse-Cache
+        size = sum(os.path.getsize(archive_path_for(p)) for p in paths)
+        print(f"{count} Touren à {points} Punkte, Umwandlung {time.perf_counter() - t0:.1f} s, "
+              f"Archiv {size / 1e6:.1f} MB, GPX {sum(os.path.getsize(p) for p in paths) / 1e6:.1f} MB")
+
+        parsed = measure("parse_gpx (XML)", paths, parse_file)
+        measure("Parse-Cache (SQLite)", paths, cache.get)
+        archived = measure("Track-Archiv (memmap)", paths, open_for_gpx)
+        measure("Track-Archiv + Statistik", paths, lambda p: analyze_tour(open_for_gpx(p)))
+
+        def window(path):
+            archive = TrackArchive(archive_path_for(path))
+            start, _ = archive.track().time_bounds()
+            return archive.track(start + timedelta(hours=1), start + timedelta(hours=2))
+        measure("Track-Archiv, 1 h Zeitfenster", paths, window)
+
+        for a, b in zip(parsed, archived):
+            assert analyze_tour(a)["dist_km"] == analyze_tour(b)["dist_km"]
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20, int(sys.argv[2]) if len(sys.argv) > 2 else 50_000)
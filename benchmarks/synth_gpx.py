@@ -0,0 +1,101 @@
+# --- SYNTHETISCHE GPX-TOUREN FÜR BENCHMARKS ---
+# Erzeugt Touren im Format des BasicAirData GPS Loggers (wie DL*.gpx): Trackpunkte im Abstand von
+# ~1-5 s entlang einer langsam kurvenden Strecke und CLIENT/PAUSE BEGIN/END-Wegpunkte auf dem Track.
+# Aufruf aus dem Projektordner:  python benchmarks/synth_gpx.py ZIEL.gpx [anzahl_punkte] [anzahl_wegpunkte]
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from track import ONE_DEGREE
+
+START = np.datetime64("2026-01-14T06:00:00.000", "ms")
+
+HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<!-- Created with BasicAirData GPS Logger for Android - ver. 1.0.2.27 -->
+<!-- Synthetic tour = {points} TrackPoints + {waypoints} Placemarks -->
+<gpx version="1.0"
+     creator="BasicAirData GPS Logger 1.0.2.27"
+     xmlns="http://www.topografix.com/GPX/1/0"
+     xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+     xsi:schemaLocation="http://www.topografix.com/GPX/1/0 http://www.topografix.com/GPX/1/0/gpx.xsd">
+<name>GPS Logger synthetic</name>
+<time>{start}Z</time>
+
+"""
+
+
+def make_points(n_points, rng):
+    # Zeit (datetime64[ms]), lat, lon, ele, speed (m/s) als Arrays
+    dt_ms = rng.integers(1000, 5000, n_points)
+    times = START + np.cumsum(dt_ms).astype("timedelta64[ms]")
+    speed = np.clip(rng.normal(12.0, 5.0, n_points), 0.0, 25.0)
+    speed[rng.random(n_points) < 0.2] = rng.random() * 0.3  # Standzeiten / Ampeln
+    heading = np.cumsum(rng.normal(0, 0.08, n_points))
+    step = speed * dt_ms / 1000.0 / ONE_DEGREE
+    lat = 49.3 + np.cumsum(step * np.cos(heading))
+    lon = 7.0 + np.cumsum(step * np.sin(heading)) / np.cos(np.radians(49.3))
+    ele = 300.0 + np.cumsum(rng.normal(0, 0.3, n_points))
+    return times, lat, lon, ele, speed
+
+
+def waypoint_lines(n_waypoints, times, lat, lon, ele, rng):
+    # BEGIN/END-Paare in zeitlicher Folge, jedes zehnte Paar eine Pause
+    n_pairs = max(1, n_waypoints // 2) if n_waypoints else 0
+    if not n_pairs:
+        return []
+    n = len(times)
+    # Paare gleichmäßig über die Tour verteilt, jedes belegt höchstens die Hälfte seines Abschnitts
+    slot = max(2, n // n_pairs)
+    begins = np.minimum(np.arange(n_pairs) * slot, n - 1)
+    ends = np.minimum(begins + rng.integers(1, max(2, slot // 2), n_pairs), n - 1)
+    lines = []
+    for k, (b, e) in enumerate(zip(begins, ends)):
+        if k % 10 == 9:
+            names = ("PAUSE_BEGIN(Pause)", "PAUSE_END(Pause)")
+        else:
+            cid = f"{int(rng.integers(1, 400_000)):07d}"
+            names = (f"CLIENT_BEGIN:{cid}(Kunde {cid} GmbH)", f"CLIENT_END:{cid}(Kunde {cid} GmbH)")
+        for i, name in zip((b, e), names):
+            lines.append(f'<wpt lat="{lat[i]:.8f}" lon="{lon[i]:.8f}"><ele>{ele[i]:.3f}</ele>'
+                         f'<time>{times[i]}Z</time><name>{name}</name><sat>22</sat></wpt>\n\n')
+    return lines
+
+
+def make_gpx(n_points, n_waypoints=10, seed=0):
+    # Komplette GPX-Datei als bytes
+    rng = np.random.default_rng(seed)
+    times, lat, lon, ele, speed = make_points(n_points, rng)
+    parts = [HEADER.format(points=n_points, waypoints=n_waypoints, start=START)]
+    parts += waypoint_lines(n_waypoints, times, lat, lon, ele, rng)
+    parts.append("<trk>\n <name>Track</name>\n <trkseg>\n")
+    time_str = np.datetime_as_string(times, unit="ms")
+    parts += [f'  <trkpt lat="{la:.8f}" lon="{lo:.8f}"><ele>{e:.3f}</ele><time>{t}Z</time>'
+              f'<speed>{s:.3f}</speed><sat>9</sat></trkpt>\n'
+              for la, lo, e, t, s in zip(lat.tolist(), lon.tolist(), ele.tolist(), time_str.tolist(), speed.tolist())]
+    parts.append(" </trkseg>\n</trk>\n</gpx>\n")
+    return "".join(parts).encode("utf-8")
+
+
+def write_gpx(path, n_points, n_waypoints=10, seed=0):
+    with open(path, "wb") as f:
+        f.write(make_gpx(n_points, n_waypoints, seed))
+    return path
+
+
+def make_tour_dir(target, count, n_points, n_waypoints=10):
+    # count Touren DL10000.gpx, DL10001.gpx, ... (je eigener Zufallsstrecke)
+    return [write_gpx(os.path.join(target, f"DL{10000 + i}.gpx"), n_points, n_waypoints, seed=i)
+            for i in range(count)]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("python benchmarks/synth_gpx.py ZIEL.gpx [anzahl_punkte] [anzahl_wegpunkte]", file=sys.stderr)
+        sys.exit(2)
+    n_points = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    n_waypoints = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    write_gpx(sys.argv[1], n_points, n_waypoints)
+    print(f"{sys.argv[1]}: {n_points} Trackpunkte, {n_waypoints} Wegpunkte, {os.path.getsize(sys.argv[1]) / 1e6:.1f} MB")
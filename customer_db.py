@@ -0,0 +1,149 @@
+# --- KUNDEN-DATENBANK (KND.STM) ---
+# Prozessweiter Kunden-Index: KND.STM wird einmal mit dem schnellen C-Parser und festem Schema
+# gelesen und erst neu geladen, wenn sich mtime oder Größe der Datei ändern.
+# Lookups per Kundennummer sind O(1) (dict -> Zeilenindex).
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from settings import CSV_FOLDER_PATH
+from timing import stage, timed
+
+CUSTOMER_FILE = "KND.STM"
+
+# Spalten, die die App nutzt (der Rest von KND.STM wird gar nicht erst eingelesen)
+CUSTOMER_COLUMNS = ["NUMBER", "NAME", "NAME2", "MCODE", "ADDRESS", "POSTINDEX", "CITY", "PHONE", "INFO",
+                    "DLVRTIMEB1", "DLVRTIMEE1", "DLVRTIMEB2", "DLVRTIMEE2"]
+
+Customer = namedtuple("Customer", [c.lower() for c in CUSTOMER_COLUMNS])
+
+
+def parse_hhmm(value):
+    # "0830" -> 510 (Minuten seit Mitternacht), "2400" -> 1440, ungültig/leer -> None
+    value = (value or "").strip()
+    if len(value) != 4 or not value.isdigit():
+        return None
+    hours, minutes = int(value[:2]), int(value[2:])
+    if hours > 24 or minutes > 59 or (hours == 24 and minutes):
+        return None  # "2400" = Tagesende, "2430" ist ungültig
+    return hours * 60 + minutes
+
+
+class CustomerIndex:
+    # Verhält sich für Namen wie das frühere dict NUMBER -> NAME (in / [] / get_name),
+    # liefert über record() aber alle Stammdaten-Spalten.
+    def __init__(self, columns, version=None):
+        self.version = version  # (mtime_ns, size) der geladenen KND.STM
+        self._columns = columns  # Spaltenname -> Liste der Werte
+        self._rows = {number: i for i, number in enumerate(columns["NUMBER"]) if number}
+        self._window_columns = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, number):
+        return number in self._rows
+
+    def __getitem__(self, number):
+        return self._columns["NAME"][self._rows[number]]
+
+    def get_name(self, number, default=None):
+        i = self._rows.get(number)
+        return default if i is None else self._columns["NAME"][i]
+
+    def record(self, number):
+        i = self._rows.get(number)
+        if i is None:
+            return None
+        return Customer(*(self._columns[col][i] for col in CUSTOMER_COLUMNS))
+
+    def delivery_windows(self, number):
+        # Lieferfenster als [(von_min, bis_min), ...]; "0000"-"0000" = kein Fenster
+        rec = self.record(number)
+        if rec is None:
+            return []
+        windows = []
+        for begin, end in ((rec.dlvrtimeb1, rec.dlvrtimee1), (rec.dlvrtimeb2, rec.dlvrtimee2)):
+            b, e = parse_hhmm(begin), parse_hhmm(end)
+            if b is not None and e is not None and (b or e):
+                windows.append((b, e))
+        return windows
+
+    def window_columns(self):
+        # Alle Lieferfenster für die vektorisierte Prüfung (delivery_windows.check_delivery_windows):
+        # (Kundennummer -> Zeile, von, bis) mit von/bis als (n, 2) Minuten seit Mitternacht, -1 = kein Fenster.
+        # Einmal je geladener KND.STM aufgebaut; Kunden ohne Fenster fehlen.
+        if self._window_columns is None:
+            rows, begin, end = {}, [], []
+            for number in self._rows:
+                windows = self.delivery_windows(number)
+                if not windows:
+                    continue
+                rows[number] = len(begin)
+                windows = (windows + [(-1, -1)])[:2]
+                begin.append([b for b, _ in windows])
+                end.append([min(e, 24 * 60 - 1) for _, e in windows])  # "2400" = bis Tagesende
+            self._window_columns = (rows, np.array(begin, dtype=np.int64).reshape(-1, 2),
+                                    np.array(end, dtype=np.int64).reshape(-1, 2))
+        return self._window_columns
+
+
+def read_customer_file(filename):
+    # Schneller Pfad: C-Parser mit festem Trennzeichen; Fallback auf Trennzeichen-Erkennung
+    import pandas as pd  # erst beim (Neu-)Einlesen laden, Reruns mit aktuellem Index brauchen es nicht
+    read_args = dict(dtype=str, encoding='latin1', keep_default_na=False,
+                     usecols=lambda c: c.strip() in CUSTOMER_COLUMNS)
+    try:
+        df = pd.read_csv(filename, sep=';', engine='c', **read_args)
+        df.columns = df.columns.str.strip()
+        if 'NUMBER' not in df.columns or 'NAME' not in df.columns:
+            raise ValueError("unerwartetes Format")
+    except (ValueError, pd.errors.ParserError):
+        df = pd.read_csv(filename, sep=None, engine='python', **read_args)
+        df.columns = df.columns.str.strip()
+    if 'NUMBER' not in df.columns or 'NAME' not in df.columns:
+        return None
+    return {col: (df[col].str.strip().tolist() if col in df.columns else [""] * len(df)) for col in CUSTOMER_COLUMNS}
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_customer_index(csv_folder=CSV_FOLDER_PATH):
+    # Einmal pro Prozess laden; bei geänderter Datei (mtime/Größe) automatisch neu einlesen
+    filename = os.path.join(csv_folder, CUSTOMER_FILE)
+    try:
+        st_res = os.stat(filename)
+    except OSError:
+        return None
+    version = (st_res.st_mtime_ns, st_res.st_size)
+    key = os.path.abspath(filename)
+
+    index = _indexes.get(key)
+    if index is not None and index.version == version:
+        return index
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None and index.version == version:
+            return index
+        try:
+            with stage("read_customer_file"):
+                columns = read_customer_file(filename)
+        except Exception as e:
+            print(f"Fehler beim Lesen von {filename}: {e}")
+            columns = None
+        index = CustomerIndex(columns, version) if columns else None
+        if index is None:
+            _indexes.pop(key, None)
+        else:
+            _indexes[key] = index
+        return index
+
+
+@timed("load_customer_db")
+def load_customer_db(csv_folder=CSV_FOLDER_PATH):
+    # Kompatibel zum früheren Aufruf pro Rerun: kostet jetzt nur noch ein os.stat
+    return get_customer_index(csv_folder)
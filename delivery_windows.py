@@ -0,0 +1,106 @@
+# --- LIEFERFENSTER-PRÜFUNG ---
+# Prüft CLIENT-Stopps gegen die Lieferfenster der Kunden aus KND.STM (DLVRTIMEB1/E1, DLVRTIMEB2/E2,
+# lokale Uhrzeit). Vektorisiert über beliebig viele Stopps - eine Tour oder das ganze Touren-Archiv:
+# Ankunft als Minute des Tages, Abstand zu beiden Fenstern per Modulo-Rechnung (damit gelten auch
+# Fenster über Mitternacht). Zusammenfassungen je Tour, Tournummer oder Kunde über np.bincount.
+import numpy as np
+
+from tour_model import TIME_OFFSET
+
+WINDOW_OK = "ok"        # Ankunft innerhalb eines Lieferfensters
+WINDOW_EARLY = "early"  # vor dem nächstgelegenen Fenster
+WINDOW_LATE = "late"    # nach dem nächstgelegenen Fenster
+WINDOW_NONE = "none"    # kein Lieferfenster für den Kunden hinterlegt
+
+STATUS_DTYPE = "<U5"    # feste Breite statt object: Vergleiche laufen in C
+MINUTES_PER_DAY = 24 * 60
+OFFSET_S = int(TIME_OFFSET.total_seconds())
+
+
+def factorize(values):
+    # Werte -> (eindeutige Werte in Reihenfolge des Auftretens, Index je Wert); per dict statt
+    # np.unique, das Strings erst sortieren müsste
+    codes = {}
+    inverse = np.fromiter((codes.setdefault(v, len(codes)) for v in values), dtype=np.int64, count=len(values))
+    return list(codes), inverse
+
+
+def arrival_minutes(arrival_utc_s):
+    # Unix-Sekunden (UTC) -> Minute des lokalen Tages (0..1439), wie format_stop_time
+    return ((np.asarray(arrival_utc_s, dtype=np.int64) + OFFSET_S) // 60) % MINUTES_PER_DAY
+
+
+def check_delivery_windows(customer_ids, arrival_utc_s, customer_index, tolerance_min=0):
+    # Liefert (status, abweichung_min) als Arrays gleicher Länge wie die Stopps;
+    # abweichung_min ist der Abstand zum nächstgelegenen Fenster (0 bei ok / none);
+    # liegt die Ankunft genau zwischen zwei Fenstern, zählt sie als zu früh
+    n = len(customer_ids)
+    status = np.full(n, WINDOW_NONE, dtype=STATUS_DTYPE)
+    deviation = np.zeros(n, dtype=np.int64)
+    if customer_index is None or not n:
+        return status, deviation
+    rows_of, begin, end = customer_index.window_columns()
+    if not rows_of:
+        return status, deviation
+
+    # Kundennummern einmal je Kunde nachschlagen statt je Stopp
+    unique_ids, inverse = factorize(customer_ids)
+    rows = np.array([rows_of.get(cid, -1) for cid in unique_ids], dtype=np.int64)[inverse]
+    known = np.flatnonzero(rows >= 0)
+    if not len(known):
+        return status, deviation
+
+    minute = arrival_minutes(np.asarray(arrival_utc_s)[known])[:, None]
+    b, e = begin[rows[known]], end[rows[known]]
+    has_window = b >= 0
+    # Breite aus dem ursprünglichen Fenster, erst dann um die Toleranz erweitern: deckt das erweiterte
+    # Fenster den ganzen Tag ab, bleibt es ganztägig (per Modulo würde die Breite sonst überlaufen)
+    width = np.minimum((e - b) % MINUTES_PER_DAY + 2 * tolerance_min, MINUTES_PER_DAY - 1)
+    b = b - tolerance_min
+    e = b + width
+    inside = has_window & ((minute - b) % MINUTES_PER_DAY <= width)
+    early = np.where(has_window, (b - minute) % MINUTES_PER_DAY, MINUTES_PER_DAY).min(axis=1)
+    late = np.where(has_window, (minute - e) % MINUTES_PER_DAY, MINUTES_PER_DAY).min(axis=1)
+    ok = inside.any(axis=1)
+
+    status[known] = np.where(ok, WINDOW_OK, np.where(early <= late, WINDOW_EARLY, WINDOW_LATE))
+    deviation[known] = np.where(ok, 0, np.minimum(early, late))
+    return status, deviation
+
+
+def summarize(keys, status, deviation):
+    # Kennzahlen je Schlüssel (z.B. Tour, Tournummer oder Kunde), schlechteste Pünktlichkeit zuerst:
+    # Stopps, mit Fenster, pünktlich, zu früh, zu spät, Quote in %, Ø / max. Verspätung in min
+    if not len(keys):
+        return []
+    unique_keys, inverse = factorize(keys)
+    status = np.asarray(status, dtype=STATUS_DTYPE)
+    deviation = np.asarray(deviation)
+
+    def count(mask, weights=None):
+        w = mask if weights is None else np.where(mask, weights, 0)
+        return np.bincount(inverse, weights=w, minlength=len(unique_keys))
+
+    stops = np.bincount(inverse, minlength=len(unique_keys))
+    ok, early, late = count(status == WINDOW_OK), count(status == WINDOW_EARLY), count(status == WINDOW_LATE)
+    late_min = count(status == WINDOW_LATE, deviation)
+    late_max = np.zeros(len(unique_keys))
+    is_late = status == WINDOW_LATE
+    np.maximum.at(late_max, inverse[is_late], deviation[is_late])
+    checked = ok + early + late
+
+    rows = []
+    for k, key in enumerate(unique_keys):
+        rows.append({
+            "key": str(key),
+            "stopps": int(stops[k]),
+            "mit_fenster": int(checked[k]),
+            "puenktlich": int(ok[k]),
+            "zu_frueh": int(early[k]),
+            "zu_spaet": int(late[k]),
+            "quote_pct": round(100.0 * ok[k] / checked[k], 1) if checked[k] else None,
+            "avg_spaet_min": round(late_min[k] / late[k], 1) if late[k] else 0.0,
+            "max_spaet_min": int(late_max[k]),
+        })
+    rows.sort(key=lambda r: (r["quote_pct"] is None, r["quote_pct"] if r["quote_pct"] is not None else 0, -r["zu_spaet"]))
+    return rows
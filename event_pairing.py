@@ -0,0 +1,87 @@
+# --- EVENT-PAARUNG (CLIENT_BEGIN / CLIENT_END, PAUSE_BEGIN / PAUSE_END) ---
+# Ein linearer Durchlauf über die chronologisch sortierten Events. Auffälligkeiten gehen nicht
+# mehr stillschweigend verloren, sondern werden als EventIssue gemeldet:
+#   - BEGIN ohne END bis Tourende, END ohne offenes BEGIN
+#   - doppeltes BEGIN (das frühere wird verworfen, wie bisher gewinnt das spätere)
+#   - BEGIN, während ein anderes Event noch offen ist (Überlappung)
+import re
+from collections import namedtuple
+from operator import attrgetter
+
+from track import to_epoch_us
+
+# Regex zum Zerlegen des Namens-Strings
+# Matcht: TYPE_STATE:ID(NAME) oder TYPE_STATE(NAME)
+# Bsp: CLIENT_BEGIN:123(Name) -> Type=CLIENT, State=BEGIN, ID=123, Name=Name
+# Bsp: PAUSE_BEGIN(Pause) -> Type=PAUSE, State=BEGIN, ID=None, Name=Pause
+EVENT_PATTERN = re.compile(r"^(?P<type>[A-Z]+)_(?P<state>BEGIN|END)(?::(?P<id>[\w]+))?(?:\((?P<name>.*)\))?")
+
+ISSUE_UNMATCHED_BEGIN = "unmatched_begin"
+ISSUE_UNMATCHED_END = "unmatched_end"
+ISSUE_DUPLICATE_BEGIN = "duplicate_begin"
+ISSUE_OVERLAP = "overlap"
+
+
+Event = namedtuple("Event", ["time", "state", "type", "id", "name", "lat", "lon"])
+
+
+# kind: ISSUE_*, event: das betroffene Event, other: das beteiligte zweite Event (oder None)
+EventIssue = namedtuple("EventIssue", ["kind", "event", "other"])
+
+
+def parse_events(waypoints):
+    # Wegpunkte -> chronologisch sortierte Events; Wegpunkte ohne Zeit oder ohne Event-Namen
+    # (normale POIs) werden übersprungen
+    match = EVENT_PATTERN.match
+    events = []
+    for wpt in waypoints:
+        name, time = wpt["name"], wpt["time"]
+        if not name or not time:
+            continue
+        m = match(name.strip())
+        if m is None:
+            continue
+        evt_type, state, evt_id, evt_name = m.groups("")  # fehlende ID / fehlender Name -> ""
+        events.append(Event(time, state, evt_type, evt_id, evt_name, wpt["lat"], wpt["lon"]))
+
+    # Bei bereits sortierten Wegpunkten (Normalfall) ist das ein einzelner linearer Durchlauf;
+    # gemischte Zeitangaben mit/ohne Zeitzone werden über Epoch-Mikrosekunden verglichen
+    try:
+        events.sort(key=attrgetter("time"))
+    except TypeError:
+        events.sort(key=lambda e: to_epoch_us(e.time))
+    return events
+
+
+def pair_events(events):
+    # Liefert (pairs, issues): pairs = [(begin, end), ...] in der Reihenfolge der END-Events
+    pairs = []
+    issues = []
+    open_events = {}  # key -> begonnenes Event
+    overlapped = set()  # Keys offener Events, deren Überlappung schon gemeldet ist
+    for evt in events:
+        key = evt.id or evt.name  # Schlüssel des Event-Paars: ID, bei Pausen (ohne ID) der Name
+        if evt.state == "BEGIN":
+            previous = open_events.pop(key, None)
+            if previous is not None:
+                issues.append(EventIssue(ISSUE_DUPLICATE_BEGIN, previous, evt))
+                overlapped.discard(key)
+            if open_events:
+                # Pro offenem Event nur einmal melden, sonst erzeugt ein nie beendetes BEGIN
+                # eine Meldung für jedes folgende Event
+                other_key, other = next(reversed(open_events.items()))
+                if other_key not in overlapped:
+                    overlapped.add(other_key)
+                    issues.append(EventIssue(ISSUE_OVERLAP, evt, other))
+            open_events[key] = evt
+        else:
+            overlapped.discard(key)
+            begin = open_events.pop(key, None)
+            if begin is None:
+                issues.append(EventIssue(ISSUE_UNMATCHED_END, evt, None))
+            else:
+                pairs.append((begin, evt))
+
+    for evt in open_events.values():
+        issues.append(EventIssue(ISSUE_UNMATCHED_BEGIN, evt, None))
+    return pairs, issues
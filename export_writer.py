@@ -0,0 +1,168 @@
+# --- EXPORT-WRITER FÜR STANDZEITEN-DATEIEN ---
+# Schreibt die Zeilen aus tour_model.export_rows direkt als UTF-16 CSV (Semikolon, Bytes wie bisher
+# pandas.to_csv), ohne DataFrame pro Tour. Dateien entstehen atomar: erst *.tmp im Zielordner,
+# dann os.replace -> ein abgebrochener Export hinterlässt nie eine halbe CSV.
+# PeriodWriter sammelt zusätzlich die Zeilen aller Touren in einer Datei je Tag oder Monat
+# (CSV oder Parquet; Parquet nur mit installiertem pyarrow).
+import csv
+import importlib.util
+import io
+import os
+from contextlib import contextmanager
+
+EXPORT_ENCODING = "utf-16"
+CSV_SEPARATOR = ";"
+LINE_TERMINATOR = os.linesep  # wie pandas.to_csv
+
+PERIOD_DAY = "day"
+PERIOD_MONTH = "month"
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+PARQUET_ROW_GROUP = 50_000  # Zeilen je Row-Group (kleine Tabellen je Tour machen Parquet langsam und groß)
+# Eigenes Präfix, damit batch_export.latest_exports die Sammeldateien nicht für Tour-CSVs hält
+PERIOD_PREFIX = {PERIOD_DAY: "Standzeiten-Tag_", PERIOD_MONTH: "Standzeiten-Monat_"}
+
+
+@contextmanager
+def atomic_open(path, mode="w", **kwargs):
+    # Schreibt in eine temporäre Datei neben dem Ziel; nur bei Erfolg wird sie zum Ziel umbenannt
+    tmp = f"{path}.{os.getpid()}.tmp"
+    f = open(tmp, mode, **kwargs)
+    try:
+        yield f
+        f.close()
+        os.replace(tmp, path)
+    except BaseException:
+        f.close()
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _csv_writer(f):
+    return csv.writer(f, delimiter=CSV_SEPARATOR, lineterminator=LINE_TERMINATOR, quoting=csv.QUOTE_MINIMAL)
+
+
+def write_rows(f, rows, header=True):
+    # rows: dicts mit gleichen Schlüsseln (Spaltenreihenfolge = Schlüsselreihenfolge der ersten Zeile)
+    writer = None
+    count = 0
+    for row in rows:
+        if writer is None:
+            writer = _csv_writer(f)
+            if header:
+                writer.writerow(row.keys())
+        writer.writerow(row.values())
+        count += 1
+    return count
+
+
+def write_csv(path, rows):
+    # Eine Standzeiten-CSV, UTF-16 mit BOM, atomar; liefert die Anzahl der Zeilen
+    with atomic_open(path, "w", encoding=EXPORT_ENCODING, newline="") as f:
+        return write_rows(f, rows)
+
+
+def csv_bytes(rows):
+    # Für den Download-Button: dieselben Bytes wie write_csv, genau einmal kodiert
+    buffer = io.StringIO(newline="")
+    write_rows(buffer, rows)
+    return buffer.getvalue().encode(EXPORT_ENCODING)
+
+
+def period_key(iso_date, period):
+    # '2026-01-14' -> '2026-01-14' (Tag) bzw. '2026-01' (Monat)
+    return iso_date if period == PERIOD_DAY else iso_date[:7]
+
+
+class PeriodWriter:
+    # Sammeldatei je Tag/Monat über alle Touren. Zeilen werden beim Eintreffen angehängt
+    # (Reihenfolge = Fertigstellung der Touren), die Dateien erst bei close() sichtbar.
+    def __init__(self, export_dir, period=PERIOD_DAY, fmt=FORMAT_CSV):
+        if period not in PERIOD_PREFIX:
+            raise ValueError(f"Unbekannter Zeitraum: {period}")
+        if fmt not in (FORMAT_CSV, FORMAT_PARQUET):
+            raise ValueError(f"Unbekanntes Format: {fmt}")
+        if fmt == FORMAT_PARQUET and importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("Parquet-Export braucht pyarrow")  # früh scheitern, nicht erst nach der ersten Tour
+        self.export_dir = export_dir
+        self.period = period
+        self.fmt = fmt
+        self._outputs = {}  # Periode -> (Zieldatei, temporäre Datei, Datei/ParquetWriter, csv.writer/Schema)
+        self._pending = {}  # Parquet: Periode -> gepufferte Zeilen bis zur nächsten Row-Group
+        self.rows = 0
+
+    def path_for(self, key):
+        return os.path.join(self.export_dir, f"{PERIOD_PREFIX[self.period]}{key}.{self.fmt}")
+
+    def add(self, iso_date, rows):
+        if not rows:
+            return
+        key = period_key(iso_date, self.period)
+        out = self._outputs.get(key)
+        if self.fmt == FORMAT_CSV:
+            if out is None:
+                path = self.path_for(key)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                f = open(tmp, "w", encoding=EXPORT_ENCODING, newline="")
+                out = self._outputs[key] = (path, tmp, f, _csv_writer(f))
+                out[3].writerow(rows[0].keys())
+            writer = out[3]
+            for row in rows:
+                writer.writerow(row.values())
+        else:
+            pending = self._pending.setdefault(key, [])
+            pending.extend(rows)
+            if len(pending) >= PARQUET_ROW_GROUP:
+                self._flush_parquet(key)
+        self.rows += len(rows)
+
+    def _flush_parquet(self, key):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        rows = self._pending.pop(key, None)
+        if not rows:
+            return
+        out = self._outputs.get(key)
+        if out is None:
+            path = self.path_for(key)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            table = pa.Table.from_pylist(rows)
+            out = self._outputs[key] = (path, tmp, pq.ParquetWriter(tmp, table.schema), table.schema)
+        else:
+            table = pa.Table.from_pylist(rows, schema=out[3])
+        out[2].write_table(table)
+
+    def close(self):
+        # Alle Sammeldateien fertigstellen; liefert die geschriebenen Pfade
+        for key in list(self._pending):
+            self._flush_parquet(key)
+        written = []
+        for path, tmp, f, _ in self._outputs.values():
+            f.close()
+            os.replace(tmp, path)
+            written.append(path)
+        self._outputs = {}
+        return sorted(written)
+
+    def abort(self):
+        for _, tmp, f, _ in self._outputs.values():
+            try:
+                f.close()
+                os.remove(tmp)
+            except Exception:
+                pass
+        self._outputs = {}
+        self._pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,79 @@
+# --- INKREMENTELLER DATEI-INDEX ---
+# Ein Index pro GPX-Ordner und Prozess, den alle Streamlit-Sessions gemeinsam lesen.
+# Statt pro Session und Minute listdir + isfile + getmtime laufen zu lassen, vergleicht der Index
+# einen scandir-Durchlauf mit dem letzten Snapshot (höchstens alle MIN_SCAN_INTERVAL Sekunden).
+# Nur wenn Dateien hinzugekommen, geändert oder gelöscht wurden, steigt die Versionsnummer;
+# Sessions bauen ihre Dateitabelle nur bei neuer Version neu auf.
+import os
+import threading
+import time
+
+MIN_SCAN_INTERVAL = 10.0  # Sekunden; häufigere refresh()-Aufrufe lesen nur den Snapshot
+
+
+def is_tour_file(name):
+    upper = name.upper()
+    return upper.startswith('DL') and upper.endswith('.GPX')
+
+
+class FileIndex:
+    def __init__(self, folder, min_interval=MIN_SCAN_INTERVAL):
+        self.folder = folder
+        self.min_interval = min_interval
+        self.version = 0
+        self._entries = {}                # Dateiname -> (mtime, size)
+        self._files = ()                  # (Dateiname, mtime), neueste zuerst
+        self._last_scan = None
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        snapshot = {}
+        try:
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    if is_tour_file(entry.name) and entry.is_file():
+                        st_res = entry.stat()
+                        snapshot[entry.name] = (st_res.st_mtime, st_res.st_size)
+        except OSError:
+            pass
+        return snapshot
+
+    def refresh(self, force=False):
+        # Scan (gedrosselt) und Vergleich mit dem letzten Snapshot; liefert die aktuelle Version
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._last_scan is not None and now - self._last_scan < self.min_interval:
+                return self.version
+            self._last_scan = now
+
+            snapshot = self._scan()
+            if snapshot == self._entries:
+                return self.version
+
+            self._entries = snapshot
+            self._files = tuple(sorted(((name, meta[0]) for name, meta in snapshot.items()),
+                                       key=lambda x: x[1], reverse=True))
+            self.version += 1
+            return self.version
+
+    def snapshot(self):
+        # (Version, Dateien) passend zueinander
+        with self._lock:
+            return self.version, self._files
+
+    def files(self):
+        return self.snapshot()[1]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_file_index(folder):
+    # Prozessweiter Index pro Ordner (Module bleiben über Streamlit-Reruns hinweg geladen)
+    key = os.path.abspath(folder)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = FileIndex(folder)
+        return index
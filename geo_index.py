@@ -0,0 +1,195 @@
+# --- RÄUMLICHER INDEX DER KUNDENSTANDORTE ---
+# Gitter-Index (Zellen in Metern) über die Kundenpositionen aus der lokalen Geocode-Tabelle
+# (KND_GEO.csv: NUMBER;LAT;LON) und ergänzend aus dem Touren-Archiv gelernten Positionen.
+# Gelernte Positionen (Mittel der CLIENT-Stopps) dienen nur der Zuordnung erkannter Stopps; die
+# Standortprüfung nutzt allein die Geocode-Tabelle, sonst prüfte sie die Stopps gegen sich selbst.
+# Abfragen laufen im Batch vektorisiert: alle Stopps einer Tour (oder des ganzen Archivs)
+# werden mit einem Aufruf den Kandidaten in den Nachbarzellen zugeordnet.
+import math
+import os
+import threading
+
+import numpy as np
+
+from analytics import get_customer_positions
+from track import ONE_DEGREE, haversine
+
+GEOCODE_FILE = "KND_GEO.csv"
+CELL_SIZE_M = 250.0
+VERIFY_RADIUS_M = 200.0  # Stopp gilt als beim Kunden, wenn er näher als das am Kundenstandort liegt
+
+GEO_OK = "ok"            # Stopp liegt am Standort des angegebenen Kunden
+GEO_FAR = "far"          # Stopp liegt weiter entfernt
+GEO_UNKNOWN = "unknown"  # kein Standort für den Kunden bekannt
+
+
+class CustomerGeoIndex:
+    def __init__(self, ids, lat, lon, cell_size_m=CELL_SIZE_M, version=None):
+        self.version = version
+        self.cell_size_m = cell_size_m
+        self.ids = list(ids)
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self._rows = {cid: i for i, cid in enumerate(self.ids)}
+        # Feste Projektion um die mittlere Breite (für eine regionale Flotte ausreichend genau)
+        self._coef = math.cos(math.radians(float(np.mean(self.lat)))) if len(self.lat) else 1.0
+        keys = self._cell_keys(*self._cells(self.lat, self.lon))
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, customer_id):
+        return customer_id in self._rows
+
+    def position(self, customer_id):
+        i = self._rows.get(customer_id)
+        return None if i is None else (float(self.lat[i]), float(self.lon[i]))
+
+    def _cells(self, lat, lon):
+        cx = np.floor(np.asarray(lon) * self._coef * ONE_DEGREE / self.cell_size_m).astype(np.int64)
+        cy = np.floor(np.asarray(lat) * ONE_DEGREE / self.cell_size_m).astype(np.int64)
+        return cx, cy
+
+    @staticmethod
+    def _cell_keys(cx, cy):
+        return (cx << 32) + cy
+
+    def candidates(self, lat, lon, radius_m):
+        # Alle Kunden im Umkreis: (query_idx, customer_idx, dist_m) als flache Arrays
+        lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))
+        lon = np.atleast_1d(np.asarray(lon, dtype=np.float64))
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0))
+        if not len(lat) or not len(self.ids):
+            return empty
+        cx, cy = self._cells(lat, lon)
+        reach = max(1, math.ceil(radius_m / self.cell_size_m))
+        offsets = np.arange(-reach, reach + 1)
+        dx, dy = np.meshgrid(offsets, offsets)
+        # Zellschlüssel Anfrage x Nachbarzelle -> Bereiche im sortierten Schlüssel-Array
+        keys = self._cell_keys(cx[:, None] + dx.ravel()[None, :], cy[:, None] + dy.ravel()[None, :])
+        lo = np.searchsorted(self._keys, keys, side="left").ravel()
+        hi = np.searchsorted(self._keys, keys, side="right").ravel()
+        counts = hi - lo
+        total = int(counts.sum())
+        if not total:
+            return empty
+        query_idx = np.repeat(np.arange(len(lat)).repeat(keys.shape[1]), counts)
+        # Bereiche [lo, hi) aneinanderhängen ohne Python-Schleife
+        starts = np.repeat(lo - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        customer_idx = self._order[starts + np.arange(total)]
+        dist = haversine(lat[query_idx], lon[query_idx], self.lat[customer_idx], self.lon[customer_idx])
+        inside = dist <= radius_m
+        return query_idx[inside], customer_idx[inside], dist[inside]
+
+    def nearest(self, lat, lon, max_dist_m=VERIFY_RADIUS_M):
+        # Nächster Kunde je Position: (ids, dist_m); "" bzw. inf, wenn keiner im Radius liegt
+        n = len(np.atleast_1d(lat))
+        ids = [""] * n
+        best = np.full(n, np.inf)
+        query_idx, customer_idx, dist = self.candidates(lat, lon, max_dist_m)
+        if len(dist):
+            order = np.lexsort((dist, query_idx))
+            query_idx, customer_idx, dist = query_idx[order], customer_idx[order], dist[order]
+            first = np.flatnonzero(np.diff(query_idx, prepend=-1) != 0)
+            best[query_idx[first]] = dist[first]
+            for q, c in zip(query_idx[first], customer_idx[first]):
+                ids[q] = self.ids[c]
+        return ids, best
+
+    def distance_to(self, customer_ids, lat, lon):
+        # Entfernung jeder Position zum Standort des jeweils angegebenen Kunden (NaN = unbekannt)
+        rows = np.array([self._rows.get(cid, -1) for cid in customer_ids], dtype=np.int64)
+        dist = np.full(len(rows), np.nan)
+        known = rows >= 0
+        if known.any():
+            dist[known] = haversine(np.asarray(lat, dtype=np.float64)[known], np.asarray(lon, dtype=np.float64)[known],
+                                    self.lat[rows[known]], self.lon[rows[known]])
+        return dist
+
+
+def verify_locations(customer_ids, lat, lon, index, radius_m=VERIFY_RADIUS_M):
+    # Prüft je CLIENT-Stopp, ob er am Standort des angegebenen Kunden stattfand.
+    # Liefert [(status, dist_zum_kunden_m, nächster_kunde, dist_nächster_m), ...]
+    claimed = index.distance_to(customer_ids, lat, lon)
+    nearest_ids, nearest_dist = index.nearest(lat, lon, radius_m)
+    results = []
+    for d, nid, nd in zip(claimed, nearest_ids, nearest_dist):
+        status = GEO_UNKNOWN if np.isnan(d) else (GEO_OK if d <= radius_m else GEO_FAR)
+        results.append((status, float(d), nid, float(nd)))
+    return results
+
+
+def read_geocode_file(filename):
+    # NUMBER;LAT;LON (Kopfzeile, Dezimalpunkt oder -komma); ungültige Zeilen werden übersprungen
+    ids, lat, lon = [], [], []
+    with open(filename, encoding="latin1") as f:
+        header = [c.strip().upper() for c in f.readline().split(";")]
+        i_nr, i_lat, i_lon = header.index("NUMBER"), header.index("LAT"), header.index("LON")
+        for line in f:
+            parts = line.rstrip("\r\n").split(";")
+            try:
+                la = float(parts[i_lat].replace(",", "."))
+                lo = float(parts[i_lon].replace(",", "."))
+            except (IndexError, ValueError):
+                continue
+            number = parts[i_nr].strip().strip('"')
+            if number and -90 <= la <= 90 and -180 <= lo <= 180:
+                ids.append(number)
+                lat.append(la)
+                lon.append(lo)
+    return ids, lat, lon
+
+
+def _file_version(path):
+    try:
+        st_res = os.stat(path)
+    except OSError:
+        return None
+    return (st_res.st_mtime_ns, st_res.st_size)
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_customer_geo_index(csv_folder, archive_path=None):
+    # Prozessweit: Geocode-Tabelle hat Vorrang, Archiv-Positionen ergänzen fehlende Kunden.
+    # Ohne archive_path nur die Geocode-Tabelle (get_customer_verify_index).
+    # Neu aufgebaut, wenn sich eine der beiden Dateien ändert; None wenn keine Quelle existiert.
+    geo_file = os.path.join(csv_folder, GEOCODE_FILE)
+    version = (_file_version(geo_file), _file_version(archive_path) if archive_path else None)
+    key = (os.path.abspath(geo_file), os.path.abspath(archive_path) if archive_path else None)
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None and index.version == version:
+            return index
+
+        ids, lat, lon = [], [], []
+        if version[0]:
+            try:
+                ids, lat, lon = read_geocode_file(geo_file)
+            except Exception as e:
+                print(f"Fehler beim Lesen von {geo_file}: {e}")
+        if version[1]:
+            learned = get_customer_positions(archive_path)
+            if learned:
+                known = set(ids)
+                for cid, la, lo in zip(*learned):
+                    if cid not in known:
+                        ids.append(cid)
+                        lat.append(float(la))
+                        lon.append(float(lo))
+        index = CustomerGeoIndex(ids, lat, lon, version=version) if ids else None
+        if index is None:
+            _indexes.pop(key, None)
+        else:
+            _indexes[key] = index
+        return index
+
+
+def get_customer_verify_index(csv_folder):
+    # Index für verify_locations: nur KND_GEO.csv. Kunden, deren Standort allein aus dem Archiv
+    # gelernt ist, fehlen darin -> ihre Stopps werden als GEO_UNKNOWN gemeldet, nicht als GEO_OK.
+    return get_customer_geo_index(csv_folder)
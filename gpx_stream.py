@@ -0,0 +1,140 @@
+# --- STREAMING GPX PARSER ---
+# Liest GPX-Dateien inkrementell (iterparse) statt den kompletten gpxpy-Objektbaum aufzubauen.
+# Trackpunkte und Wegpunkte (CLIENT_/PAUSE_ Events) werden in einem einzigen Durchlauf
+# geliefert, bereits verarbeitete XML-Elemente werden sofort wieder freigegeben.
+import re
+import xml.etree.ElementTree as ET
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from track import TIME_DTYPE, Track, to_epoch_us
+
+POINT_TAGS = ("trkpt", "rtept", "wpt")
+
+# Fallback für Zeitformate, die datetime.fromisoformat nicht versteht (z.B. >6 Nachkommastellen)
+RE_TIMESTAMP = re.compile(r"^([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})[T ]([0-9]{1,2}):([0-9]{1,2}):([0-9]{1,2})"
+                          r"(\.[0-9]+)?\s*(Z|[+-][0-9]{2}:?(?:[0-9]{2})?)?$")
+
+
+def _local_name(tag):
+    # '{http://www.topografix.com/GPX/1/0}trkpt' -> 'trkpt'
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_time(value):
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    m = RE_TIMESTAMP.match(value)
+    if not m:
+        return None
+    parts = [int(m.group(i)) for i in range(1, 7)]
+    micro = int((m.group(7) or ".0")[1:7].ljust(6, "0"))
+    tz = None
+    if m.group(8):
+        if m.group(8) == "Z":
+            tz = timezone.utc
+        else:
+            sign = -1 if m.group(8)[0] == "-" else 1
+            digits = m.group(8)[1:].replace(":", "")
+            tz = timezone(sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:] or 0)))
+    return datetime(*parts, micro, tzinfo=tz)
+
+
+def iter_gpx(file):
+    # Generator über alle relevanten GPX-Elemente in Dateireihenfolge:
+    #   ("trkseg", None, None, None, None, None)  -> neues Track-Segment beginnt
+    #   ("trkpt"|"rtept"|"wpt", lat, lon, ele, time, name)
+    try:
+        file.seek(0)
+    except Exception:
+        pass
+
+    stack = []
+    for event, elem in ET.iterparse(file, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if _local_name(elem.tag) == "trkseg":
+                yield ("trkseg", None, None, None, None, None)
+            continue
+
+        stack.pop()
+        tag = _local_name(elem.tag)
+        if tag not in POINT_TAGS:
+            continue
+
+        try:
+            lat = float(elem.get("lat"))
+            lon = float(elem.get("lon"))
+        except (TypeError, ValueError):
+            lat = lon = None
+
+        ele = time_val = name = None
+        for child in elem:
+            child_tag = _local_name(child.tag)
+            if child_tag == "ele" and child.text:
+                try:
+                    ele = float(child.text)
+                except ValueError:
+                    pass
+            elif child_tag == "time":
+                time_val = parse_time(child.text)
+            elif child_tag == "name":
+                name = child.text
+
+        # Speicher sofort freigeben: Element leeren und aus dem Elternknoten lösen
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+        if lat is not None and lon is not None:
+            yield (tag, lat, lon, ele, time_val, name)
+
+
+def _as_times(buffer):
+    return np.frombuffer(buffer, dtype=np.int64).view(TIME_DTYPE)
+
+
+def parse_gpx(file):
+    # Ein Durchlauf über die Datei; Trackpunkte landen direkt in kompakten Spalten-Puffern
+    lat, lon, ele, times = array('d'), array('d'), array('f'), array('q')
+    segment_starts = array('q')
+    r_lat, r_lon, r_ele, r_times = array('d'), array('d'), array('f'), array('q')
+    waypoints = []
+    nan = float("nan")
+
+    for tag, p_lat, p_lon, p_ele, time_val, name in iter_gpx(file):
+        if tag == "trkseg":
+            segment_starts.append(len(lat))
+        elif tag == "trkpt":
+            lat.append(p_lat)
+            lon.append(p_lon)
+            ele.append(nan if p_ele is None else p_ele)
+            times.append(to_epoch_us(time_val))
+        elif tag == "rtept":
+            r_lat.append(p_lat)
+            r_lon.append(p_lon)
+            r_ele.append(nan if p_ele is None else p_ele)
+            r_times.append(to_epoch_us(time_val))
+        elif tag == "wpt":
+            waypoints.append({"time": time_val, "name": name, "lat": p_lat, "lon": p_lon})
+
+    if lat:
+        track = Track(lat, lon, ele, _as_times(times), segment_starts or None)
+        has_track = True
+    else:
+        # Keine Trackpunkte: Route nur für die Karte, Statistik bleibt (wie bei gpxpy) leer
+        track = Track(r_lat, r_lon, r_ele, _as_times(r_times))
+        has_track = False
+
+    return {
+        "track": track,
+        "has_track": has_track,
+        "waypoints": waypoints
+    }
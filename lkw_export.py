@@ -0,0 +1,387 @@
+# --- KOMMANDOZEILEN-EXPORT (ohne Streamlit/folium) ---
+# Für den nächtlichen Cron-Job:
+#   python -m lkw_export export [--gpx-dir DIR] [--export-dir DIR] [--lang English] [--workers N] [--force]
+#       [--consolidate day|month] [--format csv|parquet]  (zusätzlich eine Sammeldatei je Tag/Monat)
+#   python -m lkw_export stats [--json] [DATEI ...]
+#   python -m lkw_export ingest [--archive DB] [--force]      (Touren ins Archiv übernehmen)
+#   python -m lkw_export dwell [--archive DB] [--days 90] [--json]  (Ø Standzeit je Kunde)
+#   python -m lkw_export verify [--archive DB] [--radius 200] [--since DATUM] [--all] [--json]
+#       (fanden die CLIENT-Stopps am Standort des Kunden statt? Standorte aus KND_GEO.csv / Archiv)
+#   python -m lkw_export geojson [--date YYYY-MM-DD] [--out DATEI] [--html DATEI]
+#       (alle Touren eines Tages als GeoJSON, optional als Flotten-Karte; braucht folium)
+#   python -m lkw_export windows [--archive DB] [--since DATUM] [--until DATUM] [--by tour|tour_nr|customer|stop]
+#       [--tolerance MIN] [--json]  (CLIENT-Stopps im Archiv gegen die Lieferfenster aus KND.STM prüfen)
+#   python -m lkw_export convert [--force] [DATEI ...]
+#       (GPX-Ordner ins binäre Track-Archiv *.lkwtrk übernehmen; nur neue/geänderte Dateien)
+# Exit-Code 0 = alles ok, 1 = mindestens eine Tour fehlerhaft, 2 = Konfigurationsfehler
+import argparse
+import json
+import os
+import sys
+
+from batch_export import STATUS_EMPTY, STATUS_ERROR, STATUS_EXPORTED, STATUS_SKIPPED, find_tour_files, run_batch, tour_nr_from_filename
+from settings import (ANALYTICS_DB_PATH, CSV_FOLDER_PATH, EXPORT_FOLDER_PATH, GPX_FOLDER_PATH, PARSE_CACHE_MAX_MB, PARSE_CACHE_PATH,
+                      TRACK_ARCHIVE_FOLDER)
+from translations import TRANSLATIONS
+
+
+def cmd_export(args):
+    if not os.path.isdir(args.export_dir):
+        print(f"Export-Ordner existiert nicht: {args.export_dir}", file=sys.stderr)
+        return 2
+
+    paths = find_tour_files(args.gpx_dir)
+    if not paths:
+        print(f"Keine DL*.gpx Dateien in {args.gpx_dir}")
+        return 0
+
+    from customer_db import load_customer_db
+    customer_db = load_customer_db(args.csv_dir)
+    cache_path = None if args.no_cache else args.cache
+
+    period_writer = None
+    if args.consolidate:
+        from export_writer import PeriodWriter
+        try:
+            period_writer = PeriodWriter(args.export_dir, args.consolidate, args.format)
+        except ImportError:
+            print("Parquet-Export braucht pyarrow (pip install pyarrow)", file=sys.stderr)
+            return 2
+
+    counts = {STATUS_EXPORTED: 0, STATUS_EMPTY: 0, STATUS_SKIPPED: 0, STATUS_ERROR: 0}
+    # Sammeldateien müssen alle Touren enthalten -> dann auch aktuelle Touren neu exportieren
+    force = args.force or period_writer is not None
+    collect = period_writer.add if period_writer else None
+    try:
+        for done, total, (fname, status, detail) in run_batch(paths, args.export_dir, args.lang, customer_db,
+                                                               cache_path, args.workers, force, collect,
+                                                               args.archive_dir):
+            counts[status] += 1
+            if status == STATUS_ERROR:
+                print(f"Error extracting {fname}: {detail}", file=sys.stderr)
+            elif args.verbose:
+                print(f"[{done}/{total}] {fname}: {status}{f' -> {detail}' if detail else ''}")
+    except BaseException:
+        if period_writer:
+            period_writer.abort()
+        raise
+    if period_writer:
+        for path in period_writer.close():
+            print(f"Sammeldatei: {path}")
+
+    print(f"exportiert={counts[STATUS_EXPORTED]} ohne_stopps={counts[STATUS_EMPTY]} "
+          f"übersprungen={counts[STATUS_SKIPPED]} fehler={counts[STATUS_ERROR]}")
+    return 1 if counts[STATUS_ERROR] else 0
+
+
+def open_parse_cache(args):
+    from parse_cache import ParseCache
+    return None if args.no_cache else ParseCache(args.cache, PARSE_CACHE_MAX_MB * 1024 * 1024)
+
+
+def load_tour(path, cache, archive_dir=None):
+    from tour_model import analyze_tour
+    from track_archive import open_for_gpx
+    parsed = open_for_gpx(path, archive_dir)
+    if parsed is not None:
+        return analyze_tour(parsed)
+    if cache:
+        return analyze_tour(cache.get_or_parse(path))
+    from gpx_stream import parse_gpx
+    with open(path, 'rb') as f:
+        return analyze_tour(parse_gpx(f))
+
+
+def cmd_stats(args):
+    from tour_model import format_clock, format_date
+
+    paths = args.files or find_tour_files(args.gpx_dir)
+    cache = open_parse_cache(args)
+    rows = []
+    errors = 0
+    for path in paths:
+        try:
+            data = load_tour(path, cache, args.archive_dir)
+        except Exception as e:
+            print(f"Error extracting {os.path.basename(path)}: {e}", file=sys.stderr)
+            errors += 1
+            continue
+        rows.append({
+            "TourNr": tour_nr_from_filename(os.path.basename(path)),
+            "Datum": format_date(data["start_time"], args.lang),
+            "Start": format_clock(data["start_time"], args.lang),
+            "Ende": format_clock(data["end_time"], args.lang),
+            "km": round(data["dist_km"], 2),
+            "km/h": round(data["avg_speed"], 1),
+            "Stopps": len(data["customer_stops"]),
+        })
+
+    print_rows(rows, args.json)
+    return 1 if errors else 0
+
+
+def print_rows(rows, as_json):
+    if as_json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    elif rows:
+        header = list(rows[0])
+        print(";".join(header))
+        for row in rows:
+            print(";".join(str(row[col]) for col in header))
+
+
+def cmd_ingest(args):
+    from analytics import TourArchive
+
+    paths = args.files or find_tour_files(args.gpx_dir)
+    cache = open_parse_cache(args)
+    archive = TourArchive(args.archive)
+    imported, skipped, errors = archive.ingest_files(paths, lambda path: load_tour(path, cache, args.archive_dir), args.force)
+    print(f"importiert={imported} übersprungen={skipped} fehler={errors}")
+    return 1 if errors else 0
+
+
+def cmd_dwell(args):
+    from analytics import TourArchive
+
+    if not os.path.exists(args.archive):
+        print(f"Archiv existiert nicht: {args.archive}", file=sys.stderr)
+        return 2
+    from customer_db import load_customer_db
+    customer_db = load_customer_db(args.csv_dir)
+    rows = TourArchive(args.archive).dwell_per_customer(args.days)
+    for row in rows:
+        row["avg_min"] = round(row["avg_min"], 1)
+        if not row["name"] and customer_db:
+            row["name"] = customer_db.get_name(row["customer_id"], "")
+    print_rows(rows, args.json)
+    return 0
+
+
+def cmd_verify(args):
+    from analytics import TourArchive
+    from geo_index import GEO_OK, GEO_UNKNOWN, GEOCODE_FILE, get_customer_verify_index, verify_locations
+
+    if not os.path.exists(args.archive):
+        print(f"Archiv existiert nicht: {args.archive}", file=sys.stderr)
+        return 2
+    index = get_customer_verify_index(args.csv_dir)
+    if index is None:
+        print(f"Keine Kundenstandorte bekannt ({os.path.join(args.csv_dir, GEOCODE_FILE)} fehlt oder leer)", file=sys.stderr)
+        return 2
+    stops = TourArchive(args.archive).client_stops(args.since)
+    checks = verify_locations([s["customer_id"] for s in stops], [s["lat"] for s in stops],
+                              [s["lon"] for s in stops], index, args.radius)
+    rows = []
+    for stop, (status, dist, nearest_id, nearest_dist) in zip(stops, checks):
+        if status == GEO_OK and not args.all:
+            continue
+        rows.append({
+            "TourNr": stop["tour_nr"],
+            "Datum": stop["tour_date"],
+            "Kunde": stop["customer_id"],
+            "Status": status,
+            "Abstand_m": "" if status == GEO_UNKNOWN else round(dist),
+            "Naechster_Kunde": nearest_id,
+            "Abstand_naechster_m": round(nearest_dist) if nearest_id else "",
+        })
+    print_rows(rows, args.json)
+    if not args.json:
+        print(f"geprüft={len(stops)} auffällig={sum(1 for c in checks if c[0] != GEO_OK)}", file=sys.stderr)
+    return 0
+
+
+def cmd_windows(args):
+    from analytics import TourArchive
+    from customer_db import load_customer_db
+    import numpy as np
+    from delivery_windows import WINDOW_NONE, WINDOW_OK, check_delivery_windows, summarize
+
+    if not os.path.exists(args.archive):
+        print(f"Archiv existiert nicht: {args.archive}", file=sys.stderr)
+        return 2
+    customer_db = load_customer_db(args.csv_dir)
+    if customer_db is None or not customer_db.window_columns()[0]:
+        print("Keine Lieferfenster in KND.STM (DLVRTIMEB1/E1, DLVRTIMEB2/E2)", file=sys.stderr)
+        return 2
+    tour_nrs, dates, customer_ids, arrivals = TourArchive(args.archive).client_arrivals(args.since, args.until)
+    status, deviation = check_delivery_windows(customer_ids, arrivals, customer_db, args.tolerance)
+
+    if args.by == "stop":
+        # Einzelne Stopps außerhalb ihres Lieferfensters
+        from datetime import datetime, timezone
+        from tour_model import format_stop_time
+        rows = [{"TourNr": tour_nrs[i], "Datum": dates[i], "Kunde": customer_ids[i],
+                 "Name": customer_db.get_name(customer_ids[i], ""),
+                 "Ankunft": format_stop_time(datetime.fromtimestamp(arrivals[i], timezone.utc)),
+                 "Fenster": " / ".join(f"{b // 60:02d}:{b % 60:02d}-{e // 60:02d}:{e % 60:02d}"
+                                       for b, e in customer_db.delivery_windows(customer_ids[i])),
+                 "Status": status[i], "Abweichung_min": int(deviation[i])}
+                for i in np.flatnonzero((status != WINDOW_OK) & (status != WINDOW_NONE))]
+    else:
+        keys = {"tour": [f"{d};{nr}" for d, nr in zip(dates, tour_nrs)], "tour_nr": tour_nrs,
+                "customer": customer_ids}[args.by]
+        rows = []
+        for row in summarize(keys, status, deviation):
+            if not row["mit_fenster"]:
+                continue
+            key = row.pop("key")
+            if args.by == "tour":
+                day, nr = key.split(";", 1)
+                head = {"Datum": day, "TourNr": nr}
+            elif args.by == "tour_nr":
+                head = {"TourNr": key}
+            else:
+                head = {"Kunde": key, "Name": customer_db.get_name(key, "")}
+            rows.append({**head, **row})
+    print_rows(rows, args.json)
+    if not args.json:
+        checked = int((status != WINDOW_NONE).sum())
+        print(f"stopps={len(status)} mit_fenster={checked} außerhalb={checked - int((status == WINDOW_OK).sum())}",
+              file=sys.stderr)
+    return 0
+
+
+def cmd_geojson(args):
+    from map_render import build_fleet_map, fleet_feature_collection
+    from tour_model import local_date
+
+    cache = open_parse_cache(args)
+    tours = []
+    errors = 0
+    for path in find_tour_files(args.gpx_dir):
+        try:
+            data = load_tour(path, cache, args.archive_dir)
+        except Exception as e:
+            print(f"Error extracting {os.path.basename(path)}: {e}", file=sys.stderr)
+            errors += 1
+            continue
+        if data["start_time"] and len(data["track"]):
+            tours.append((tour_nr_from_filename(os.path.basename(path)), data))
+    if not tours:
+        print(f"Keine Touren mit Track in {args.gpx_dir}", file=sys.stderr)
+        return 1 if errors else 0
+
+    # Ohne --date der jüngste Tag mit Touren
+    day = args.date or max(local_date(data["start_time"]) for _, data in tours)
+    tours = sorted((t for t in tours if local_date(t[1]["start_time"]) == day), key=lambda t: t[0])
+    collection = fleet_feature_collection(tours, tolerance_m=args.tolerance)
+    text = json.dumps(collection, separators=(",", ":"))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.html:
+        build_fleet_map(collection).save(args.html)
+    print(f"tag={day} touren={len(tours)} toleranz_m={collection['properties']['tolerance_m']:.0f}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def cmd_convert(args):
+    from track_archive import convert_gpx
+
+    if args.archive_dir and not os.path.isdir(args.archive_dir):
+        print(f"Archiv-Ordner existiert nicht: {args.archive_dir}", file=sys.stderr)
+        return 2
+    cache = open_parse_cache(args)
+    parse = cache.get_or_parse if cache else None
+    counts = {"neu": 0, "aktuell": 0, "fehler": 0}
+    total_bytes = 0
+    for path in args.files or find_tour_files(args.gpx_dir):
+        try:
+            target, status = convert_gpx(path, args.archive_dir, args.force, parse)
+        except Exception as e:
+            print(f"Error converting {os.path.basename(path)}: {e}", file=sys.stderr)
+            counts["fehler"] += 1
+            continue
+        counts[status] += 1
+        total_bytes += os.path.getsize(target)
+        if args.verbose and status == "neu":
+            print(f"{os.path.basename(path)} -> {target}")
+    print(f"neu={counts['neu']} aktuell={counts['aktuell']} fehler={counts['fehler']} "
+          f"archiv_mb={total_bytes / 1e6:.1f}")
+    return 1 if counts["fehler"] else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="lkw_export", description="LKW Touren: Batch-Export und Tour-Statistik ohne UI")
+    parser.add_argument("--gpx-dir", default=GPX_FOLDER_PATH, help="Ordner mit DL*.gpx Dateien")
+    parser.add_argument("--lang", default="Deutsch", choices=sorted(TRANSLATIONS), help="Sprache für Spalten und Datumsformat")
+    parser.add_argument("--cache", default=PARSE_CACHE_PATH, help="SQLite Parse-Cache")
+    parser.add_argument("--no-cache", action="store_true", help="Parse-Cache nicht benutzen")
+    parser.add_argument("--archive-dir", default=TRACK_ARCHIVE_FOLDER,
+                        help="Ordner für das Track-Archiv *.lkwtrk (Standard: neben den GPX-Dateien)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="Standzeiten-CSV für alle Touren schreiben")
+    p_export.add_argument("--export-dir", default=EXPORT_FOLDER_PATH)
+    p_export.add_argument("--csv-dir", default=CSV_FOLDER_PATH, help="Ordner mit KND.STM")
+    p_export.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    p_export.add_argument("--force", action="store_true", help="Auch Touren mit aktueller CSV neu exportieren")
+    p_export.add_argument("--consolidate", choices=["day", "month"], default=None,
+                          help="Zusätzlich alle Stopps in einer Datei je Tag bzw. Monat (exportiert alle Touren)")
+    p_export.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Format der Sammeldateien")
+    p_export.add_argument("-v", "--verbose", action="store_true")
+    p_export.set_defaults(func=cmd_export)
+
+    p_stats = sub.add_parser("stats", help="Start, Ende, Distanz, Ø-Geschwindigkeit und Stopps je Tour ausgeben")
+    p_stats.add_argument("files", nargs="*", help="GPX-Dateien (Standard: alle DL*.gpx im GPX-Ordner)")
+    p_stats.add_argument("--json", action="store_true")
+    p_stats.set_defaults(func=cmd_stats)
+
+    p_ingest = sub.add_parser("ingest", help="Touren (Kennzahlen und Stopps) ins Touren-Archiv übernehmen")
+    p_ingest.add_argument("files", nargs="*", help="GPX-Dateien (Standard: alle DL*.gpx im GPX-Ordner)")
+    p_ingest.add_argument("--archive", default=ANALYTICS_DB_PATH, help="SQLite Touren-Archiv")
+    p_ingest.add_argument("--force", action="store_true", help="Auch unveränderte Dateien neu einlesen")
+    p_ingest.set_defaults(func=cmd_ingest)
+
+    p_dwell = sub.add_parser("dwell", help="Ø Standzeit je Kunde aus dem Touren-Archiv")
+    p_dwell.add_argument("--archive", default=ANALYTICS_DB_PATH, help="SQLite Touren-Archiv")
+    p_dwell.add_argument("--days", type=int, default=90, help="Zeitraum in Tagen (Standard: 90)")
+    p_dwell.add_argument("--csv-dir", default=CSV_FOLDER_PATH, help="Ordner mit KND.STM (für Kundennamen)")
+    p_dwell.add_argument("--json", action="store_true")
+    p_dwell.set_defaults(func=cmd_dwell)
+
+    p_verify = sub.add_parser("verify", help="CLIENT-Stopps im Archiv gegen die Kundenstandorte prüfen")
+    p_verify.add_argument("--archive", default=ANALYTICS_DB_PATH, help="SQLite Touren-Archiv")
+    p_verify.add_argument("--csv-dir", default=CSV_FOLDER_PATH, help="Ordner mit KND_GEO.csv")
+    p_verify.add_argument("--radius", type=float, default=200.0, help="Max. Abstand zum Kundenstandort in m")
+    p_verify.add_argument("--since", default=None, help="Nur Touren ab Datum (YYYY-MM-DD)")
+    p_verify.add_argument("--all", action="store_true", help="Auch unauffällige Stopps ausgeben")
+    p_verify.add_argument("--json", action="store_true")
+    p_verify.set_defaults(func=cmd_verify)
+
+    p_windows = sub.add_parser("windows", help="CLIENT-Stopps im Archiv gegen die Lieferfenster aus KND.STM prüfen")
+    p_windows.add_argument("--archive", default=ANALYTICS_DB_PATH, help="SQLite Touren-Archiv")
+    p_windows.add_argument("--csv-dir", default=CSV_FOLDER_PATH, help="Ordner mit KND.STM")
+    p_windows.add_argument("--since", default=None, help="Nur Touren ab Datum (YYYY-MM-DD)")
+    p_windows.add_argument("--until", default=None, help="Nur Touren bis Datum (YYYY-MM-DD, inklusive)")
+    p_windows.add_argument("--by", choices=["tour", "tour_nr", "customer", "stop"], default="tour_nr",
+                           help="Zusammenfassung je Tour (Tag), Tournummer, Kunde oder Liste der Stopps außerhalb")
+    p_windows.add_argument("--tolerance", type=int, default=0, help="Toleranz in Minuten vor/nach dem Fenster")
+    p_windows.add_argument("--json", action="store_true")
+    p_windows.set_defaults(func=cmd_windows)
+
+    p_geojson = sub.add_parser("geojson", help="Alle Touren eines Tages als GeoJSON (Linien und Stopps)")
+    p_geojson.add_argument("--date", default=None, help="Tag (YYYY-MM-DD, Standard: jüngster Tag)")
+    p_geojson.add_argument("--tolerance", type=float, default=15.0, help="Vereinfachung der Tracks in m")
+    p_geojson.add_argument("--out", default=None, help="Zieldatei (Standard: stdout)")
+    p_geojson.add_argument("--html", default=None, help="Zusätzlich Flotten-Karte als HTML schreiben")
+    p_geojson.set_defaults(func=cmd_geojson)
+
+    p_convert = sub.add_parser("convert", help="GPX-Dateien ins binäre Track-Archiv (*.lkwtrk) übernehmen")
+    p_convert.add_argument("files", nargs="*", help="GPX-Dateien (Standard: alle DL*.gpx im GPX-Ordner)")
+    p_convert.add_argument("--force", action="store_true", help="Auch aktuelle Archivdateien neu schreiben")
+    p_convert.add_argument("-v", "--verbose", action="store_true")
+    p_convert.set_defaults(func=cmd_convert)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+# --- SPEICHERBEGRENZTER LRU-CACHE ---
+# Thread-sicher, da Streamlit-Sessions in eigenen Threads laufen. Die Größe eines Eintrags
+# liefert sizeof(value); überschreitet die Summe max_bytes, fliegen die ältesten Einträge raus.
+import threading
+from collections import OrderedDict
+
+
+class ByteLRU:
+    def __init__(self, max_bytes, sizeof=len):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            if size > self.max_bytes:
+                return  # passt nie hinein -> nicht cachen
+            self._data[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.nbytes -= evicted
+
+    def pop(self, key):
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is not None:
+                self.nbytes -= item[1]
+            return item[0] if item is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
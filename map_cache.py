@@ -0,0 +1,33 @@
+# --- CACHE FÜR GERENDERTES KARTEN-HTML ---
+# Prozessweit: Reruns, die nur Tabelle/Buttons betreffen, nutzen das fertige HTML wieder.
+# Schlüssel: (Tour-Kennung, ausgewählter Kunde, Sprache, Vereinfachungsstufe)
+# Eigenes Modul ohne folium: bei einem Cache-Treffer wird map_render (und damit folium) gar nicht
+# erst importiert; build() importiert es erst beim Cache-Miss.
+import threading
+
+from lru import ByteLRU
+from timing import stage
+
+_html_cache = None
+_html_cache_lock = threading.Lock()
+
+
+def get_map_html_cache(max_bytes):
+    global _html_cache
+    with _html_cache_lock:
+        if _html_cache is None:
+            _html_cache = ByteLRU(max_bytes)
+        return _html_cache
+
+
+def render_tour_map_html(cache_key, max_bytes, build):
+    # build() liefert die folium-Karte; wird nur bei Cache-Miss aufgerufen
+    cache = get_map_html_cache(max_bytes)
+    html = cache.get(cache_key)
+    if html is None:
+        with stage("map_build"):
+            m = build()
+        with stage("map_render"):
+            html = m.get_root().render()
+        cache.put(cache_key, html)
+    return html
@@ -0,0 +1,201 @@
+# --- KARTEN-AUFBAU (folium) ---
+# Baut die Tour-Karte aus Track und Stopps. Der Track wird vorher vereinfacht (Douglas-Peucker)
+# und die Koordinaten gerundet, damit das HTML auch bei langen Touren klein bleibt.
+# Optional mehrere Auflösungen je Zoomstufe (grob beim Herauszoomen, fein beim Hineinzoomen).
+import math
+
+import folium
+import numpy as np
+from branca.element import MacroElement
+from jinja2 import Template
+
+from simplify import build_levels, cached_simplify, simplify_track
+from track import TIME_DTYPE, to_epoch_us
+
+COORD_DECIMALS = 5  # ~1 m Genauigkeit, spart gut ein Drittel der Zeichen pro Koordinate
+
+
+class ZoomLevelSwitch(MacroElement):
+    # Zeigt je nach Zoomstufe nur die passende Auflösung des Tracks an
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var map = {{ this._parent.get_name() }};
+            var levels = [{% for min_zoom, layer in this.levels %}[{{ min_zoom }}, {{ layer.get_name() }}]{{ "," if not loop.last }}{% endfor %}];
+            function updateLevel() {
+                var zoom = map.getZoom(), active = levels[0];
+                levels.forEach(function(l) { if (zoom >= l[0]) { active = l; } });
+                levels.forEach(function(l) {
+                    if (l === active) { if (!map.hasLayer(l[1])) { map.addLayer(l[1]); } }
+                    else if (map.hasLayer(l[1])) { map.removeLayer(l[1]); }
+                });
+            }
+            map.on('zoomend', updateLevel);
+            updateLevel();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, levels):
+        super().__init__()
+        self._name = "ZoomLevelSwitch"
+        self.levels = levels
+
+
+def track_locations(track):
+    return np.round(track.latlon(), COORD_DECIMALS)
+
+
+def add_track_line(m, track, tolerance_m=0.0, lod_levels=None):
+    # Rote Tour-Linie; mit lod_levels ({min_zoom: toleranz_m}) eine Linie pro Auflösung
+    style = {"color": "red", "weight": 5, "opacity": 0.8}
+    if not lod_levels:
+        folium.PolyLine(track_locations(simplify_track(track, tolerance_m)), **style).add_to(m)
+        return
+    layers = []
+    for min_zoom, level_track in build_levels(track, lod_levels):
+        line = folium.PolyLine(track_locations(level_track), **style)
+        line.add_to(m)
+        layers.append((min_zoom, line))
+    ZoomLevelSwitch(layers).add_to(m)
+
+
+def build_tour_map(track, stops, rows, labels, location, zoom, selected_id=None, tolerance_m=0.0, lod_levels=None):
+    # rows: übersetzte Tabellenzeilen passend zu stops, labels: (c_nr, c_name, c_dur, c_arr, c_dep)
+    c_nr, c_name, c_dur, c_arr, c_dep = labels
+    m = folium.Map(location=location, zoom_start=zoom, double_click_zoom=False)
+    add_track_line(m, track, tolerance_m, lod_levels)
+    for stop, row in zip(stops, rows):
+        is_sel = (stop.display_id == selected_id)
+
+        # Icon Logik: Pause = Kaffee-Tasse, Kunde = User/Stern
+        icon_type = "user"
+        if "PAUSE" in str(stop.display_id).upper():
+            icon_type = "coffee"
+        elif is_sel:
+            icon_type = "star"
+
+        icon_color = "red" if is_sel else "blue"
+        if "PAUSE" in str(stop.display_id).upper():
+            icon_color = "orange"
+
+        name_disp = row[c_name]
+        popup_text = f"<b>{c_nr}: {row[c_nr]}</b>{f'<br>({name_disp})' if name_disp else ''}<br>{c_dur}: {row[c_dur]} min<br>{c_arr}: {row[c_arr]}<br>{c_dep}: {row[c_dep]}"
+        tooltip_text = f"{c_nr}: {row[c_nr]}{f' ({name_disp})' if name_disp else ''}"
+
+        folium.Marker([stop.lat, stop.lon], popup=folium.Popup(popup_text, max_width=300, auto_pan=False), tooltip=tooltip_text, icon=folium.Icon(color=icon_color, icon=icon_type, prefix="fa")).add_to(m)
+    return m
+
+
+# --- FLOTTEN-KARTE: alle Touren eines Tages als eine GeoJSON-Ebene ---
+# Statt einer PolyLine und Markern pro Tour wird eine FeatureCollection gebaut (LineString je Tour,
+# Point je Stopp) und als ein einziger Layer auf Canvas gezeichnet. Die Gesamtzahl der Linienpunkte
+# ist begrenzt: reicht die Grundtoleranz nicht, wird sie schrittweise verdoppelt.
+FLEET_TOLERANCE_M = 15.0
+FLEET_MAX_POINTS = 60000
+FLEET_COLORS = ["#e6194b", "#3cb44b", "#4363d8", "#f58231", "#911eb4", "#42d4f4", "#f032e6", "#bfef45",
+                "#fabed4", "#469990", "#dcbeff", "#9a6324", "#fffac8", "#800000", "#aaffc3", "#808000"]
+
+
+def simplify_to_budget(tracks, keys, tolerance_m=FLEET_TOLERANCE_M, max_points=FLEET_MAX_POINTS):
+    # Vereinfachte Tracks, deren Punktsumme max_points nicht überschreitet; liefert (tracks, toleranz)
+    while True:
+        simplified = [cached_simplify(key, track, tolerance_m) for key, track in zip(keys, tracks)]
+        if sum(len(t) for t in simplified) <= max_points or tolerance_m > 5000:
+            return simplified, tolerance_m
+        tolerance_m *= 2
+
+
+def fleet_feature_collection(tours, keys=None, tolerance_m=FLEET_TOLERANCE_M, max_points=FLEET_MAX_POINTS):
+    # tours: [(tour_nr, analyze_tour-Ergebnis), ...] -> GeoJSON-dict (Koordinaten als [lon, lat])
+    # keys: Tour-Kennungen (z.B. Pfad, mtime, Größe) für den Cache der vereinfachten Tracks
+    keys = keys or [None] * len(tours)
+    tracks, used_tolerance = simplify_to_budget([data["track"] for _, data in tours], keys, tolerance_m, max_points)
+    features = []
+    for k, ((tour_nr, data), track) in enumerate(zip(tours, tracks)):
+        color = FLEET_COLORS[k % len(FLEET_COLORS)]
+        if len(track) >= 2:
+            coords = np.round(np.column_stack((track.lon, track.lat)), COORD_DECIMALS).tolist()
+            features.append({"type": "Feature",
+                             "geometry": {"type": "LineString", "coordinates": coords},
+                             "properties": {"tour": tour_nr, "label": f"Tour {tour_nr} ({data['dist_km']:.1f} km)",
+                                            "color": color, "kind": "track"}})
+        for stop in data["customer_stops"]:
+            features.append({"type": "Feature",
+                             "geometry": {"type": "Point", "coordinates": [round(stop.lon, COORD_DECIMALS), round(stop.lat, COORD_DECIMALS)]},
+                             "properties": {"tour": tour_nr, "label": f"Tour {tour_nr}: {stop.display_id} ({stop.duration_min} min)",
+                                            "color": color, "kind": "stop"}})
+    return {"type": "FeatureCollection", "features": features,
+            "properties": {"tolerance_m": used_tolerance, "tours": len(tours)}}
+
+
+def _fleet_style(feature):
+    props = feature["properties"]
+    if props["kind"] == "stop":
+        return {"color": props["color"], "fillColor": props["color"], "fillOpacity": 0.9, "weight": 1}
+    return {"color": props["color"], "weight": 3, "opacity": 0.8}
+
+
+def build_fleet_map(collection, location=None, zoom=10):
+    m = folium.Map(location=location, zoom_start=zoom, prefer_canvas=True, double_click_zoom=False)
+    folium.GeoJson(collection, name="fleet", style_function=_fleet_style,
+                   marker=folium.CircleMarker(radius=4),
+                   tooltip=folium.GeoJsonTooltip(fields=["label"], labels=False)).add_to(m)
+    if location is None and collection["features"]:
+        lons, lats = zip(*_all_coordinates(collection))
+        m.fit_bounds([[min(lats), min(lons)], [max(lats), max(lons)]])
+    return m
+
+
+def _all_coordinates(collection):
+    for feature in collection["features"]:
+        geometry = feature["geometry"]
+        if geometry["type"] == "Point":
+            yield geometry["coordinates"]
+        else:
+            yield from geometry["coordinates"]
+
+
+# --- WIEDERGABE: Fahrt in einem Zeitfenster als Animation (TimestampedGeoJson) ---
+# Nicht jeder Trackpunkt wird animiert: die Position wird in gleichen Zeitschritten interpoliert
+# (höchstens REPLAY_MAX_FRAMES Bilder, auch bei 100k Punkten). Die Karte enthält nur das Zeitfenster,
+# die Tour-Karte bleibt unverändert im HTML-Cache.
+REPLAY_MAX_FRAMES = 600
+REPLAY_MIN_STEP_S = 5
+
+
+def replay_step_s(start, end, max_frames=REPLAY_MAX_FRAMES):
+    return max(REPLAY_MIN_STEP_S, math.ceil((end - start).total_seconds() / max_frames))
+
+
+def replay_feature_collection(track, start, end, max_frames=REPLAY_MAX_FRAMES):
+    # Liefert (GeoJSON-dict mit einer LineString-Fahrt samt "times", Zeitschritt in s)
+    step_s = replay_step_s(start, end, max_frames)
+    times = np.arange(to_epoch_us(start), to_epoch_us(end) + 1, step_s * 1_000_000, dtype=np.int64).view(TIME_DTYPE)
+    lat, lon = track.positions_at(times)
+    valid = ~np.isnan(lat)
+    coords = np.round(np.column_stack((lon[valid], lat[valid])), COORD_DECIMALS).tolist()
+    iso_times = [f"{t}Z" for t in times[valid].astype("datetime64[s]")]
+    feature = {"type": "Feature",
+               "geometry": {"type": "LineString", "coordinates": coords},
+               "properties": {"times": iso_times, "style": {"color": "red", "weight": 5, "opacity": 0.8}}}
+    return {"type": "FeatureCollection", "features": [feature] if len(coords) >= 2 else []}, step_s
+
+
+def build_replay_map(track, start, end, stops=()):
+    # Animierte Fahrt zwischen start und end (UTC-datetimes); stops: Stopp-Records im Zeitfenster
+    from folium.plugins import TimestampedGeoJson
+
+    collection, step_s = replay_feature_collection(track, start, end)
+    m = folium.Map(zoom_start=13, double_click_zoom=False)
+    if collection["features"]:
+        coords = collection["features"][0]["geometry"]["coordinates"]
+        folium.PolyLine([[lat, lon] for lon, lat in coords], color="gray", weight=3, opacity=0.5).add_to(m)
+        TimestampedGeoJson(collection, period=f"PT{step_s}S", transition_time=100, auto_play=False, loop=False,
+                           date_options="HH:mm:ss", time_slider_drag_update=True).add_to(m)
+        lons, lats = zip(*coords)
+        m.fit_bounds([[min(lats), min(lons)], [max(lats), max(lons)]])
+    for stop in stops:
+        folium.CircleMarker([stop.lat, stop.lon], radius=6, color="blue", fill=True, fill_opacity=0.8,
+                            tooltip=str(stop.display_id)).add_to(m)
+    return m
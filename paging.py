@@ -0,0 +1,28 @@
+# --- SEITENWEISER ZUGRIFF AUF TABELLEN ---
+# Tabellen mit tausenden Stopps oder zehntausenden Dateien werden nicht mehr komplett in Zeilen,
+# DataFrame und Styler umgewandelt und zum Browser geschickt: aus der kompakten Quelle
+# (Stopp-Records der Tour, Snapshot des Datei-Index) wird nur die angezeigte Seite geschnitten
+# und erst dann übersetzt/formatiert.
+import math
+from collections import namedtuple
+
+# rows: Zeilen der Seite, number: Seitenindex (ab 0), count: Anzahl Seiten,
+# start: Index der ersten Zeile in der Quelle, total: Zeilen insgesamt
+Page = namedtuple("Page", ["rows", "number", "count", "start", "total"])
+
+
+def page_count(total, per_page):
+    return max(1, math.ceil(total / per_page))
+
+
+def clamp_page(number, total, per_page):
+    # Ungültige Seitennummern (z.B. nach Wechsel auf eine kürzere Tour) auf den gültigen Bereich ziehen
+    return min(max(int(number or 0), 0), page_count(total, per_page) - 1)
+
+
+def get_page(items, number, per_page, to_rows=list):
+    # items: Sequenz mit Slicing (Liste, Tupel); to_rows wandelt nur den Ausschnitt in Tabellenzeilen
+    total = len(items)
+    number = clamp_page(number, total, per_page)
+    start = number * per_page
+    return Page(to_rows(items[start:start + per_page]), number, page_count(total, per_page), start, total)
@@ -0,0 +1,123 @@
+# --- PERSISTENTER PARSE-CACHE ---
+# Speichert das sprachneutrale Ergebnis von gpx_stream.parse_gpx in einer SQLite-Datei.
+# Schlüssel: Dateipfad + mtime + Größe. Ändert sich die GPX-Datei, ist der Eintrag ungültig.
+# Der Cache ist größenbegrenzt, bei Überlauf werden die am längsten nicht genutzten Touren entfernt (LRU).
+import io
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+
+import numpy as np
+
+from gpx_stream import parse_gpx, parse_time
+from track import Track
+
+# Bei Änderungen am Format des Parse-Ergebnisses erhöhen -> alte Einträge werden ignoriert
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def dump_parsed(parsed):
+    # Parse-Ergebnis -> (Track als .npz Bytes, Wegpunkte als JSON)
+    track = parsed["track"]
+    buf = io.BytesIO()
+    np.savez(buf, lat=track.lat, lon=track.lon, ele=track.ele,
+             time=track.time.view(np.int64), segment_starts=track.segment_starts)
+    waypoints = [[w["time"].isoformat() if w["time"] else None, w["name"], w["lat"], w["lon"]]
+                 for w in parsed["waypoints"]]
+    meta = {"has_track": parsed["has_track"], "waypoints": waypoints}
+    return buf.getvalue(), json.dumps(meta, ensure_ascii=False)
+
+
+def load_parsed(payload, meta_json):
+    with np.load(io.BytesIO(payload), allow_pickle=False) as npz:
+        track = Track(npz["lat"], npz["lon"], npz["ele"], npz["time"].view("datetime64[us]"), npz["segment_starts"])
+    meta = json.loads(meta_json)
+    waypoints = [{"time": parse_time(t), "name": name, "lat": lat, "lon": lon}
+                 for t, name, lat, lon in meta["waypoints"]]
+    return {"track": track, "has_track": meta["has_track"], "waypoints": waypoints}
+
+
+class ParseCache:
+    def __init__(self, db_path, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        with self._connect() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    version INTEGER NOT NULL,
+                    payload BLOB NOT NULL,
+                    meta TEXT NOT NULL,
+                    nbytes INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )""")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_access ON parse_cache (last_access)")
+
+    @contextmanager
+    def _connect(self):
+        # Eine Verbindung pro Aufruf: Streamlit-Sessions laufen in eigenen Threads.
+        # Commit/Rollback wie bei "with sqlite3.connect()", danach wird die Verbindung geschlossen.
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as con, con:
+            yield con
+
+    @staticmethod
+    def _key(path):
+        st_res = os.stat(path)
+        return os.path.abspath(path), st_res.st_mtime_ns, st_res.st_size
+
+    def get(self, path):
+        try:
+            key, mtime_ns, size = self._key(path)
+            with self._connect() as con:
+                row = con.execute(
+                    "SELECT payload, meta FROM parse_cache WHERE path=? AND mtime_ns=? AND size=? AND version=?",
+                    (key, mtime_ns, size, CACHE_VERSION)).fetchone()
+                if row is None:
+                    return None
+                con.execute("UPDATE parse_cache SET last_access=? WHERE path=?", (time.time(), key))
+            return load_parsed(row[0], row[1])
+        except (OSError, sqlite3.Error, ValueError, KeyError) as e:
+            print(f"Parse-Cache Lesefehler für {path}: {e}")
+            return None
+
+    def put(self, path, parsed, stat_key=None):
+        try:
+            key, mtime_ns, size = stat_key or self._key(path)
+            payload, meta = dump_parsed(parsed)
+            nbytes = len(payload) + len(meta)
+            with self._connect() as con:
+                if nbytes > self.max_bytes:
+                    # Passt nie hinein (wie lru.ByteLRU.put): nicht cachen, nur die alte Version entfernen
+                    con.execute("DELETE FROM parse_cache WHERE path=?", (key,))
+                    return
+                con.execute("INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (key, mtime_ns, size, CACHE_VERSION, payload, meta, nbytes, time.time()))
+                self._evict(con)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Parse-Cache Schreibfehler für {path}: {e}")
+
+    def _evict(self, con):
+        total = con.execute("SELECT COALESCE(SUM(nbytes), 0) FROM parse_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, nbytes in con.execute("SELECT path, nbytes FROM parse_cache ORDER BY last_access").fetchall():
+            con.execute("DELETE FROM parse_cache WHERE path=?", (key,))
+            total -= nbytes
+            if total <= self.max_bytes:
+                break
+
+    def get_or_parse(self, path):
+        parsed = self.get(path)
+        if parsed is not None:
+            return parsed
+        # Stat vor dem Parsen merken: ändert sich die Datei währenddessen, verfällt der Eintrag
+        stat_key = self._key(path)
+        with open(path, 'rb') as f:
+            parsed = parse_gpx(f)
+        self.put(path, parsed, stat_key)
+        return parsed
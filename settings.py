@@ -0,0 +1,27 @@
+# --- PFADE KONFIGURATION ---
+# Gemeinsame Einstellungen für die Streamlit-App (app.py) und den Kommandozeilen-Export (lkw_export.py)
+import os
+
+# 1. Pfad zu den GPX Touren-Dateien (Lesen)
+GPX_FOLDER_PATH = "."
+
+# 2. Pfad zur CSV Kunden-Datenbank (Lesen)
+CSV_FOLDER_PATH = "."
+
+# 3. Pfad für den EXPORT der CSV-Dateien (Schreiben)
+EXPORT_FOLDER_PATH = "."
+
+# 4. Datei für den Parse-Cache (SQLite, wird automatisch angelegt)
+PARSE_CACHE_PATH = os.path.join(GPX_FOLDER_PATH, ".lkw_parse_cache.sqlite")
+PARSE_CACHE_MAX_MB = 256
+
+# 5. Touren-Archiv für Flotten-Auswertungen (SQLite, wird automatisch angelegt)
+ANALYTICS_DB_PATH = os.path.join(EXPORT_FOLDER_PATH, "lkw_touren_archiv.sqlite")
+
+# 6. Laufzeit-Messung (optional): JSON-Zeile je Rerun und/oder Prometheus-Endpunkt auf 127.0.0.1
+TIMING_LOG_PATH = None      # z.B. os.path.join(EXPORT_FOLDER_PATH, "lkw_timing.jsonl")
+METRICS_PORT = None         # z.B. 9464 -> http://127.0.0.1:9464/metrics
+SHOW_TIMING_PANEL = False   # Laufzeit-Panel immer anzeigen (sonst nur mit ?debug=1 in der URL)
+
+# 7. Binäres Track-Archiv (*.lkwtrk, memory-mapped, erzeugt mit "python -m lkw_export convert")
+TRACK_ARCHIVE_FOLDER = None  # None = neben den GPX-Dateien
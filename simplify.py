@@ -0,0 +1,75 @@
+# --- TRACK-VEREINFACHUNG (Douglas-Peucker) ---
+# Reduziert die Trackpunkte vor dem Kartenbau auf die Punkte, die bei gegebener Toleranz
+# (Meter) sichtbar etwas zur Linie beitragen. Lange Touren schrumpfen so von tausenden auf
+# wenige hundert Punkte, das HTML der Karte entsprechend.
+import numpy as np
+
+from lru import ByteLRU
+from track import ONE_DEGREE
+
+SIMPLIFIED_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def _project(lat, lon):
+    # Lokale Projektion in Meter (equirectangular um die mittlere Breite)
+    coef = np.cos(np.radians(np.mean(lat))) if len(lat) else 1.0
+    return lon * coef * ONE_DEGREE, lat * ONE_DEGREE
+
+
+def douglas_peucker(lat, lon, tolerance_m):
+    # Liefert die Indizes der behaltenen Punkte (erster und letzter Punkt immer dabei)
+    n = len(lat)
+    if n <= 2 or tolerance_m <= 0:
+        return np.arange(n)
+
+    x, y = _project(np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        # Abstand aller Zwischenpunkte zur Strecke start-end (vektorisiert)
+        dx, dy = x[end] - x[start], y[end] - y[start]
+        px, py = x[start + 1:end] - x[start], y[start + 1:end] - y[start]
+        seg_len2 = dx * dx + dy * dy
+        if seg_len2 > 0:
+            t = np.clip((px * dx + py * dy) / seg_len2, 0.0, 1.0)
+            dist = np.hypot(px - t * dx, py - t * dy)
+        else:
+            # Start = Ende (Rundtour zum Depot): Abstand zum Punkt
+            dist = np.hypot(px, py)
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance_m:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return np.flatnonzero(keep)
+
+
+def simplify_track(track, tolerance_m):
+    if tolerance_m <= 0:
+        return track
+    return track.take(douglas_peucker(track.lat, track.lon, tolerance_m))
+
+
+# Prozessweiter Cache vereinfachter Tracks, Schlüssel (Tour-Kennung, Toleranz);
+# die Flotten-Karte baut so bei jedem Aufruf nur neue oder geänderte Touren neu auf
+_simplified = ByteLRU(SIMPLIFIED_CACHE_BYTES, sizeof=lambda track: track.nbytes)
+
+
+def cached_simplify(key, track, tolerance_m):
+    if key is None:
+        return simplify_track(track, tolerance_m)
+    simplified = _simplified.get((key, tolerance_m))
+    if simplified is None:
+        simplified = simplify_track(track, tolerance_m)
+        _simplified.put((key, tolerance_m), simplified)
+    return simplified
+
+
+def build_levels(track, levels):
+    # Mehrere Auflösungen: {min_zoom: toleranz_m} -> [(min_zoom, vereinfachter Track)], aufsteigend nach Zoom
+    return [(min_zoom, simplify_track(track, tolerance)) for min_zoom, tolerance in sorted(levels.items())]
@@ -0,0 +1,76 @@
+# --- AUTOMATISCHE STOPP-ERKENNUNG AUS TRACKPUNKTEN ---
+# Für Touren ohne CLIENT_BEGIN/END-Wegpunkte (ältere Dateien, vergessener Knopfdruck).
+# Pro Punkt wird die Luftlinien-Geschwindigkeit über ein Zeitfenster berechnet (GPS-Zittern im
+# Stand hebt sich dabei auf); zusammenhängende langsame Abschnitte werden zu Stopps gruppiert,
+# nahe beieinander liegende Stopps mit kurzer Unterbrechung zusammengefasst. Alles vektorisiert.
+import numpy as np
+
+from track import haversine
+
+WINDOW_S = 60           # Zeitfenster für die Geschwindigkeit
+MAX_SPEED_KMH = 3.0     # darunter gilt der LKW im Fenster als stehend
+MIN_DWELL_S = 180       # kürzere Halte (Ampel, Stau) sind keine Stopps
+MERGE_GAP_S = 120       # Halte mit kürzerer Unterbrechung ...
+MERGE_RADIUS_M = 100    # ... und Mittelpunkten näher als das werden zusammengefasst
+SNAP_RADIUS_M = 150     # maximale Entfernung zum Kunden beim Zuordnen (über geo_index)
+
+
+def detect_stops(track, window_s=WINDOW_S, max_speed_kmh=MAX_SPEED_KMH, min_dwell_s=MIN_DWELL_S,
+                 merge_gap_s=MERGE_GAP_S, merge_radius_m=MERGE_RADIUS_M):
+    # Liefert (arrival_us, departure_us, lat, lon) als NumPy-Arrays, ein Eintrag je erkanntem Stopp
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+    valid = ~np.isnat(track.time)
+    if valid.sum() < 2:
+        return empty
+    lat, lon = track.lat[valid], track.lon[valid]
+    t_us = track.time.view(np.int64)[valid]
+    order = np.argsort(t_us, kind="stable")
+    lat, lon, t_us = lat[order], lon[order], t_us[order]
+    t = (t_us - t_us[0]) / 1e6
+    n = len(t)
+
+    # Fensterende je Punkt: letzter Punkt innerhalb window_s, mindestens der nächste Punkt
+    # (Lücken im Logger während langer Standzeiten werden so über Anfang/Ende bewertet)
+    j = np.maximum(np.searchsorted(t, t + window_s, side="right") - 1, np.arange(n) + 1)
+    j = np.minimum(j, n - 1)
+    i = np.arange(n)
+    seconds = t[j] - t[i]
+    displacement = haversine(lat[i], lon[i], lat[j], lon[j])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speed_kmh = np.where(seconds > 0, displacement / seconds * 3.6, 0.0)
+    slow = (speed_kmh < max_speed_kmh) & (j > i)
+    if not slow.any():
+        return empty
+
+    # Zusammenhängende langsame Punkte -> Läufe [start, end] (end inkl.), Lauf deckt t[start]..t[j[end]] ab
+    edges = np.diff(slow.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    run_begin, run_end = t[starts], t[j[ends]]
+    counts = ends - starts + 1
+    # Mittelpunkt je Lauf über kumulierte Summen
+    cum_lat = np.concatenate(([0.0], np.cumsum(lat)))
+    cum_lon = np.concatenate(([0.0], np.cumsum(lon)))
+    run_lat = (cum_lat[ends + 1] - cum_lat[starts]) / counts
+    run_lon = (cum_lon[ends + 1] - cum_lon[starts]) / counts
+
+    # Benachbarte Läufe zusammenfassen (kurze Unterbrechung, gleicher Ort)
+    gap = run_begin[1:] - run_end[:-1]
+    near = haversine(run_lat[1:], run_lon[1:], run_lat[:-1], run_lon[:-1]) <= merge_radius_m
+    new_group = np.concatenate(([True], ~((gap <= merge_gap_s) & near)))
+    group_starts = np.flatnonzero(new_group)
+    group_ends = np.concatenate((group_starts[1:], [len(starts)])) - 1
+
+    arrival = run_begin[group_starts]
+    departure = run_end[group_ends]
+    weights = np.add.reduceat(counts, group_starts)
+    stop_lat = np.add.reduceat(run_lat * counts, group_starts) / weights
+    stop_lon = np.add.reduceat(run_lon * counts, group_starts) / weights
+
+    keep = (departure - arrival) >= min_dwell_s
+
+    def to_us(seconds):
+        return t_us[0] + np.round(seconds[keep] * 1e6).astype(np.int64)
+
+    return to_us(arrival), to_us(departure), stop_lat[keep], stop_lon[keep]
+
@@ -0,0 +1,27 @@
+# --- TESTS: KUNDEN-DATENBANK (Lieferfenster-Uhrzeiten) ---
+# Aufruf aus dem Projektordner:
+#   python -m pytest -q tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from customer_db import parse_hhmm
+
+
+def test_parse_hhmm_valid():
+    assert parse_hhmm("0000") == 0
+    assert parse_hhmm("0830") == 510
+    assert parse_hhmm(" 2359 ") == 1439
+
+
+def test_parse_hhmm_end_of_day():
+    # "2400" steht in KND.STM für das Tagesende, andere Minuten nach 24 Uhr gibt es nicht
+    assert parse_hhmm("2400") == 1440
+    assert parse_hhmm("2430") is None
+    assert parse_hhmm("2401") is None
+
+
+def test_parse_hhmm_invalid():
+    for value in ("", None, "830", "08:30", "2500", "0860", "ab12"):
+        assert parse_hhmm(value) is None
@@ -0,0 +1,63 @@
+# --- TESTS: LIEFERFENSTER-PRÜFUNG ---
+# Aufruf aus dem Projektordner:
+#   python -m pytest -q tests
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from customer_db import CUSTOMER_COLUMNS, CustomerIndex
+from delivery_windows import WINDOW_EARLY, WINDOW_LATE, WINDOW_NONE, WINDOW_OK, check_delivery_windows
+from tour_model import TIME_OFFSET
+
+
+def customer_index(*windows):
+    # Kunde "1" mit den angegebenen Fenstern [("0800", "1200"), ...]
+    columns = {col: [""] for col in CUSTOMER_COLUMNS}
+    columns["NUMBER"], columns["NAME"] = ["1"], ["Kunde"]
+    for k, (begin, end) in enumerate(windows, start=1):
+        columns[f"DLVRTIMEB{k}"], columns[f"DLVRTIMEE{k}"] = [begin], [end]
+    return CustomerIndex(columns)
+
+
+def arrival(hour, minute=0):
+    # Lokale Uhrzeit -> Unix-Sekunden (UTC)
+    local = datetime(2026, 1, 14, hour, minute, tzinfo=timezone.utc)
+    return int((local - TIME_OFFSET).timestamp())
+
+
+def check(index, hour, minute=0, tolerance_min=0, customer="1"):
+    status, deviation = check_delivery_windows([customer], [arrival(hour, minute)], index, tolerance_min)
+    return str(status[0]), int(deviation[0])
+
+
+def test_inside_and_outside_window():
+    index = customer_index(("0800", "1200"))
+    assert check(index, 10) == (WINDOW_OK, 0)
+    assert check(index, 7, 30) == (WINDOW_EARLY, 30)
+    assert check(index, 12, 45) == (WINDOW_LATE, 45)
+    assert check(index, 12, 45, tolerance_min=60) == (WINDOW_OK, 0)
+
+
+def test_second_window_and_unknown_customer():
+    index = customer_index(("0800", "1000"), ("1400", "1600"))
+    assert check(index, 15) == (WINDOW_OK, 0)
+    assert check(index, 13) == (WINDOW_EARLY, 60)
+    assert check(index, 10, customer="2") == (WINDOW_NONE, 0)
+
+
+def test_window_over_midnight():
+    index = customer_index(("2200", "0200"))
+    assert check(index, 1) == (WINDOW_OK, 0)
+    assert check(index, 3) == (WINDOW_LATE, 60)
+
+
+def test_all_day_window_with_tolerance():
+    # 0000-2400 plus Toleranz darf nicht über den Tag hinaus laufen
+    assert check(customer_index(("0000", "2400")), 10, tolerance_min=5) == (WINDOW_OK, 0)
+
+
+def test_tolerance_covering_whole_day():
+    # 0600-1800 um je 400 min erweitert deckt den ganzen Tag ab
+    assert check(customer_index(("0600", "1800")), 22, tolerance_min=400) == (WINDOW_OK, 0)
@@ -0,0 +1,70 @@
+# --- TESTS: EVENT-PAARUNG ---
+# Aufruf aus dem Projektordner:
+#   python -m pytest -q tests
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_event_pairing import legacy_pair_events, make_waypoints
+from event_pairing import (ISSUE_DUPLICATE_BEGIN, ISSUE_OVERLAP, ISSUE_UNMATCHED_BEGIN, ISSUE_UNMATCHED_END,
+                           pair_events, parse_events)
+from tour_model import extract_stops
+
+START = datetime(2026, 1, 14, 6, 0, tzinfo=timezone.utc)
+
+
+def waypoints(*names):
+    # Ein Wegpunkt pro Minute in der angegebenen Reihenfolge
+    return [{"time": START + timedelta(minutes=i), "name": name, "lat": 49.0, "lon": 7.0}
+            for i, name in enumerate(names)]
+
+
+def kinds(issues):
+    return [issue.kind for issue in issues]
+
+
+@pytest.mark.parametrize("n_events", [100, 1000, 10000])
+def test_stops_match_previous_algorithm(n_events):
+    wpts = make_waypoints(n_events, seed=n_events)
+    stops, _ = extract_stops(wpts)
+    assert [tuple(s) for s in stops] == legacy_pair_events(wpts)
+
+
+@pytest.mark.parametrize("n_events", [100, 1000, 10000])
+def test_every_event_paired_or_reported(n_events):
+    events = parse_events(make_waypoints(n_events, seed=n_events))
+    pairs, issues = pair_events(events)
+    counts = Counter(kinds(issues))
+    n_begin = sum(1 for e in events if e.state == "BEGIN")
+    # Jedes BEGIN ist gepaart, von einem späteren BEGIN verdrängt oder bleibt offen
+    assert n_begin == len(pairs) + counts[ISSUE_DUPLICATE_BEGIN] + counts[ISSUE_UNMATCHED_BEGIN]
+    # Jedes END ist gepaart oder hat kein offenes BEGIN
+    assert len(events) - n_begin == len(pairs) + counts[ISSUE_UNMATCHED_END]
+    for begin, end in pairs:
+        assert (begin.id or begin.name) == (end.id or end.name) and begin.time <= end.time
+
+
+def test_duplicate_begin_keeps_later():
+    pairs, issues = pair_events(parse_events(waypoints("CLIENT_BEGIN:1(A)", "CLIENT_BEGIN:1(A)", "CLIENT_END:1(A)")))
+    assert kinds(issues) == [ISSUE_DUPLICATE_BEGIN]
+    assert pairs[0][0].time == START + timedelta(minutes=1)
+
+
+def test_unmatched_and_overlap():
+    _, issues = pair_events(parse_events(waypoints("CLIENT_END:1(A)", "CLIENT_BEGIN:2(B)", "PAUSE_BEGIN(Pause)",
+                                                   "PAUSE_END(Pause)")))
+    assert kinds(issues) == [ISSUE_UNMATCHED_END, ISSUE_OVERLAP, ISSUE_UNMATCHED_BEGIN]
+
+
+def test_unsorted_and_mixed_timezones():
+    wpts = waypoints("CLIENT_END:1(A)", "CLIENT_BEGIN:1(A)", "POI")
+    wpts[0]["time"], wpts[1]["time"] = wpts[1]["time"], wpts[0]["time"].replace(tzinfo=None)
+    wpts.append({"time": None, "name": "CLIENT_BEGIN:9(X)", "lat": 0.0, "lon": 0.0})
+    stops, issues = extract_stops(wpts)
+    assert [s.id for s in stops] == ["1"] and not issues
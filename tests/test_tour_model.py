@@ -0,0 +1,32 @@
+# --- TESTS: STANDZEITEN-EXPORT ---
+# Aufruf aus dem Projektordner:
+#   python -m pytest -q tests
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tour_model import AUTO_STOP_TYPE, Stop, export_rows, export_stops
+
+
+def tour(*stops):
+    start = datetime(2026, 1, 14, 6, 0, tzinfo=timezone.utc)
+    return {"start_time": start, "customer_stops": list(stops)}
+
+
+def stop(stop_type, customer_id, minute):
+    arrival = datetime(2026, 1, 14, 8, minute, tzinfo=timezone.utc)
+    return Stop(stop_type, customer_id, "", arrival, arrival + timedelta(minutes=10), 49.0, 7.0)
+
+
+def test_export_skips_auto_stops():
+    # Gleiche CSV, egal ob die Tour mit (App) oder ohne Stopp-Erkennung (Batch, CLI) analysiert wurde
+    recorded = [stop("CLIENT", "0200100", 0), stop("PAUSE", "", 20)]
+    detected = tour(*recorded, stop(AUTO_STOP_TYPE, "", 40))
+    assert export_stops(detected) == recorded
+    assert export_rows(detected, "500", "Deutsch") == export_rows(tour(*recorded), "500", "Deutsch")
+
+
+def test_export_of_auto_only_tour_is_empty():
+    assert export_rows(tour(stop(AUTO_STOP_TYPE, "0200100", 0)), "500", "Deutsch") == []
@@ -0,0 +1,170 @@
+# --- LAUFZEIT-MESSUNG DER HEISSEN PFADE ---
+# stage("name") als Kontextmanager oder @timed("name") als Dekorator. Jede Messung landet
+#  - in der Liste des aktuellen Durchlaufs (pro Thread = pro Streamlit-Rerun, begin_run() leert sie),
+#  - in prozessweiten Histogrammen, abrufbar als Prometheus-Text (Datei oder lokaler HTTP-Endpunkt),
+#  - optional als JSON-Zeile je Durchlauf in einer Logdatei (configure(log_path=...)).
+# Verschachtelte Stufen werden mit ihrer Tiefe gespeichert (z.B. parse innerhalb process_gpx_data).
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BUCKETS_S = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_NAME = "lkw_stage_seconds"
+
+_local = threading.local()
+_totals = {}   # Stufe -> [Anzahl, Summe_s, Max_s, [Zähler je Bucket]]
+_lock = threading.Lock()
+_config = {"log_path": None}
+_servers = {}  # Port -> laufender HTTP-Server
+
+
+def configure(log_path=None):
+    _config["log_path"] = log_path
+
+
+def _current():
+    run = getattr(_local, "run", None)
+    if run is None:
+        run = _local.run = {"label": "", "started": time.time(), "stages": [], "depth": 0}
+    return run
+
+
+def begin_run(label=""):
+    # Neuer Durchlauf im aktuellen Thread (Streamlit: einmal zu Beginn jedes Reruns)
+    _local.run = {"label": label, "started": time.time(), "stages": [], "depth": 0}
+
+
+def run_stages():
+    # [(stufe, sekunden, tiefe), ...] des aktuellen Durchlaufs in Startreihenfolge
+    return [(name, seconds, depth) for name, seconds, depth, _ in sorted(_current()["stages"], key=lambda s: s[3])]
+
+
+def end_run():
+    # Schließt den Durchlauf ab: JSON-Zeile ins Log (falls konfiguriert), liefert die Stufen
+    run = _current()
+    stages = run_stages()
+    path = _config["log_path"]
+    if path and stages:
+        entry = {"ts": round(run["started"], 3), "run": run["label"], "pid": os.getpid(),
+                 "stages": [{"stage": name, "ms": round(seconds * 1000, 3), "depth": depth} for name, seconds, depth in stages]}
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Fehler beim Schreiben des Timing-Logs {path}: {e}")
+    return stages
+
+
+def record(name, seconds, depth=0, order=None):
+    run = _current()
+    run["stages"].append((name, seconds, depth, time.perf_counter() - seconds if order is None else order))
+    with _lock:
+        total = _totals.get(name)
+        if total is None:
+            total = _totals[name] = [0, 0.0, 0.0, [0] * len(BUCKETS_S)]
+        total[0] += 1
+        total[1] += seconds
+        total[2] = max(total[2], seconds)
+        for i, bound in enumerate(BUCKETS_S):
+            if seconds <= bound:
+                total[3][i] += 1
+
+
+@contextmanager
+def stage(name):
+    run = _current()
+    depth = run["depth"]
+    order = time.perf_counter()  # Startzeit als Sortierschlüssel: äußere Stufe vor den inneren
+    run["depth"] = depth + 1
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        run["depth"] = depth
+        record(name, elapsed, depth, order)
+
+
+def timed(name=None):
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- EXPORT: PROMETHEUS-TEXT / JSON ---
+
+def metrics_snapshot():
+    with _lock:
+        return {name: {"count": t[0], "sum_s": t[1], "max_s": t[2], "buckets": list(t[3])} for name, t in _totals.items()}
+
+
+def metrics_text():
+    # Prometheus-Textformat (Histogramm je Stufe, kumulative Buckets)
+    lines = [f"# HELP {METRIC_NAME} Laufzeit der App-Stufen in Sekunden", f"# TYPE {METRIC_NAME} histogram"]
+    for name, t in sorted(metrics_snapshot().items()):
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        for bound, count in zip(BUCKETS_S, t["buckets"]):
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="{bound}"}} {count}')
+        lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="+Inf"}} {t["count"]}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {t["sum_s"]:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {t["count"]}')
+    lines.append(f"# HELP {METRIC_NAME}_max Längste Laufzeit seit Prozessstart")
+    lines.append(f"# TYPE {METRIC_NAME}_max gauge")
+    for name, t in sorted(metrics_snapshot().items()):
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'{METRIC_NAME}_max{{stage="{label}"}} {t["max_s"]:.6f}')
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path):
+    # Für den textfile-Collector des node_exporter: atomar ersetzen
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(metrics_text())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, ctype = metrics_text(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body, ctype = json.dumps(metrics_snapshot(), ensure_ascii=False), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # kein Zugriffslog auf stderr
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    # Prozessweit einmal: http://host:port/metrics (Prometheus) und /metrics.json
+    with _lock:
+        server = _servers.get(port)
+        if server is not None:
+            return server
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            print(f"Fehler beim Starten des Metrik-Endpunkts auf Port {port}: {e}")
+            return None
+        threading.Thread(target=server.serve_forever, name="lkw-metrics", daemon=True).start()
+        _servers[port] = server
+        return server
@@ -0,0 +1,100 @@
+# --- PROZESSWEITER TOUR-CACHE ---
+# Analysierte Touren (tour_model.analyze_tour-Ergebnis) für alle Streamlit-Sessions gemeinsam:
+# öffnen fünf Disponenten dieselbe Tour, wird sie einmal geladen und einmal im Speicher gehalten.
+#  - Schlüssel enthält die Datei-Version (Pfad, mtime, Größe) -> geänderte Dateien werden neu geladen,
+#    die alte Version einer Datei wird beim Einlagern der neuen sofort verworfen.
+#  - Speicherbegrenzt (ByteLRU), älteste Touren fliegen zuerst raus.
+#  - Single-Flight: laden mehrere Sessions gleichzeitig dieselbe Tour, parst nur eine, die anderen warten.
+import threading
+
+from lru import ByteLRU
+
+OVERHEAD_PER_STOP = 400  # grobe Größe eines Stop-Records samt Strings in Bytes
+
+
+def tour_nbytes(data):
+    return (data["track"].nbytes + OVERHEAD_PER_STOP * (len(data["customer_stops"]) + len(data.get("event_issues") or ()))
+            + 1024)
+
+
+class _Flight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TourCache:
+    def __init__(self, max_bytes, sizeof=tour_nbytes):
+        self._lru = ByteLRU(max_bytes, sizeof=sizeof)
+        self._inflight = {}  # Schlüssel -> laufender Ladevorgang
+        self._latest = {}    # Gruppe (z.B. Pfad) -> zuletzt eingelagerter Schlüssel
+        self._lock = threading.Lock()
+        self.loads = 0       # tatsächliche Ladevorgänge
+        self.shared = 0      # Aufrufe, die auf den Ladevorgang einer anderen Session gewartet haben
+
+    def __len__(self):
+        return len(self._lru)
+
+    @property
+    def nbytes(self):
+        return self._lru.nbytes
+
+    def get_or_load(self, key, load, group=None):
+        value = self._lru.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            value = self._lru.get(key)
+            if value is not None:
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.loads += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = load()
+            flight.value = value
+            self._store(key, value, group)
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def _store(self, key, value, group):
+        if group is not None:
+            with self._lock:
+                old = self._latest.get(group)
+                self._latest[group] = key
+            if old is not None and old != key:
+                self._lru.pop(old)  # veraltete Version derselben Datei sofort freigeben
+        self._lru.put(key, value)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_tour_cache(max_bytes):
+    # Ein Cache pro Prozess (je Größe), gemeinsam für alle Sessions
+    with _caches_lock:
+        cache = _caches.get(max_bytes)
+        if cache is None:
+            cache = _caches[max_bytes] = TourCache(max_bytes)
+        return cache
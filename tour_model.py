@@ -0,0 +1,177 @@
+# --- SPRACHNEUTRALES TOUR-MODELL ---
+# Die Analyse liefert typisierte Stopp-Records (UTC-Zeiten, IDs, Position) ohne Übersetzungen
+# oder formatierte Strings. Übersetzt und formatiert wird erst bei Anzeige bzw. Export,
+# dadurch braucht ein Sprachwechsel keine neue Analyse und das Ergebnis ist cachebar.
+from collections import namedtuple
+from datetime import timedelta
+
+from event_pairing import pair_events, parse_events
+from stop_detection import SNAP_RADIUS_M, detect_stops
+from track import from_epoch_us, to_epoch_us
+from translations import TRANSLATIONS
+
+TIME_OFFSET = timedelta(hours=2)  # Zeitzonenkorrektur (GPX-Zeiten sind UTC)
+AUTO_STOP_TYPE = "AUTO"  # aus den Trackpunkten erkannter Stopp (keine Wegpunkte im GPX)
+
+
+class Stop(namedtuple("Stop", ["type", "id", "name", "arrival", "departure", "lat", "lon"])):
+    # type: CLIENT / PAUSE / AUTO, id: Kundennummer (leer bei Pausen), name: Name aus dem GPX,
+    # arrival / departure: datetime (UTC), lat / lon: Position beim BEGIN
+    __slots__ = ()
+
+    @property
+    def display_id(self):
+        # Bei Pause als ID "PAUSE" anzeigen, sonst die Nummer
+        return self.id if self.id else self.type
+
+    @property
+    def duration_min(self):
+        return int((self.departure - self.arrival).total_seconds() / 60)
+
+    def display_name(self, customer_db=None):
+        # Anzeige-Name: Priorität GPX > DB > ID
+        if not self.name and customer_db and self.id in customer_db:
+            return customer_db[self.id]
+        return self.name
+
+
+def extract_stops(waypoints):
+    # Wegpunkte -> (Stopps in der Reihenfolge der END-Events, Auffälligkeiten als EventIssue-Liste)
+    # Format Beispiel: CLIENT_BEGIN:0200140(Laschenskyhof GmbH)
+    pairs, issues = pair_events(parse_events(waypoints))
+    stops = [Stop(begin.type, begin.id, begin.name, begin.time, end.time, begin.lat, begin.lon) for begin, end in pairs]
+    return stops, issues
+
+
+def infer_stops(track, geo_index=None):
+    # Stopps aus den Trackpunkten; geo_index (geo_index.CustomerGeoIndex) ordnet sie bekannten Kunden zu
+    arrival, departure, lat, lon = detect_stops(track)
+    ids = [""] * len(lat)
+    if geo_index is not None:
+        ids, _ = geo_index.nearest(lat, lon, SNAP_RADIUS_M)
+    return [Stop(AUTO_STOP_TYPE, cid, "", from_epoch_us(a), from_epoch_us(d), float(la), float(lo))
+            for cid, a, d, la, lo in zip(ids, arrival, departure, lat, lon)]
+
+
+def analyze_tour(gpx, detect=False, geo_index=None):
+    # Sprachneutrales Tour-Ergebnis aus dem Parse-Ergebnis von gpx_stream.parse_gpx
+    # detect=True: ohne CLIENT/PAUSE-Wegpunkte Stopps aus den Trackpunkten erkennen
+    track = gpx["track"]
+
+    # Bewegungsdaten vektorisiert (gleiche Berechnung wie gpxpy.get_moving_data)
+    dist_km, avg_speed = track.stats() if gpx["has_track"] else (0.0, 0.0)
+    start_time, end_time = track.time_bounds() if gpx["has_track"] else (None, None)
+
+    stops, issues = [], []
+    try:
+        stops, issues = extract_stops(gpx["waypoints"])
+    except Exception as e:
+        print(f"Fehler bei GPX Analyse: {e}")
+
+    if detect and not stops and not issues and gpx["has_track"]:
+        try:
+            stops = infer_stops(track, geo_index)
+        except Exception as e:
+            print(f"Fehler bei Stopp-Erkennung: {e}")
+
+    return {
+        "track": track,
+        "dist_km": dist_km,
+        "avg_speed": avg_speed,
+        "start_time": start_time,
+        "end_time": end_time,
+        "customer_stops": stops,
+        "event_issues": issues
+    }
+
+
+# --- FORMATIERUNG / ÜBERSETZUNG (erst zur Anzeige- bzw. Exportzeit) ---
+
+def format_clock(dt, lang):
+    # Start/Ende der Tour, z.B. "08:15 Uhr"
+    if not dt:
+        return "-"
+    return (dt + TIME_OFFSET).strftime("%H:%M") + TRANSLATIONS[lang]["time_suffix"]
+
+
+def format_date(dt, lang):
+    if not dt:
+        return ""
+    return (dt + TIME_OFFSET).strftime(TRANSLATIONS[lang]["date_format"])
+
+
+def local_date(dt):
+    # Sprachneutrales Tour-Datum (lokal) als 'YYYY-MM-DD', z.B. zum Gruppieren nach Tag
+    return (dt + TIME_OFFSET).strftime("%Y-%m-%d")
+
+
+def format_stop_time(dt):
+    return (dt + TIME_OFFSET).strftime("%H:%M:%S")
+
+
+def stop_rows(stops, lang, customer_db=None):
+    # Stopp-Records -> Tabellenzeilen mit übersetzten Spaltennamen (Tabelle & CSV-Export)
+    t = TRANSLATIONS[lang]
+    col_nr, col_name, col_arr, col_dep, col_dur = t["col_cust_nr"], t["col_name"], t["col_arr"], t["col_dep"], t["col_dur"]
+    return [{
+        col_nr: stop.display_id,
+        col_name: stop.display_name(customer_db) or (t["auto_stop"] if stop.type == AUTO_STOP_TYPE else ""),
+        col_arr: format_stop_time(stop.arrival),
+        col_dep: format_stop_time(stop.departure),
+        col_dur: stop.duration_min
+    } for stop in stops]
+
+
+def event_label(event):
+    # z.B. "CLIENT 0200140 (Laschenskyhof GmbH)" oder "PAUSE (Pause)"
+    label = f"{event.type} {event.id}".strip()
+    return f"{label} ({event.name})" if event.name else label
+
+
+def issue_lines(issues, lang):
+    # Auffällige Events (event_pairing.EventIssue) als übersetzte Textzeilen, chronologisch
+    t = TRANSLATIONS[lang]
+    lines = []
+    for issue in sorted(issues, key=lambda i: to_epoch_us(i.event.time)):
+        text = t["issue_" + issue.kind].format(other=event_label(issue.other) if issue.other else "")
+        lines.append(f"{format_stop_time(issue.event.time)} {event_label(issue.event)}: {text}")
+    return lines
+
+
+def location_lines(stops, checks, lang):
+    # Ergebnis von geo_index.verify_locations -> Textzeilen für Stopps abseits des Kundenstandorts
+    t = TRANSLATIONS[lang]
+    lines = []
+    for stop, (status, dist, nearest_id, nearest_dist) in zip(stops, checks):
+        if status != "far":  # geo_index.GEO_FAR (Import hier nicht möglich: geo_index -> analytics -> tour_model)
+            continue
+        text = t["geo_far"].format(dist=round(dist))
+        if nearest_id:
+            text += t["geo_nearest"].format(id=nearest_id, dist=round(nearest_dist))
+        lines.append(f"{format_stop_time(stop.arrival)} {stop.type} {stop.display_id}: {text}")
+    return lines
+
+
+def window_labels(status, deviation, lang):
+    # Ergebnis von delivery_windows.check_delivery_windows -> Text je Stopp für die Stopp-Tabelle
+    # (Status als Literale: delivery_windows importiert tour_model)
+    t = TRANSLATIONS[lang]
+    texts = {"ok": t["window_ok"], "early": t["window_early"], "late": t["window_late"]}
+    return [texts[s].format(min=int(d)) if s in texts else "" for s, d in zip(status, deviation)]
+
+
+def export_stops(tour):
+    # Exportiert werden nur die im GPX protokollierten Stopps (CLIENT/PAUSE): erkannte AUTO-Stopps
+    # hängen von der Erkennung ab und würden dieselbe Standzeiten-CSV je nach Exportweg verändern
+    return [stop for stop in tour["customer_stops"] if stop.type != AUTO_STOP_TYPE]
+
+
+def export_rows(tour, tour_nr, lang, customer_db=None):
+    # Zeilen für den Standzeiten-Export: TourNr + Datum vor den Stopp-Spalten
+    date_str = format_date(tour["start_time"], lang)
+    return [{"TourNr": tour_nr, "Datum": date_str, **row}
+            for row in stop_rows(export_stops(tour), lang, customer_db)]
+
+
+def export_filename(tour, tour_nr, lang):
+    return f"Standzeiten_{format_date(tour['start_time'], lang)}_{tour_nr}.csv"
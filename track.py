@@ -0,0 +1,190 @@
+# --- SPALTENBASIERTE TRACK-DARSTELLUNG ---
+# Ein Track hält Lat/Lon/Höhe/Zeit als NumPy-Spalten statt als Liste von Tupeln.
+# Distanz, Fahrzeit und Ø-Geschwindigkeit werden vektorisiert in einem Durchlauf berechnet
+# (gleiche Semantik wie gpxpy.get_moving_data, damit die Statistik-Zeile identisch bleibt).
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Gleiche Konstanten wie gpxpy
+EARTH_RADIUS = 6378.137 * 1000
+ONE_DEGREE = (2 * np.pi * EARTH_RADIUS) / 360
+STOPPED_SPEED_THRESHOLD = 1.0  # km/h, darunter gilt der LKW als stehend
+
+# Zeitspalte: Mikrosekunden seit 1970 (UTC), fehlende Zeit = NaT
+TIME_DTYPE = "datetime64[us]"
+NAT_VALUE = np.iinfo(np.int64).min
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_epoch_us(dt):
+    # datetime -> int Mikrosekunden (GPX-Zeiten ohne Zeitzone gelten als UTC)
+    if dt is None:
+        return NAT_VALUE
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_us(value):
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    # Vektorisierte Großkreisdistanz in Metern
+    r_lat1 = np.radians(lat1)
+    r_lat2 = np.radians(lat2)
+    d_lon = np.radians(np.subtract(lon1, lon2))
+    a = np.sin((r_lat1 - r_lat2) / 2) ** 2 + np.sin(d_lon / 2) ** 2 * np.cos(r_lat1) * np.cos(r_lat2)
+    return EARTH_RADIUS * 2 * np.arcsin(np.sqrt(a))
+
+
+class Track:
+    __slots__ = ("lat", "lon", "ele", "time", "segment_starts", "_time_sorted")
+
+    def __init__(self, lat, lon, ele=None, time=None, segment_starts=None):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        n = len(self.lat)
+        # Höhe als float32 (NaN = keine Höhe), reicht für Meter-Genauigkeit
+        self.ele = np.full(n, np.nan, dtype=np.float32) if ele is None else np.asarray(ele, dtype=np.float32)
+        self.time = np.full(n, NAT_VALUE, dtype=np.int64).view(TIME_DTYPE) if time is None else np.asarray(time).astype(TIME_DTYPE, copy=False)
+        # Startindizes der GPX-Segmente; Distanzen werden nie über Segmentgrenzen gerechnet
+        self.segment_starts = np.asarray([0] if segment_starts is None else segment_starts, dtype=np.int64)
+        self._time_sorted = None  # wird bei der ersten Zeitabfrage geprüft (oder vom Track-Archiv gesetzt)
+
+    def __len__(self):
+        return len(self.lat)
+
+    @property
+    def nbytes(self):
+        return self.lat.nbytes + self.lon.nbytes + self.ele.nbytes + self.time.nbytes + self.segment_starts.nbytes
+
+    def latlon(self):
+        # (N, 2) Array für folium.PolyLine
+        return np.column_stack((self.lat, self.lon))
+
+    def take(self, indices):
+        # Teilmenge der Punkte (z.B. nach Vereinfachung); Segmentgrenzen gehen dabei verloren
+        return Track(self.lat[indices], self.lon[indices], self.ele[indices], self.time[indices])
+
+    def point_at(self, index):
+        return [float(self.lat[index]), float(self.lon[index])]
+
+    def point_distances(self):
+        # Abstand Punkt i -> i+1 in Metern, wie gpxpy.geo.distance:
+        # flache Näherung für nahe Punkte, Haversine bei Sprüngen > 0.2°, 3D wenn beide Höhen gesetzt
+        lat1, lat2 = self.lat[1:], self.lat[:-1]
+        lon1, lon2 = self.lon[1:], self.lon[:-1]
+        ele1, ele2 = self.ele[1:].astype(np.float64), self.ele[:-1].astype(np.float64)
+
+        x = lat1 - lat2
+        y = (lon1 - lon2) * np.cos(np.radians(lat1))
+        dist = np.sqrt(x * x + y * y) * ONE_DEGREE
+
+        use_3d = (ele1 != 0) & (ele2 != 0) & ~np.isnan(ele1) & ~np.isnan(ele2) & (ele1 != ele2)
+        dist = np.where(use_3d, np.sqrt(dist ** 2 + np.nan_to_num(ele1 - ele2) ** 2), dist)
+
+        far = (np.abs(x) > .2) | (np.abs(lon1 - lon2) > .2)
+        if far.any():
+            dist[far] = haversine(lat1[far], lon1[far], lat2[far], lon2[far])
+        return dist
+
+    def moving_data(self, stopped_speed_threshold=STOPPED_SPEED_THRESHOLD):
+        # Liefert (moving_distance in m, moving_time in s)
+        if len(self) < 2:
+            return 0.0, 0.0
+
+        has_time = ~np.isnat(self.time)
+        seconds = np.diff(self.time.view(np.int64)) / 1e6
+
+        same_segment = np.ones(len(self) - 1, dtype=bool)
+        boundaries = self.segment_starts[(self.segment_starts > 0) & (self.segment_starts < len(self))]
+        same_segment[boundaries - 1] = False
+
+        valid = same_segment & has_time[1:] & has_time[:-1] & (seconds > 0)
+        dist = self.point_distances()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speed_kmh = (dist / 1000) / (seconds / 3600)
+        moving = valid & (dist > 0) & (speed_kmh > stopped_speed_threshold)
+        return float(dist[moving].sum()), float(seconds[moving].sum())
+
+    def stats(self):
+        # Statistik-Zeile in einem Durchlauf: Distanz in km und Ø-Geschwindigkeit in km/h
+        moving_distance, moving_time = self.moving_data()
+        dist_km = moving_distance / 1000.0
+        avg_speed = dist_km / (moving_time / 3600.0) if moving_time > 0 else 0.0
+        return dist_km, avg_speed
+
+    def time_bounds(self):
+        # Erste und letzte gültige Zeit als UTC-datetime (None wenn der Track keine Zeiten hat)
+        valid = self.time.view(np.int64)[~np.isnat(self.time)]
+        if not len(valid):
+            return None, None
+        return from_epoch_us(valid[0]), from_epoch_us(valid[-1])
+
+    # --- ZEITACHSE: Zeitfenster und Position zu einem Zeitpunkt ---
+    # GPX-Zeiten sind praktisch immer aufsteigend -> Binärsuche auf der Zeitspalte, Zeitfenster sind
+    # Slices ohne Kopie. Tracks mit fehlenden oder unsortierten Zeiten werden dafür einmal sortiert.
+    def time_sorted(self):
+        if self._time_sorted is None:
+            t_us = self.time.view(np.int64)
+            self._time_sorted = bool(len(t_us) and not np.isnat(self.time).any() and (np.diff(t_us) >= 0).all())
+        return self._time_sorted
+
+    def index_range(self, start=None, end=None):
+        # Indizes [i0, i1) der Punkte mit start <= Zeit < end (datetime, None = offen); nur sortierte Zeiten
+        t_us = self.time.view(np.int64)
+        i0 = 0 if start is None else int(np.searchsorted(t_us, to_epoch_us(start), side="left"))
+        i1 = len(t_us) if end is None else int(np.searchsorted(t_us, to_epoch_us(end), side="left"))
+        return i0, max(i0, i1)
+
+    def window(self, start=None, end=None):
+        # Teil-Track im Zeitfenster [start, end); Segmentgrenzen bleiben erhalten
+        if self.time_sorted():
+            i0, i1 = self.index_range(start, end)
+            starts = self.segment_starts
+            inner = starts[(starts > i0) & (starts < i1)] - i0
+            part = Track(self.lat[i0:i1], self.lon[i0:i1], self.ele[i0:i1], self.time[i0:i1], np.concatenate(([0], inner)))
+            part._time_sorted = True
+            return part
+        # Punkte ohne Zeit fallen weg, der Rest wird nach Zeit sortiert (Kopie)
+        t_us = self.time.view(np.int64)
+        keep = ~np.isnat(self.time)
+        if start is not None:
+            keep &= t_us >= to_epoch_us(start)
+        if end is not None:
+            keep &= t_us < to_epoch_us(end)
+        indices = np.flatnonzero(keep)
+        return self.take(indices[np.argsort(t_us[indices], kind="stable")])
+
+    def positions_at(self, times):
+        # Linear interpolierte Positionen zu vielen Zeitpunkten (datetime64 Array) -> (lat, lon) Arrays.
+        # Außerhalb des Tracks NaN; in Lücken zwischen GPX-Segmenten die letzte Position vor der Lücke.
+        track = self if self.time_sorted() else self.window()
+        query = np.asarray(times).astype(TIME_DTYPE).view(np.int64)
+        n = len(track)
+        if not n:
+            return np.full(len(query), np.nan), np.full(len(query), np.nan)
+        t_us = track.time.view(np.int64)
+        after = np.searchsorted(t_us, query, side="right")  # t[after-1] <= Zeitpunkt < t[after]
+        lo = np.clip(after - 1, 0, n - 1)
+        hi = np.clip(after, 0, n - 1)
+        span = (t_us[hi] - t_us[lo]).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(span > 0, (query - t_us[lo]) / span, 0.0)
+        segment = np.searchsorted(track.segment_starts, np.stack((lo, hi)), side="right")
+        frac[segment[0] != segment[1]] = 0.0
+        lat = track.lat[lo] + (track.lat[hi] - track.lat[lo]) * frac
+        lon = track.lon[lo] + (track.lon[hi] - track.lon[lo]) * frac
+        outside = (query < t_us[0]) | (query > t_us[-1])
+        lat[outside] = np.nan
+        lon[outside] = np.nan
+        return lat, lon
+
+    def position_at(self, when):
+        # [lat, lon] zum Zeitpunkt when (datetime) oder None außerhalb des Tracks
+        lat, lon = self.positions_at(np.array([to_epoch_us(when)]).view(TIME_DTYPE))
+        if np.isnan(lat[0]):
+            return None
+        return [float(lat[0]), float(lon[0])]
@@ -0,0 +1,166 @@
+# --- BINÄRES TRACK-ARCHIV (memory-mapped) ---
+# Eine Tour als Binärdatei neben der GPX-Datei (DL12345.gpx -> DL12345.lkwtrk):
+#   8 Byte Kennung, 4 Byte Länge des JSON-Kopfes, JSON-Kopf, danach die Spalten mit fester Breite
+#   (lat/lon float64, ele float32, time int64 µs, segment_starts int64), je auf 64 Byte ausgerichtet.
+# Der Kopf enthält Herkunft (mtime/Größe der GPX-Datei), Spalten-Offsets und die Event-Tabelle
+# (CLIENT_/PAUSE_ Wegpunkte, wenige pro Tour). Geöffnet wird per numpy.memmap: kein XML-Parsen,
+# kein Kopieren - Laden eines Tracks kostet nur die Seitenzugriffe auf die tatsächlich gelesenen Daten.
+# lat/lon bleiben float64 (float32 würde km-Statistik und Stopp-Erkennung gegenüber GPX verändern).
+import json
+import os
+import struct
+
+import numpy as np
+
+from gpx_stream import parse_time
+from track import TIME_DTYPE, Track
+
+ARCHIVE_EXT = ".lkwtrk"
+MAGIC = b"LKWTRK\x00\x01"
+FORMAT_VERSION = 1
+ALIGN = 64
+PREAMBLE = struct.Struct("<8sI")  # Kennung, Länge des JSON-Kopfes
+
+COLUMNS = (("lat", "<f8"), ("lon", "<f8"), ("ele", "<f4"), ("time", "<i8"), ("segment_starts", "<i8"))
+
+
+def archive_path_for(gpx_path, archive_dir=None):
+    # Archiv neben der GPX-Datei oder in einem eigenen Ordner
+    folder = archive_dir or os.path.dirname(gpx_path)
+    return os.path.join(folder, os.path.splitext(os.path.basename(gpx_path))[0] + ARCHIVE_EXT)
+
+
+def _source_key(gpx_path):
+    st_res = os.stat(gpx_path)
+    return {"mtime_ns": st_res.st_mtime_ns, "size": st_res.st_size}
+
+
+def _align(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def write_archive(path, parsed, source=None):
+    # parsed: Ergebnis von gpx_stream.parse_gpx; atomar über *.tmp + os.replace
+    track = parsed["track"]
+    arrays = {
+        "lat": track.lat, "lon": track.lon, "ele": track.ele,
+        "time": track.time.view(np.int64), "segment_starts": track.segment_starts,
+    }
+    events = [[w["time"].isoformat() if w["time"] else None, w["name"], w["lat"], w["lon"]]
+              for w in parsed["waypoints"]]
+    header = {
+        "version": FORMAT_VERSION,
+        "source": source,
+        "has_track": parsed["has_track"],
+        "points": len(track),
+        # Aufsteigende Zeiten ohne Lücken -> Zeitfenster per Binärsuche statt Maske
+        "time_sorted": track.time_sorted(),
+        "columns": {},
+        "events": events,  # [Zeit wie in der GPX (ISO, mit Zeitzone), Name, lat, lon]
+    }
+
+    # Offsets hängen von der Kopflänge ab -> Kopf mit Platzhaltern einmal vermessen, mit Reserve
+    layout = {name: [0, dtype, len(arrays[name])] for name, dtype in COLUMNS}
+    header["columns"] = layout
+    reserve = len(json.dumps(header, ensure_ascii=False).encode("utf-8")) + 32 * len(COLUMNS)
+    offset = _align(PREAMBLE.size + reserve)
+    for name, dtype in COLUMNS:
+        layout[name][0] = offset
+        offset = _align(offset + len(arrays[name]) * np.dtype(dtype).itemsize)
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8").ljust(reserve)
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, len(header_bytes)))
+            f.write(header_bytes)
+            for name, dtype in COLUMNS:
+                f.seek(layout[name][0])
+                f.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+            f.truncate(offset)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return offset
+
+
+class TrackArchive:
+    # Geöffnete Archivdatei; alle Spalten sind schreibgeschützte Sichten auf dieselbe Speicherabbildung
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, header_len = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"Keine Track-Archivdatei: {path}")
+            self.header = json.loads(f.read(header_len))
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unbekannte Archiv-Version {self.header.get('version')}: {path}")
+        self._buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        self.columns = {}
+        for name, (offset, dtype, count) in self.header["columns"].items():
+            itemsize = np.dtype(dtype).itemsize
+            self.columns[name] = self._buffer[offset:offset + count * itemsize].view(dtype)
+
+    @property
+    def source(self):
+        return self.header.get("source")
+
+    def __len__(self):
+        return self.header["points"]
+
+    def track(self, start=None, end=None):
+        # Ganzer Track oder Zeitfenster [start, end) (datetime); bei sortierten Zeiten ohne Kopie
+        cols = self.columns
+        track = Track(cols["lat"], cols["lon"], cols["ele"], cols["time"].view(TIME_DTYPE), cols["segment_starts"])
+        track._time_sorted = self.header["time_sorted"]  # beim Schreiben geprüft, spart einen Lauf über die Zeitspalte
+        if start is None and end is None:
+            return track
+        return track.window(start, end)
+
+    def waypoints(self):
+        return [{"time": parse_time(iso) if iso else None, "name": name, "lat": lat, "lon": lon}
+                for iso, name, lat, lon in self.header["events"]]
+
+    def parsed(self):
+        # Gleiche Struktur wie gpx_stream.parse_gpx -> direkt für tour_model.analyze_tour
+        return {"track": self.track(), "has_track": self.header["has_track"], "waypoints": self.waypoints()}
+
+
+def open_for_gpx(gpx_path, archive_dir=None):
+    # Parse-Ergebnis aus dem Archiv, wenn es zur aktuellen GPX-Datei passt (sonst None -> normal parsen).
+    # Fehlt die GPX-Datei, gilt das Archiv allein (Touren, die nur noch als Archiv vorliegen).
+    path = archive_path_for(gpx_path, archive_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        archive = TrackArchive(path)
+        if os.path.exists(gpx_path) and archive.source != _source_key(gpx_path):
+            return None
+        return archive.parsed()
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Fehler beim Lesen des Track-Archivs {path}: {e}")
+        return None
+
+
+def convert_gpx(gpx_path, archive_dir=None, force=False, parse=None):
+    # Eine GPX-Datei ins Archiv übernehmen; liefert (archivpfad, status) mit status 'aktuell' / 'neu'
+    path = archive_path_for(gpx_path, archive_dir)
+    source = _source_key(gpx_path)
+    if not force and os.path.exists(path):
+        try:
+            if TrackArchive(path).source == source:
+                return path, "aktuell"
+        except (OSError, ValueError, KeyError):
+            pass
+    if parse is None:
+        from gpx_stream import parse_gpx
+        with open(gpx_path, "rb") as f:
+            parsed = parse_gpx(f)
+    else:
+        parsed = parse(gpx_path)
+    write_archive(path, parsed, source)
+    return path, "neu"
@@ -0,0 +1,165 @@
+# --- SPRACH-WÖRTERBUCH ---
+TRANSLATIONS = {
+    "Deutsch": {
+        "page_title": "LKW Touren Viewer Pro",
+        "tours_found": "📂 Aktuell gefundene Touren: <b>{count}</b> (Auto-Update: 60s)",
+        "no_files": "Keine GPX Dateien im Ordner gefunden.",
+        "upload_text": "GPX Datei hier ablegen (max. 200 MB)",
+        "manual_btn_help": "Handbuch",
+        "manual_title": "Benutzerhandbuch",
+        "stats_start": "⏱️ Start",
+        "stats_end": "🏁 Ende",
+        "stats_dist": "📏 Distanz",
+        "stats_speed": "Ø Geschw.",
+        "btn_save_map": "🌍 Karte für 2. Monitor speichern",
+        "btn_sidebar": "Sidebar ein/aus",
+        "btn_export": "Download Tour",
+        "btn_save_direct": "💾 Export der Tour",
+        "btn_batch_export": "💾 Alle Touren exportieren", 
+        "batch_force": "Auch aktuelle Exporte neu schreiben",
+        "save_success": "✅ Datei erfolgreich exportiert, Dateiname: ",
+        "batch_success": "✅ Batch-Export abgeschlossen! Anzahl Dateien: ",
+        "save_error": "❌ Fehler beim Speichern: ",
+        "batch_error": "❌ Bitte EXPORT_FOLDER_PATH konfigurieren für Batch-Export!",
+        "header_customers": "📋 Kundenliste & Events",
+        "col_tour_nr": "Tournummer",
+        "col_filename": "Dateiname",
+        "col_date": "Datum",
+        "col_cust_nr": "Kunden Nr. / Typ",
+        "col_name": "Name / Event",
+        "col_arr": "Ankunft",
+        "col_dep": "Abfahrt",
+        "col_dur": "Dauer",
+        "nav_back": "⬅️",
+        "nav_next": "➡️",
+        "page_info": "S. {current}/{total}",
+        "event_issues": "⚠️ Auffällige Events: {count}",
+        "fleet_toggle": "🚛 Flottenansicht (alle Touren eines Tages)",
+        "fleet_day": "Tag",
+        "fleet_info": "{tours} Touren, {points} Linienpunkte (Vereinfachung {tolerance:.0f} m)",
+        "btn_geojson": "⬇️ GeoJSON",
+        "timing_panel": "⏱️ Laufzeiten dieses Durchlaufs ({ms:.0f} ms)",
+        "col_stage": "Stufe",
+        "window_title": "🕒 Zeitfenster / Wiedergabe",
+        "window_range": "Zeitfenster",
+        "window_info": "{start}–{end}: **{dist:.2f} km**, Ø {speed:.1f} km/h, {points} Trackpunkte",
+        "window_position": "Position um {time}: {lat:.5f}, {lon:.5f}",
+        "window_no_position": "Keine Position um {time} (außerhalb des Tracks)",
+        "window_replay": "▶️ Fahrt im Zeitfenster abspielen",
+        "col_window": "Lieferfenster",
+        "window_ok": "✅ pünktlich",
+        "window_early": "⏰ {min} min zu früh",
+        "window_late": "⚠️ {min} min zu spät",
+        "upload_queued": "⏳ {name}: wartet auf Verarbeitung …",
+        "upload_running": "⚙️ {name}: wird gespeichert und eingelesen …",
+        "upload_error": "❌ Upload {name} fehlgeschlagen: {error}",
+        "auto_stop": "Erkannter Halt (ohne Wegpunkt)",
+        "geo_issues": "📍 Abweichender Standort: {count}",
+        "geo_far": "{dist} m vom Kundenstandort entfernt",
+        "geo_nearest": ", nächster bekannter Kunde: {id} ({dist} m)",
+        "issue_unmatched_begin": "BEGIN ohne END",
+        "issue_unmatched_end": "END ohne BEGIN",
+        "issue_duplicate_begin": "doppeltes BEGIN, früheres verworfen",
+        "issue_overlap": "beginnt während {other} noch offen ist",
+        "time_suffix": " Uhr",
+        "date_format": "%d.%m.%Y",
+        "file_date_format": "%d.%m.%Y %H:%M",
+        "manual_md": """
+## 📘 Benutzerhandbuch
+
+### 1. Obere Leiste
+* **DE / EN:** Sprache wechseln.
+
+### 2. Dateiauswahl
+* **Liste:** Zeigt alle GPX-Dateien im Ordner. Klicken zum Laden.
+
+### 3. Upload
+* **Feld:** Ziehen Sie neue GPX-Dateien hierher.
+
+### 4. Karte & Liste
+* **Karte:** Zeigt Route und Stopps.
+* **Tabelle:** Zeigt Kundenbesuche und Pausen basierend auf den neuen Wegpunkten im GPX.
+"""
+    },
+    "English": {
+        "page_title": "Truck Tour Viewer Pro",
+        "tours_found": "📂 Found tours currently: <b>{count}</b> (Auto-Update: 60s)",
+        "no_files": "No GPX files found in folder.",
+        "upload_text": "Drop GPX file here (max. 200 MB)",
+        "manual_btn_help": "Manual",
+        "manual_title": "User Manual",
+        "stats_start": "⏱️ Start",
+        "stats_end": "🏁 End",
+        "stats_dist": "📏 Distance",
+        "stats_speed": "Ø Speed",
+        "btn_save_map": "🌍 Save Map for 2nd Monitor",
+        "btn_sidebar": "Sidebar on/off",
+        "btn_export": "Download Tour",
+        "btn_save_direct": "💾 Export Tour",
+        "btn_batch_export": "💾 Export All Tours",
+        "batch_force": "Re-export up-to-date tours",
+        "save_success": "✅ File successfully exported, Filename: ",
+        "batch_success": "✅ Batch export finished! Files created: ",
+        "save_error": "❌ Error saving file: ",
+        "batch_error": "❌ Please configure EXPORT_FOLDER_PATH for batch export!",
+        "header_customers": "📋 Customer List & Events",
+        "col_tour_nr": "Tour No.",
+        "col_filename": "Filename",
+        "col_date": "Date",
+        "col_cust_nr": "Customer No. / Type",
+        "col_name": "Name / Event",
+        "col_arr": "Arrival",
+        "col_dep": "Departure",
+        "col_dur": "Duration",
+        "nav_back": "⬅️",
+        "nav_next": "➡️",
+        "page_info": "P. {current}/{total}",
+        "event_issues": "⚠️ Event anomalies: {count}",
+        "fleet_toggle": "🚛 Fleet view (all tours of a day)",
+        "fleet_day": "Day",
+        "fleet_info": "{tours} tours, {points} line points (simplified to {tolerance:.0f} m)",
+        "btn_geojson": "⬇️ GeoJSON",
+        "timing_panel": "⏱️ Timings of this run ({ms:.0f} ms)",
+        "col_stage": "Stage",
+        "window_title": "🕒 Time window / replay",
+        "window_range": "Time window",
+        "window_info": "{start}–{end}: **{dist:.2f} km**, avg {speed:.1f} km/h, {points} track points",
+        "window_position": "Position at {time}: {lat:.5f}, {lon:.5f}",
+        "window_no_position": "No position at {time} (outside the track)",
+        "window_replay": "▶️ Replay the drive in this window",
+        "col_window": "Delivery window",
+        "window_ok": "✅ on time",
+        "window_early": "⏰ {min} min early",
+        "window_late": "⚠️ {min} min late",
+        "upload_queued": "⏳ {name}: waiting to be processed …",
+        "upload_running": "⚙️ {name}: saving and reading …",
+        "upload_error": "❌ Upload {name} failed: {error}",
+        "auto_stop": "Detected stop (no waypoint)",
+        "geo_issues": "📍 Location mismatch: {count}",
+        "geo_far": "{dist} m away from the customer site",
+        "geo_nearest": ", nearest known customer: {id} ({dist} m)",
+        "issue_unmatched_begin": "BEGIN without END",
+        "issue_unmatched_end": "END without BEGIN",
+        "issue_duplicate_begin": "duplicate BEGIN, earlier one dropped",
+        "issue_overlap": "starts while {other} is still open",
+        "time_suffix": "",
+        "date_format": "%Y-%m-%d",
+        "file_date_format": "%Y-%m-%d %H:%M",
+        "manual_md": """
+## 📘 User Manual
+
+### 1. Top Bar
+* **DE / EN:** Switch language.
+
+### 2. File Selection
+* **List:** Shows GPX files. Click to load.
+
+### 3. Upload
+* **Box:** Drag & drop GPX files here.
+
+### 4. Map & List
+* **Map:** Shows route and stops.
+* **Table:** Shows customer visits and pauses based on GPX waypoints.
+"""
+    }
+}
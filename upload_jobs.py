@@ -0,0 +1,141 @@
+# --- HINTERGRUND-VERARBEITUNG VON UPLOADS ---
+# Hochgeladene GPX-Dateien werden nicht mehr im Skript-Thread geparst, sondern von einem
+# prozessweiten Thread-Pool: Datei in den GPX-Ordner schreiben, parsen (Prüfung + Parse-Cache),
+# Datei-Index auffrischen. Die UI fragt nur noch den Job-Status ab, dadurch blockieren sich
+# mehrere Disponenten beim gleichzeitigen Hochladen nicht gegenseitig.
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from file_index import get_file_index
+from gpx_stream import parse_gpx
+from parse_cache import DEFAULT_MAX_BYTES, ParseCache
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_ERROR = "error"
+
+DEFAULT_WORKERS = 2
+KEEP_FINISHED_S = 3600  # fertige Jobs so lange für die Statusanzeige aufheben
+
+
+class UploadJob:
+    __slots__ = ("id", "filename", "status", "detail", "path", "created", "finished", "_data")
+
+    def __init__(self, job_id, filename, data):
+        self.id = job_id
+        self.filename = filename
+        self.status = JOB_QUEUED
+        self.detail = ""       # Fehlermeldung bei JOB_ERROR
+        self.path = None       # gespeicherte Datei im GPX-Ordner bei JOB_DONE
+        self.created = time.time()
+        self.finished = None
+        self._data = data      # Upload-Inhalt, wird nach dem Schreiben freigegeben
+
+    @property
+    def pending(self):
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+
+def safe_filename(name):
+    # Nur den Dateinamen übernehmen (keine Pfade aus dem Browser), Endung .gpx erzwingen
+    base = os.path.basename(name.replace("\\", "/")).strip() or "upload.gpx"
+    base = "".join(c for c in base if c.isalnum() or c in "._- ")
+    if not base.lower().endswith(".gpx"):
+        base += ".gpx"
+    return base
+
+
+def free_target(folder, filename, data):
+    # Ziel im GPX-Ordner: identische Datei wird wiederverwendet, sonst nie überschreiben (_2, _3, ...)
+    stem, ext = os.path.splitext(filename)
+    for n in itertools.count(1):
+        candidate = os.path.join(folder, filename if n == 1 else f"{stem}_{n}{ext}")
+        try:
+            if os.path.getsize(candidate) != len(data):
+                continue
+            with open(candidate, 'rb') as f:
+                if f.read() == data:
+                    return candidate, True
+        except FileNotFoundError:
+            return candidate, False
+
+
+class UploadQueue:
+    def __init__(self, gpx_folder, cache_path=None, cache_max_bytes=None, workers=DEFAULT_WORKERS):
+        self.gpx_folder = gpx_folder
+        self.cache_path = cache_path
+        self.cache_max_bytes = cache_max_bytes
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._target_lock = threading.Lock()  # Zielname wählen + anlegen ohne Wettlauf zwischen Jobs
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gpx-upload")
+
+    def submit(self, filename, data):
+        with self._lock:
+            self._forget_old()
+            job = UploadJob(next(self._ids), safe_filename(filename), data)
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job.id
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _forget_old(self):
+        now = time.time()
+        for job_id in [j.id for j in self._jobs.values() if j.finished and now - j.finished > KEEP_FINISHED_S]:
+            del self._jobs[job_id]
+
+    def _run(self, job):
+        job.status = JOB_RUNNING
+        tmp_path = os.path.join(self.gpx_folder, f".upload-{job.id}-{os.getpid()}.tmp")
+        try:
+            data = job._data
+            # Erst vollständig schreiben und parsen, dann unter dem endgültigen Namen sichtbar machen
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            with open(tmp_path, 'rb') as f:
+                parsed = parse_gpx(f)
+
+            with self._target_lock:
+                target, exists = free_target(self.gpx_folder, job.filename, data)
+                if exists:
+                    os.remove(tmp_path)
+                else:
+                    os.replace(tmp_path, target)
+            if self.cache_path:
+                ParseCache(self.cache_path, self.cache_max_bytes or DEFAULT_MAX_BYTES).put(target, parsed)
+            get_file_index(self.gpx_folder).refresh(force=True)
+            job.path = target
+            job.status = JOB_DONE
+        except Exception as e:
+            print(f"Fehler beim Verarbeiten von Upload {job.filename}: {e}")
+            job.detail = str(e)
+            job.status = JOB_ERROR
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        finally:
+            job._data = None
+            job.finished = time.time()
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_upload_queue(gpx_folder, cache_path=None, cache_max_bytes=None):
+    # Prozessweite Warteschlange pro GPX-Ordner, gemeinsam für alle Sessions
+    key = os.path.abspath(gpx_folder)
+    with _queues_lock:
+        queue = _queues.get(key)
+        if queue is None:
+            queue = _queues[key] = UploadQueue(gpx_folder, cache_path, cache_max_bytes)
+        return queue